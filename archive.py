@@ -0,0 +1,338 @@
+import os
+import sys
+import json
+import mmap
+import time
+import shutil
+import logging
+import argparse
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from operator import itemgetter
+from catalog import product_name
+from ledger import get_ledger, start_of_day
+from money import format_tl
+from reports import next_day, parse_time
+
+ARCHIVE_DIR = "archive"  # **Günlük bölümler (YYYY-MM-DD/) ve ürün kimlik tablosu**
+PRODUCTS_FILE = "products.json"  # **Ürün kimliği -> [kategori, ürün]; yalnızca sona eklenir**
+META_FILE = "meta.json"
+SIZE_KEY_BITS = 16  # **Gruplamada (ürün id, boyut) tek bir int64 anahtara paketlenir**
+
+# **Sütun adı -> (array tür kodu, numpy dtype); her satır sabit genişlikte, yerel bayt sırasıyla**
+COLUMNS = {
+    "product": ("I", "u4"),  # **ürün kimliği (ProductTable)**
+    "size": ("H", "u2"),  # **boyut (oz)**
+    "price": ("i", "i4"),  # **fiyat (kuruş)**
+    "second": ("I", "u4"),  # **gün başlangıcından beri geçen saniye**
+}
+FIRST_SALE_SQL = "SELECT MIN(created_at) FROM sale_lines"
+
+log = logging.getLogger(__name__)
+
+
+def load_numpy():
+    """numpy'ı ilk kullanımda yükler (açılışı yavaşlatmaması için); kurulu değilse None."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def day_name(day):
+    return time.strftime("%Y-%m-%d", time.localtime(day))
+
+
+class ProductTable:
+    """(kategori, ürün) adlarını arşivde kullanılan sabit sayısal kimliklere çevirir.
+
+    İlk oluşturulurken menü kataloğundaki sırayla doldurulur; menüde olmayan
+    (kaldırılmış, adı değişmiş) ürünler görüldükçe sona eklenir. Kimlikler
+    hiç değişmediği için eski bölümler yeniden yazılmadan okunabilir.
+    """
+
+    def __init__(self, path, catalog=None):
+        self.path = path
+        self.names = []  # **kimlik -> (kategori, ürün)**
+        self._ids = {}
+        self._dirty = False
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for category, product in json.load(f):
+                    self._add(category, product)
+        except FileNotFoundError:
+            if catalog is not None:
+                for category in catalog.categories():
+                    for product in catalog.category(category):
+                        self.intern(category, product)
+
+    def _add(self, category, product):
+        self._ids[(category, product)] = len(self.names)
+        self.names.append((category, product))
+
+    def intern(self, category, product):
+        key = (category or "", product)
+        product_id = self._ids.get(key)
+        if product_id is None:
+            product_id = len(self.names)
+            self._add(*key)
+            self._dirty = True
+        return product_id
+
+    def ids_of(self, product):
+        """Adı eşleşen tüm kimlikler (ürün birden çok kategoride olabilir)."""
+        wanted = product_name(product)
+        return [product_id for product_id, (_, name) in enumerate(self.names) if product_name(name) == wanted]
+
+    def save(self):
+        if not self._dirty:
+            return
+        with open(self.path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self.names, f, ensure_ascii=False)
+        os.replace(self.path + ".tmp", self.path)
+        self._dirty = False
+
+
+class Partition:
+    """Bir günün sütun dosyaları; sütunlar mmap ile açılır, satırlar Python nesnesine çevrilmez."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, META_FILE), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("byteorder", sys.byteorder) != sys.byteorder:
+            raise ValueError(f"arşiv bölümü farklı bayt sıralı bir makinede yazılmış: {path}")
+        self.day = meta["day"]
+        self.rows = meta["rows"]
+        self._maps = {}
+
+    def column(self, name):
+        """Sütunun salt okunur görünümü: numpy varsa ndarray, yoksa tür dönüşümlü memoryview."""
+        typecode, dtype = COLUMNS[name]
+        buffer = self._maps.get(name)
+        if buffer is None:
+            if self.rows:
+                with open(os.path.join(self.path, name), "rb") as f:
+                    buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                buffer = b""
+            self._maps[name] = buffer
+        np = load_numpy()
+        if np is not None:
+            return np.frombuffer(buffer, dtype=dtype)
+        return memoryview(buffer).cast(typecode)
+
+    def close(self):
+        """mmap'leri kapatır; sütun görünümleri hâlâ tutuluyorsa BufferError fırlatır."""
+        while self._maps:
+            _, buffer = self._maps.popitem()
+            if isinstance(buffer, mmap.mmap):
+                buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.close()
+        except BufferError:
+            if exc_type is None:
+                raise
+            # **Asıl hata yükseliyor; görünümleri traceback tutuyor, mmap GC ile kapanır**
+
+
+class Archive:
+    """Tamamlanan satış satırlarının günlük, sütun bazlı ikili arşivi.
+
+    Her gün kendi klasöründe, sütun başına bir dosya olarak (ürün id, boyut,
+    fiyat, saniye) sabit genişlikte yazılır ve bir daha değişmez. Sorgular
+    ilgili günlerin sütunlarını mmap ile açar; numpy varsa toplamalar
+    vektörel yapılır, yoksa aynı sütunlar memoryview üzerinden sayılır.
+    """
+
+    def __init__(self, directory=ARCHIVE_DIR, catalog=None):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        if catalog is None and not os.path.exists(os.path.join(directory, PRODUCTS_FILE)):
+            from catalog import get_catalog
+            catalog = get_catalog()
+        self.products = ProductTable(os.path.join(directory, PRODUCTS_FILE), catalog)
+
+    # **Yazma**
+    def has_day(self, day):
+        return os.path.exists(os.path.join(self.directory, day_name(day), META_FILE))
+
+    def write_day(self, day, lines):
+        """Bir günün satırlarını [(zaman, kategori, ürün, boyut, kuruş)] bölüm olarak yazar.
+
+        Satırlar zamana göre sıralanarak yazılır; gün içi aralıklar buna dayanır.
+        """
+        day = start_of_day(day)
+        columns = {name: array(typecode) for name, (typecode, _) in COLUMNS.items()}
+        product, size, price, second = (columns[name] for name in ("product", "size", "price", "second"))
+        intern = self.products.intern
+        for created_at, category, name, line_size, line_price in sorted(lines, key=itemgetter(0)):
+            product.append(intern(category, name))
+            size.append(line_size)
+            price.append(line_price)
+            second.append(int(created_at - day))
+
+        # **Önce kimlik tablosu, sonra bölüm: yazılan her kimlik tabloda bulunur**
+        self.products.save()
+        path = os.path.join(self.directory, day_name(day))
+        tmp_path = path + ".tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+        for name, values in columns.items():
+            if values:
+                with open(os.path.join(tmp_path, name), "wb") as f:
+                    values.tofile(f)
+        with open(os.path.join(tmp_path, META_FILE), "w", encoding="utf-8") as f:
+            json.dump({"day": day, "rows": len(product), "byteorder": sys.byteorder}, f)
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp_path, path)
+        return len(product)
+
+    def archive_ledger(self, ledger=None, until=None):
+        """Defterdeki kapanmış (bugünden önceki) ve henüz arşivlenmemiş günleri yazar; gün sayısını döndürür."""
+        ledger = ledger or get_ledger()
+        first = ledger.conn.execute(FIRST_SALE_SQL).fetchone()[0]
+        if first is None:
+            return 0
+        until = start_of_day(until)
+        day, written = start_of_day(first), 0
+        while day < until:
+            end = next_day(day)
+            if not self.has_day(day):
+                rows = self.write_day(day, (line[1:] for line in ledger.lines_between(day, end)))
+                log.info("Arşivlendi: %s (%d satır)", day_name(day), rows)
+                written += 1
+            day = end
+        return written
+
+    # **Okuma**
+    def partitions(self, start, end):
+        """[start, end) aralığına düşen bölümleri ve gün içi saniye sınırlarını üretir.
+
+        Bölümler `with partition:` ile kullanılır; sütun görünümleri blok bitmeden bırakılmalıdır.
+        """
+        day = start_of_day(start)
+        while day < end:
+            following = next_day(day)
+            if self.has_day(day):
+                partition = Partition(os.path.join(self.directory, day_name(day)))
+                lo = start - day if start > day else None
+                hi = end - day if end < following else None
+                yield partition, lo, hi
+            day = following
+
+    def _scan(self, start, end, reduce):
+        """Dolu bölümlerin (ürün, boyut, fiyat) sütunlarını `reduce` ile işler, sonuçlarını üretir.
+
+        `reduce` yalnızca Python değerleri döndürür; görünümler çağrı bitince
+        bırakılır ve bölümün mmap'leri bir sonraki güne geçmeden kapanır.
+        """
+        for partition, lo, hi in self.partitions(start, end):
+            with partition:
+                if partition.rows:
+                    yield reduce(*self._columns(partition, lo, hi))
+
+    def _window(self, partition, lo, hi):
+        """Satırlar zamana göre sıralı yazıldığından gün içi aralık saniye sütununda ikili aramayla bulunur."""
+        if lo is None and hi is None:
+            return 0, partition.rows
+        second = partition.column("second")
+        first = 0 if lo is None else bisect_left(second, lo)
+        last = partition.rows if hi is None else bisect_left(second, hi)
+        return first, last
+
+    def _columns(self, partition, lo, hi):
+        first, last = self._window(partition, lo, hi)
+        return [partition.column(name)[first:last] for name in ("product", "size", "price")]
+
+    def product_sales(self, product, size, start, end):
+        """Bir ürünün aralıktaki (adet, toplam kuruş) satışı; `Ledger.product_sales` ile aynı sonuç."""
+        ids = self.products.ids_of(product)
+        count = total = 0
+        if not ids:
+            return count, total
+        np = load_numpy()
+
+        def day_sales(products, sizes, prices):
+            if np is not None:
+                mask = np.isin(products, ids) & (sizes == size)
+                return int(np.count_nonzero(mask)), int(prices[mask].sum(dtype=np.int64))
+            day_count = day_total = 0
+            for (product_id, line_size, price), quantity in Counter(zip(products, sizes, prices)).items():
+                if line_size == size and product_id in ids:
+                    day_count += quantity
+                    day_total += quantity * price
+            return day_count, day_total
+
+        for day_count, day_total in self._scan(start, end, day_sales):
+            count += day_count
+            total += day_total
+        return count, total
+
+    def sales_by_product(self, start, end):
+        """{(kategori, ürün, boyut): [adet, toplam kuruş]}; her gün tek geçişte gruplanır."""
+        totals = {}
+        np = load_numpy()
+
+        def day_groups(products, sizes, prices):
+            if np is not None:
+                keys = (products.astype(np.int64) << SIZE_KEY_BITS) | sizes
+                unique, inverse = np.unique(keys, return_inverse=True)
+                counts = np.bincount(inverse, minlength=len(unique))
+                sums = np.zeros(len(unique), dtype=np.int64)
+                np.add.at(sums, inverse, prices)
+                return list(zip(unique.tolist(), counts.tolist(), sums.tolist()))
+            # **Farklı (ürün, boyut, fiyat) sayısı menü kadardır; sayım C hızında yapılır**
+            return [(product_id << SIZE_KEY_BITS | line_size, quantity, quantity * price)
+                    for (product_id, line_size, price), quantity in Counter(zip(products, sizes, prices)).items()]
+
+        for groups in self._scan(start, end, day_groups):
+            for key, count, total in groups:
+                entry = totals.setdefault(key, [0, 0])
+                entry[0] += count
+                entry[1] += total
+
+        mask = (1 << SIZE_KEY_BITS) - 1
+        return {(*self.products.names[key >> SIZE_KEY_BITS], key & mask): entry for key, entry in totals.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Satış geçmişinin sütun bazlı ikili arşivi")
+    parser.add_argument("--dir", default=ARCHIVE_DIR)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("build", help="kapanmış günleri defterden arşive yaz")
+    sales = commands.add_parser("sales", help="bir ürünün satışları")
+    sales.add_argument("product")
+    sales.add_argument("size", type=int)
+    top = commands.add_parser("top", help="en çok satan ürünler")
+    top.add_argument("--limit", type=int, default=20)
+    for command in (sales, top):
+        command.add_argument("--from", dest="start", type=parse_time, help="aralık başı (varsayılan: 365 gün önce)")
+        command.add_argument("--to", dest="end", type=parse_time, help="aralık sonu, hariç (varsayılan: bugün)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    archive = Archive(args.dir)
+    if args.command == "build":
+        print(f"{archive.archive_ledger()} gün arşivlendi")
+        return
+    end = args.end if args.end is not None else start_of_day()
+    start = args.start if args.start is not None else start_of_day(end - 365 * 86400)
+    if args.command == "sales":
+        count, total = archive.product_sales(args.product, args.size, start, end)
+        print(f"{args.product} ({args.size} oz): {count} adet, {format_tl(total)}")
+    else:
+        rows = sorted(archive.sales_by_product(start, end).items(), key=lambda item: -item[1][1])
+        for (category, product, size), (count, total) in rows[:args.limit]:
+            print(f"{product} ({size} oz) [{category}]: {count} adet, {format_tl(total)}")
+
+
+if __name__ == "__main__":
+    main()
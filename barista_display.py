@@ -0,0 +1,198 @@
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+from PyQt6.QtWidgets import QApplication, QWidget, QHBoxLayout, QVBoxLayout, QLabel, QListWidget, QListWidgetItem
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer
+from PyQt6.QtGui import QColor
+from production import DEFAULT_ADDRESS, RETRY_DELAY, STATIONS, connect, encode
+from ticket import fold
+import theme
+
+REFRESH_MS = 1000  # **Bekleme sürelerinin yenilenme aralığı; mesaj beklemez**
+LATE_SECONDS = 300  # **Bu kadar bekleyen sipariş kırmızı gösterilir**
+
+log = logging.getLogger(__name__)
+
+
+def format_age(seconds):
+    minutes, seconds = divmod(max(0, int(seconds)), 60)
+    return f"{minutes:02d}:{seconds:02d}"
+
+
+class StationColumn(QWidget):
+    """Bir istasyonun sıradaki siparişleri; her satır bir fişin bu istasyondaki kalemleridir."""
+
+    def __init__(self, station, parent=None):
+        super().__init__(parent)
+        self.station = station
+        layout = QVBoxLayout()
+        self.title = QLabel(station)
+        self.title.setObjectName("stationTitle")
+        layout.addWidget(self.title)
+        self.queue = QListWidget()
+        self.queue.setObjectName("stationQueue")
+        layout.addWidget(self.queue)
+        self.setLayout(layout)
+
+    def update_title(self, average=None):
+        text = f"{self.station} — {self.queue.count()} sipariş"
+        if average is not None:
+            text += f" · ort. {format_age(average)}"
+        self.title.setText(text)
+
+
+class BaristaDisplay(QWidget):
+    """Hazırlık kanalına abone olan istasyon ekranı.
+
+    Açılışta açık kalemlerin anlık görüntüsü alınır, sonra yalnızca gelen
+    değişiklikler ilgili satıra uygulanır. Satıra çift tıklamak (veya
+    Enter) o siparişi hazır olarak işaretler ve tüm ekranlardan kaldırır.
+    """
+
+    message = pyqtSignal(object)  # **Okuma iş parçacığından arayüz iş parçacığına**
+
+    def __init__(self, address=DEFAULT_ADDRESS, stations=None):
+        super().__init__()
+        self.address = address
+        self.stations = stations or sorted(set(STATIONS.values()))
+        self.setWindowTitle("Hazırlık Ekranı")
+        self.setGeometry(100, 100, 400 * len(self.stations), 600)
+
+        layout = QHBoxLayout()
+        self.columns = {}
+        for station in self.stations:
+            column = StationColumn(station)
+            column.queue.itemActivated.connect(self.bump)
+            layout.addWidget(column)
+            self.columns[station] = column
+        self.setLayout(layout)
+
+        self.rows = {}  # **(sipariş, istasyon) -> QListWidgetItem**
+        self.row_items = {}  # **(sipariş, istasyon) -> {kalem id: kalem}**
+        self.item_rows = {}  # **kalem id -> (sipariş, istasyon)**
+        self.stats = {}
+
+        self._sock = None
+        self._send_lock = threading.Lock()
+        self.message.connect(self.apply)
+        threading.Thread(target=self._read_loop, name="production-display", daemon=True).start()
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh_ages)
+        self.timer.start(REFRESH_MS)
+
+    # **Kanal**
+    def _read_loop(self):
+        """Kanala bağlanır, abone olur ve gelen mesajları arayüze iletir; koparsa yeniden bağlanır."""
+        request = {"op": "subscribe", "stations": self.stations}
+        while True:
+            try:
+                sock = connect(self.address)
+                sock.sendall(encode(request))
+                self._sock = sock
+                for raw in sock.makefile("rb"):
+                    self.message.emit(json.loads(raw))
+            except (OSError, ValueError) as e:
+                log.warning("Hazırlık kanalı bağlantısı yok: %s", e)
+            self._sock = None
+            time.sleep(RETRY_DELAY)
+
+    def bump(self, row):
+        """Seçilen siparişin bu istasyondaki kalemlerini hazır olarak bildirir."""
+        key = row.data(Qt.ItemDataRole.UserRole)
+        items = list(self.row_items.get(key, ()))
+        sock = self._sock
+        if not items or sock is None:
+            return
+        try:
+            with self._send_lock:
+                sock.sendall(encode({"op": "done", "items": items}))
+        except OSError as e:
+            log.warning("Hazır bildirimi gönderilemedi: %s", e)
+
+    # **Değişiklikler**
+    def apply(self, message):
+        event = message["event"]
+        if event == "snapshot":
+            for column in self.columns.values():
+                column.queue.clear()
+            self.rows, self.row_items, self.item_rows = {}, {}, {}
+        if event in ("snapshot", "order"):
+            changed = set()
+            for item in message["items"]:
+                changed.add(self._add_item(item))
+            for key in changed:
+                self._render(key)
+        else:
+            changed = {self._remove_item(item_id) for item_id in message["items"]}
+            for key in changed - {None}:
+                self._render(key)
+        if "stats" in message:
+            self.stats = message["stats"]
+        for station, column in self.columns.items():
+            column.update_title(self.stats.get(station))
+
+    def _add_item(self, item):
+        key = (item["order"], item["station"])
+        self.row_items.setdefault(key, {})[item["id"]] = item
+        self.item_rows[item["id"]] = key
+        return key
+
+    def _remove_item(self, item_id):
+        key = self.item_rows.pop(item_id, None)
+        if key is not None:
+            self.row_items[key].pop(item_id, None)
+        return key
+
+    def _render(self, key):
+        """Tek bir sipariş satırını ekler, günceller veya boşaldıysa kaldırır."""
+        column = self.columns.get(key[1])
+        if column is None:
+            return
+        items = self.row_items.get(key)
+        row = self.rows.get(key)
+        if not items:
+            self.row_items.pop(key, None)
+            if row is not None:
+                column.queue.takeItem(column.queue.row(row))
+                del self.rows[key]
+            return
+        if row is None:
+            row = self.rows[key] = QListWidgetItem()
+            row.setData(Qt.ItemDataRole.UserRole, key)
+            column.queue.addItem(row)
+        self._set_text(row, items)
+
+    def _set_text(self, row, items):
+        first = next(iter(items.values()))
+        age = time.time() - min(item["at"] for item in items.values())
+        lines = [f"{first['ticket']} · {format_age(age)}"]
+        for (product, size), quantity in fold((item["product"], item["size"]) for item in items.values()):
+            lines.append(f"  {product} ({size} oz)" + (f" x{quantity}" if quantity > 1 else ""))
+        row.setText("\n".join(lines))
+        row.setForeground(QColor("red") if age >= LATE_SECONDS else self.palette().color(self.foregroundRole()))
+
+    def refresh_ages(self):
+        for key, row in self.rows.items():
+            self._set_text(row, self.row_items[key])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Barista/mutfak hazırlık ekranı")
+    parser.add_argument("--connect", default=os.environ.get("POS_PRODUCTION", DEFAULT_ADDRESS))
+    parser.add_argument("--station", action="append", help="gösterilecek istasyon (tekrarlanabilir); varsayılan hepsi")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    theme.apply(app)
+    window = BaristaDisplay(args.connect, args.station)
+    window.show()
+    sys.exit(app.exec())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Sütun bazlı arşivdeki toplamaları aynı verinin SQLite sorgularıyla karşılaştırır.
+
+Kullanım:  python benchmarks/bench_archive.py [--days 365] [--receipts-per-day 1500]
+
+Geçici bir satış defterine günlere yayılmış sentetik fişler yazılır, defter
+günlük bölümler halinde arşivlenir ve aynı sorgular iki kaynaktan alınır:
+tek ürünün yıllık satışı ve tüm ürünlerin yıllık toplamları. Sonuçların
+aynı olduğu doğrulanır; süreler ve en yüksek bellek kullanımı raporlanır.
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_reports import first_day, seed  # noqa: E402
+from archive import Archive, load_numpy  # noqa: E402
+from catalog import Catalog  # noqa: E402
+from ledger import Ledger, start_of_day  # noqa: E402
+
+GROUP_SQL = ("SELECT category, product, size, COUNT(*), SUM(price_kurus) FROM sale_lines "
+             "WHERE created_at >= ? AND created_at < ? GROUP BY category, product, size")
+
+
+def measure(label, fn):
+    """Süre izlemesiz çalıştırmadan ölçülür; tracemalloc her nesne ayırmayı yavaşlatır."""
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:34} {elapsed * 1000:10.1f} ms {peak / 1024:10.0f} KiB")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--receipts-per-day", type=int, default=1500)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp()
+    ledger = Ledger(os.path.join(tmp_dir, "sales.db"), legacy_counter=None)
+    lines = seed(ledger, args.days, args.receipts_per_day, random.Random(args.seed))
+    start, end = first_day(args.days), start_of_day()
+    catalog = Catalog(os.path.join(ROOT, "menu"), os.path.join(tmp_dir, "catalog.cache"))
+    archive = Archive(os.path.join(tmp_dir, "archive"), catalog)
+    print(f"{args.days} gün, {lines} satır, numpy: {'var' if load_numpy() else 'yok (memoryview)'}, "
+          f"geçici klasör: {tmp_dir}\n")
+
+    start_time = time.perf_counter()
+    archive.archive_ledger(ledger)
+    print(f"{'arşiv yazımı (defterden)':34} {(time.perf_counter() - start_time) * 1000:10.1f} ms")
+    size = sum(os.path.getsize(os.path.join(root, name))
+               for root, _, names in os.walk(archive.directory) for name in names)
+    print(f"{'arşiv boyutu':34} {size / lines:10.1f} B/satır\n")
+
+    category = catalog.categories()[0]
+    product, sizes = next(iter(catalog.category(category).items()))
+    size = sizes[0][0]
+    sql = measure(f"ürün satışı, SQLite ({product} {size})",
+                  lambda: tuple(ledger.product_sales(product, size, start, end)))
+    columnar = measure("ürün satışı, arşiv", lambda: archive.product_sales(product, size, start, end))
+    assert sql == columnar, (sql, columnar)
+
+    sql = measure("tüm ürünler, SQLite GROUP BY", lambda: {
+        (row[0], row[1], row[2]): [row[3], row[4]] for row in ledger.conn.execute(GROUP_SQL, (start, end))})
+    columnar = measure("tüm ürünler, arşiv", lambda: archive.sales_by_product(start, end))
+    assert sql == columnar
+
+    # **Gün ortasından başlayan aralık: ilk bölüm saniye sütunuyla süzülür**
+    partial = start + 12 * 3600
+    assert archive.product_sales(product, size, partial, end) == tuple(ledger.product_sales(product, size, partial, end))
+
+
+if __name__ == "__main__":
+    main()
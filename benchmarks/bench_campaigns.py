@@ -0,0 +1,128 @@
+"""Kampanya motorunun satır ekleme/silme gecikmesini kural sayısı arttıkça ölçer.
+
+Kullanım:  python benchmarks/bench_campaigns.py [--rules 100,1000,10000,100000] [--ops 5000]
+
+Sepette sürekli aynı 20 ürün dolaşır ve her birini ilgilendiren kural
+sayısı sabittir; geri kalan kurallar başka ürünlere aittir. Artımlı motorun
+gecikmesi toplam kural sayısından bağımsız kalmalıdır. Karşılaştırma için
+her değişiklikte tüm kuralları sepetin tamamına karşı yeniden tarayan
+yöntem de ölçülür.
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_common import percentile  # noqa: E402
+from cart import Cart  # noqa: E402
+from campaigns import PromotionEngine, compile_rule  # noqa: E402
+
+HOT_PRODUCTS = [f"Sicak {i}" for i in range(20)]
+RULES_PER_HOT_PRODUCT = 4
+CART_SIZE = 12
+
+
+class MemoryStorage:
+    """Diske yazmayan sepet deposu; yalnızca motor ölçülür."""
+
+    def load(self):
+        return []
+
+    def record(self, event, line_id, line):
+        pass
+
+    def checkpoint(self):
+        return None
+
+    def flush(self, items, pending):
+        pass
+
+
+def make_rules(count, rng):
+    """Sıcak ürünlere sabit sayıda, diğer ürünlere kalan kadar rastgele kural üretir."""
+    specs = []
+    for product in HOT_PRODUCTS:
+        specs.append({"type": "size_upgrade", "name": f"{product} büyük", "products": [product],
+                      "size": 16, "discount": "5.00"})
+        specs.append({"type": "buy_get", "name": f"{product} 3 al 2 öde", "products": [product],
+                      "buy": 2, "free": 1})
+        specs.append({"type": "bundle", "name": f"{product} ikili", "products": [product, product],
+                      "price": "150.00"})
+        specs.append({"type": "happy_hour", "name": f"{product} saat", "products": [product],
+                      "start": "00:00", "end": "23:59", "percent": 10})
+    kinds = ("size_upgrade", "buy_get", "bundle", "happy_hour")
+    for number in range(max(0, count - len(specs))):
+        products = [f"Soguk {rng.randrange(count)}" for _ in range(rng.randint(1, 3))]
+        kind = kinds[number % len(kinds)]
+        spec = {"type": kind, "name": f"kural {number}", "products": products}
+        spec.update({"size_upgrade": {"size": 16, "discount": "5.00"},
+                     "buy_get": {"buy": 2, "free": 1},
+                     "bundle": {"price": "150.00"},
+                     "happy_hour": {"start": "14:00", "end": "17:00", "percent": 10}}[kind])
+        specs.append(spec)
+    return [compile_rule(spec) for spec in specs]
+
+
+def rescan(rules, cart):
+    """Karşılaştırma: tüm kuralları sepetin tamamına karşı baştan değerlendirir."""
+    now = time.time()
+    discount = 0
+    for rule in rules:
+        rule.reset()
+        for line_id, line in cart.items():
+            if not rule.products or line[0] in rule.products:
+                rule.add(line_id, line, now)
+        discount += rule.discount
+    return discount
+
+
+def run(rule_count, ops, rng):
+    rules = make_rules(rule_count, rng)
+    cart = Cart(storage=MemoryStorage(), flush_delay=3600)
+    engine = PromotionEngine(rules).attach(cart)
+
+    incremental, full = [], []
+    line_ids = []
+    for _ in range(ops):
+        if len(line_ids) < CART_SIZE:
+            product, size = rng.choice(HOT_PRODUCTS), rng.choice((12, 16))
+            start = time.perf_counter_ns()
+            line_ids.append(cart.add(product, size, rng.randint(50, 250) * 100))
+        else:
+            start = time.perf_counter_ns()
+            cart.remove(line_ids.pop(rng.randrange(len(line_ids))))
+        incremental.append(time.perf_counter_ns() - start)
+
+    # **Tam tarama yavaş olduğu için daha az tekrarla ölçülür**
+    cart.unsubscribe(engine._on_cart_changed)
+    expected = engine.discount
+    for _ in range(min(ops, max(20, 200000 // max(rule_count, 1)))):
+        start = time.perf_counter_ns()
+        discount = rescan(rules, cart)
+        full.append(time.perf_counter_ns() - start)
+    assert discount == expected, (discount, expected)
+    return len(rules), incremental, full
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rules", default="100,1000,10000,100000")
+    parser.add_argument("--ops", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"Sepette {CART_SIZE} satır, ürün başına {RULES_PER_HOT_PRODUCT} kural\n")
+    print(f"{'kural':>7} {'artımlı p50 (µs)':>17} {'artımlı p99 (µs)':>17} {'tam tarama p50 (µs)':>20}")
+    for rule_count in [int(value) for value in args.rules.split(",")]:
+        rule_count, incremental, full = run(rule_count, args.ops, rng)
+        print(f"{rule_count:7d} {percentile(incremental, 50) / 1e3:17.1f} "
+              f"{percentile(incremental, 99) / 1e3:17.1f} {percentile(full, 50) / 1e3:20.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""Ölçüm betiklerinin ortak yardımcıları."""
+
+
+def percentile(samples, p):
+    """Sıralı örneklerde p. yüzdelik (en yakın sıra); örnek listesi boş olmamalı."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
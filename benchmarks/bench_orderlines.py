@@ -0,0 +1,88 @@
+"""Sipariş satırı modelini eski liste-içinde-liste biçimiyle karşılaştırır.
+
+Kullanım:  python benchmarks/bench_orderlines.py [--lines 100000] [--products 200]
+
+Aynı JSON dosyasından (orders.json biçimi) iki yapı kurulur: eski
+`[[ürün, boyut, fiyat], ...]` listesi ve `OrderLine` satırlarından oluşan
+`Ticket`. Her biri için bellekte kalan boyut (tracemalloc), JSON'a yazma ve
+okuma süresi, id ile silme ve aynı satırları katlama süresi raporlanır.
+"""
+import os
+import sys
+import gc
+import json
+import time
+import random
+import argparse
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from ticket import OrderLine, Ticket, fold  # noqa: E402
+
+
+def retained(build):
+    """`build()` sonucunun bellekte kalan boyutunu (bayt) ve sonucu döndürür."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, result
+
+
+def timed(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, default=100000)
+    parser.add_argument("--products", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    menu = [(f"Ürün {i}", rng.choice((8, 12, 16)), rng.randint(50, 250) * 100) for i in range(args.products)]
+    text = json.dumps([list(rng.choice(menu)) for _ in range(args.lines)], ensure_ascii=False)
+
+    def build_ticket():
+        return Ticket((line_id, OrderLine.of(*order))
+                      for line_id, order in enumerate(json.loads(text), start=1))
+
+    legacy_size, legacy = retained(lambda: json.loads(text))
+    ticket_size, ticket = retained(build_ticket)
+    lines = ticket.lines()
+    print(f"{args.lines} satır, {args.products} farklı ürün\n")
+    print(f"{'':28} {'liste-içinde-liste':>20} {'OrderLine/Ticket':>18}")
+    print(f"{'bellekte kalan (KiB)':28} {legacy_size / 1024:20.0f} {ticket_size / 1024:18.0f}")
+    print(f"{'  satır başına (bayt)':28} {legacy_size / args.lines:20.0f} {ticket_size / args.lines:18.0f}")
+    print(f"{'JSON okuma (ms)':28} {timed(lambda: json.loads(text)):20.1f} {timed(build_ticket):18.1f}")
+    print(f"{'JSON yazma (ms)':28} {timed(lambda: json.dumps(legacy, ensure_ascii=False)):20.1f} "
+          f"{timed(lambda: json.dumps(lines, ensure_ascii=False)):18.1f}")
+    print(f"{'katlama (ms)':28} {timed(lambda: fold(map(tuple, legacy))):20.1f} {timed(ticket.folded):18.2f}")
+
+    # **1000 rastgele satır silme: liste satırı değerle arar (O(n)), Ticket id ile siler (O(1))**
+    victims = rng.sample(range(1, args.lines + 1), 1000)
+    targets = [legacy[line_id - 1] for line_id in victims]
+    start = time.perf_counter()
+    for order in targets:
+        legacy.remove(order)
+    legacy_remove = (time.perf_counter() - start) * 1e6 / len(victims)
+    start = time.perf_counter()
+    for line_id in victims:
+        ticket.remove(line_id)
+    ticket_remove = (time.perf_counter() - start) * 1e6 / len(victims)
+    print(f"{'silme, satır başına (µs)':28} {legacy_remove:20.2f} {ticket_remove:18.2f}")
+    print(f"\nkatlanmış satır sayısı: {len(ticket.folded())}")
+
+
+if __name__ == "__main__":
+    main()
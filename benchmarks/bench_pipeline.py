@@ -0,0 +1,81 @@
+"""Sipariş akışını ekran olmadan (PyQt6 gerekmeden) yük altında ölçer.
+
+Kullanım:  python benchmarks/bench_pipeline.py [--tickets 2000] [--seed 1]
+
+Her fişte rastgele ürünler eklenir, bazıları silinir, ödeme alınır ve sepet
+diske yazılır. Her işlem için saniyedeki işlem sayısı, p50 ve p99 gecikme
+raporlanır. Gerçek sepet ve satış defteri yerine geçici dosyalar kullanılır.
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_common import percentile  # noqa: E402
+from cart import Cart  # noqa: E402
+from catalog import Catalog  # noqa: E402
+from checkout import PosSession  # noqa: E402
+from ledger import Ledger  # noqa: E402
+from order_journal import OrderJournal  # noqa: E402
+
+
+class Recorder:
+    def __init__(self):
+        self.samples = {}
+
+    def timed(self, name, fn, *args):
+        start = time.perf_counter_ns()
+        result = fn(*args)
+        self.samples.setdefault(name, []).append(time.perf_counter_ns() - start)
+        return result
+
+    def report(self):
+        print(f"{'işlem':10} {'adet':>8} {'işlem/sn':>12} {'p50 (µs)':>10} {'p99 (µs)':>10}")
+        for name, samples in self.samples.items():
+            ops = len(samples) / (sum(samples) / 1e9)
+            print(f"{name:10} {len(samples):8d} {ops:12.0f} "
+                  f"{percentile(samples, 50) / 1e3:10.1f} {percentile(samples, 99) / 1e3:10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tickets", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    tmp_dir = tempfile.mkdtemp()
+    catalog = Catalog(os.path.join(ROOT, "menu"), os.path.join(tmp_dir, "catalog.cache"))
+    cart = Cart(storage=OrderJournal(journal_path=os.path.join(tmp_dir, "orders.journal"),
+                                     snapshot_path=os.path.join(tmp_dir, "orders.snapshot.json"),
+                                     legacy_path=None),
+                flush_delay=3600)  # **Yazma zamanlayıcısı devre dışı, `persist` ayrı ölçülür**
+    ledger = Ledger(os.path.join(tmp_dir, "sales.db"), legacy_counter=None)
+    session = PosSession(cart=cart, catalog=catalog, ledger=ledger)
+
+    products = [(category, product, size)
+                for category in catalog.categories()
+                for product, sizes in catalog.category(category).items()
+                for size, _ in sizes]
+
+    recorder = Recorder()
+    for _ in range(args.tickets):
+        line_ids = [recorder.timed("add", session.add_item, *rng.choice(products))
+                    for _ in range(rng.randint(1, 6))]
+        if len(line_ids) > 1 and rng.random() < 0.3:
+            recorder.timed("remove", session.remove, line_ids.pop(rng.randrange(len(line_ids))))
+        recorder.timed("persist", cart.flush)
+        recorder.timed("checkout", session.checkout)
+    recorder.timed("persist", cart.flush)
+
+    print(f"{args.tickets} fiş, {len(products)} ürün çeşidi, geçici klasör: {tmp_dir}\n")
+    recorder.report()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Hazırlık kanalının yük altında yayılma gecikmesini ölçer.
+
+Kullanım:  python benchmarks/bench_production.py [--orders 1000] [--rate 50] [--displays 4]
+
+Geçici bir klasörde yayın merkezi (Unix soketi) başlatılır ve `--displays`
+ekran abone olur (biri yalnızca "bar", biri yalnızca "mutfak", diğerleri
+hepsi). Kasa tarafı gerçek `Cart` ve `ProductionClient.sync` ile saniyede
+`--rate` sipariş onaylar; ekranlar kalemleri aldıkça bir kısmını hazır
+olarak işaretler. Onaydan ekranda görünmeye kadar geçen süre ve tüm
+kalemlerin ilgili ekranlara ulaştığı raporlanır. Saatte birkaç yüz sipariş
+saniyede 0.1-0.2 siparişe denk gelir; varsayılan hız bunun yüzlerce katıdır.
+"""
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import threading
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_common import percentile  # noqa: E402
+from cart import Cart  # noqa: E402
+from catalog import Catalog  # noqa: E402
+from production import ProductionHub, ProductionClient, STATIONS, connect, encode  # noqa: E402
+
+
+class MemoryStorage:
+    """Diske yazmayan sepet deposu."""
+
+    def load(self):
+        return []
+
+    def record(self, event, line_id, line):
+        pass
+
+    def checkpoint(self):
+        return None
+
+    def flush(self, items, pending):
+        pass
+
+
+class Display(threading.Thread):
+    """Kanala abone olan ve gelen kalemlerin gecikmesini kaydeden ekran."""
+
+    def __init__(self, address, stations, bump_rate, rng):
+        super().__init__(daemon=True)
+        self.stations = stations
+        self.bump_rate = bump_rate
+        self.rng = rng
+        self.latencies = []
+        self.received = set()
+        self.sock = connect(address)
+        self.sock.sendall(encode({"op": "subscribe", "stations": stations}))
+
+    def run(self):
+        for raw in self.sock.makefile("rb"):
+            now = time.time()
+            message = json.loads(raw)
+            if message["event"] != "order":
+                continue
+            for item in message["items"]:
+                self.latencies.append(now - item["at"])
+                self.received.add(item["id"])
+            if self.rng.random() < self.bump_rate:
+                self.sock.sendall(encode({"op": "done", "items": [item["id"] for item in message["items"]]}))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=1000)
+    parser.add_argument("--rate", type=float, default=50.0, help="saniyedeki sipariş onayı")
+    parser.add_argument("--displays", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    tmp_dir = tempfile.mkdtemp()
+    address = f"unix:{os.path.join(tmp_dir, 'production.sock')}"
+    hub = ProductionHub(os.path.join(tmp_dir, "production.journal"))
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=lambda: loop.run_until_complete(hub.serve(address)), daemon=True).start()
+    while not os.path.exists(address[5:]):
+        time.sleep(0.01)
+
+    station_sets = [["bar"], ["mutfak"]] + [None] * max(0, args.displays - 2)
+    displays = [Display(address, stations, 0.5, random.Random(i)) for i, stations in enumerate(station_sets)]
+    for display in displays:
+        display.start()
+
+    catalog = Catalog(os.path.join(ROOT, "menu"), os.path.join(tmp_dir, "catalog.cache"))
+    products = [(category, product, size, price)
+                for category in catalog.categories()
+                for product, sizes in catalog.category(category).items()
+                for size, price in sizes]
+    client = ProductionClient(address, "bench")
+    cart = Cart(storage=MemoryStorage(), flush_delay=3600)
+
+    expected = {}  # **istasyon -> gönderilmesi gereken kalem sayısı**
+    start = time.perf_counter()
+    for number in range(args.orders):
+        for _ in range(rng.randint(1, 4)):
+            _, product, size, price = rng.choice(products)
+            cart.add(product, size, price)
+        for product, _, _ in cart.lines():
+            station = STATIONS.get(catalog.category_of(product))
+            expected[station] = expected.get(station, 0) + 1
+        client.sync(cart, catalog)
+        client.forget(cart)
+        cart.clear()
+        time.sleep(max(0.0, start + (number + 1) / args.rate - time.perf_counter()))
+    elapsed = time.perf_counter() - start
+    time.sleep(1.0)
+
+    latencies = [latency for display in displays for latency in display.latencies]
+    everything = displays[-1].received
+    print(f"{args.orders} sipariş {elapsed:.1f} sn içinde onaylandı ({args.orders / elapsed * 3600:.0f} sipariş/saat), "
+          f"{len(displays)} ekran\n")
+    print(f"yayılma gecikmesi: p50 {percentile(latencies, 50) * 1e3:.2f} ms, p99 {percentile(latencies, 99) * 1e3:.2f} ms, "
+          f"en kötü {max(latencies) * 1e3:.2f} ms")
+    for display, stations in zip(displays, station_sets):
+        print(f"  ekran {stations or 'hepsi'}: {len(display.received)} kalem")
+    print(f"açık kalem (hazır işaretlenmemiş): {len(hub.items)}")
+    assert len(displays[0].received) == expected.get("bar", 0)
+    assert len(displays[1].received) == expected.get("mutfak", 0)
+    if args.displays > 2:
+        assert displays[0].received | displays[1].received == everything
+    assert max(latencies) < 1.0, "yayılma bir saniyeyi aştı"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Aylık Z raporunun süresini ve bellek kullanımını büyük bir satış geçmişiyle ölçer.
+
+Kullanım:  python benchmarks/bench_reports.py [--days 30] [--receipts-per-day 4000]
+
+Geçici bir satış defterine günlere yayılmış sentetik fişler yazılır ve aynı
+aralığın raporu üç kez alınır: yalnızca satırları akıtarak, günlük özetleri
+ilk kez oluşturarak ve hazır özetlerden. Her çalıştırmanın süresi ve en
+yüksek bellek kullanımı (tracemalloc) raporlanır.
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from catalog import Catalog  # noqa: E402
+from ledger import Ledger, start_of_day, INSERT_RECEIPT_SQL, INSERT_LINE_SQL  # noqa: E402
+from reports import build_report, next_day  # noqa: E402
+
+
+def first_day(days):
+    return start_of_day(start_of_day() - days * 86400 + 43200)
+
+
+def seed(ledger, days, receipts_per_day, rng):
+    """Bugünden önceki günlere sentetik fişler yazar, satır sayısını döndürür."""
+    catalog = Catalog(os.path.join(ROOT, "menu"), os.path.join(tempfile.mkdtemp(), "catalog.cache"))
+    products = [(category, product, size, price)
+                for category in catalog.categories()
+                for product, sizes in catalog.category(category).items()
+                for size, price in sizes]
+    methods = ("nakit", "kart", "kart", "yemek kartı")
+
+    receipt_no, line_count = 0, 0
+    day = first_day(days)
+    with ledger.conn:
+        for _ in range(days):
+            receipts, lines = [], []
+            for _ in range(receipts_per_day):
+                receipt_no += 1
+                created_at = day + rng.uniform(8 * 3600, 22 * 3600)
+                items = [rng.choice(products) for _ in range(rng.randint(1, 5))]
+                receipts.append((receipt_no, created_at, sum(item[3] for item in items), rng.choice(methods), 0))
+                lines.extend((receipt_no, created_at, *item) for item in items)
+            ledger.conn.executemany(INSERT_RECEIPT_SQL, receipts)
+            ledger.conn.executemany(INSERT_LINE_SQL, lines)
+            line_count += len(lines)
+            day = next_day(day)
+    return line_count
+
+
+def measure(label, fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    report = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:28} {elapsed:8.2f} sn {peak / 1024:10.0f} KiB  ({report.receipts} fiş)")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--receipts-per-day", type=int, default=4000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp()
+    ledger = Ledger(os.path.join(tmp_dir, "sales.db"), legacy_counter=None)
+    lines = seed(ledger, args.days, args.receipts_per_day, random.Random(args.seed))
+    start, end = first_day(args.days), start_of_day()
+    print(f"{args.days} gün, {args.days * args.receipts_per_day} fiş, {lines} satır, geçici klasör: {tmp_dir}\n")
+
+    streamed = measure("satırlar akıtılarak", lambda: build_report(start, end, ledger, use_rollups=False))
+    measure("özetler oluşturularak", lambda: build_report(start, end, ledger))
+    cached = measure("hazır özetlerden", lambda: build_report(start, end, ledger))
+    assert ((streamed.net, dict(streamed.products), dict(streamed.payments))
+            == (cached.net, dict(cached.products), dict(cached.payments)))
+
+
+if __name__ == "__main__":
+    main()
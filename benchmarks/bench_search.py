@@ -0,0 +1,80 @@
+"""Ürün aramasının tuş vuruşu başına gecikmesini büyük bir sentetik katalogla ölçer.
+
+Kullanım:  python benchmarks/bench_search.py [--products 5000] [--seed 1]
+
+Gerçek menüye ek olarak rastgele adlı ürünlerden ve barkodlardan oluşan
+geçici bir menü klasörü hazırlanır; ardından sorgular harf harf yazılıyormuş
+gibi aranır. Hedef p99 < 1 ms.
+"""
+import os
+import sys
+import time
+import random
+import shutil
+import argparse
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_common import percentile  # noqa: E402
+from catalog import Catalog  # noqa: E402
+from search import SearchIndex  # noqa: E402
+
+WORDS = ("iced", "caramel", "latte", "mocha", "çikolatalı", "fındıklı", "ılık", "İrmik", "şekerli", "kurabiye",
+         "sandviç", "tost", "kaşarlı", "su", "soda", "limonata", "kupa", "termos", "çanta", "tişört", "kalem")
+TARGET_MS = 1.0
+
+
+def build_menu(tmp_dir, products, rng):
+    menu_dir = os.path.join(tmp_dir, "menu")
+    shutil.copytree(os.path.join(ROOT, "menu"), menu_dir)
+    names = set()
+    while len(names) < products:
+        names.add(" ".join(rng.sample(WORDS, rng.randint(1, 3))) + f" {rng.randint(1, 999)}")
+    with open(os.path.join(menu_dir, "market.txt"), "w", encoding="utf-8") as menu, \
+            open(os.path.join(menu_dir, "codes.csv"), "a", encoding="utf-8") as codes:
+        for name in sorted(names):
+            menu.write(f"{name},1,{rng.randint(5, 500)}.00\n")
+            codes.write(f"{rng.randrange(10 ** 12, 10 ** 13)},market,{name},1\n")
+    return menu_dir, sorted(names)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--products", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    tmp_dir = tempfile.mkdtemp()
+    menu_dir, names = build_menu(tmp_dir, args.products, rng)
+    catalog = Catalog(menu_dir, os.path.join(tmp_dir, "catalog.cache"))
+
+    start = time.perf_counter()
+    index = SearchIndex(catalog, os.path.join(menu_dir, "codes.csv"))
+    index.search("a")
+    build_ms = (time.perf_counter() - start) * 1000
+
+    samples = []
+    for _ in range(args.queries):
+        query = rng.choice(names)
+        if rng.random() < 0.2:
+            query = query.upper().replace("I", "İ")
+        for end in range(1, len(query) + 1):
+            start = time.perf_counter_ns()
+            index.search(query[:end])
+            samples.append(time.perf_counter_ns() - start)
+
+    p50, p99 = percentile(samples, 50) / 1e6, percentile(samples, 99) / 1e6
+    print(f"{len(names)} sentetik ürün, indeks kurulumu {build_ms:.1f} ms")
+    print(f"{len(samples)} tuş vuruşu: p50 {p50 * 1000:.1f} µs, p99 {p99 * 1000:.1f} µs, "
+          f"en kötü {max(samples) / 1e3:.1f} µs")
+    shutil.rmtree(tmp_dir)
+    if p99 > TARGET_MS:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
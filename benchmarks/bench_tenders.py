@@ -0,0 +1,98 @@
+"""Bölünmüş ödemenin ve kart terminali kuyruğunun maliyetini ölçer (PyQt6 gerekmez).
+
+Kullanım:  python benchmarks/bench_tenders.py [--tickets 1000] [--terminal-delay 0.05]
+
+1. Aynı fişler tek seferde nakit ve nakit + kart olarak bölünerek kesilir;
+   ödeme kalemlerinin deftere yazılmasının fiş başına ek maliyeti raporlanır.
+2. Simülatör terminaline art arda çekim gönderilir: `authorize` çağrısının
+   arayüzü ne kadar beklettiği (gönderim süresi) ve onayların uçtan uca
+   süresi ayrı ayrı raporlanır. Gönderim mikrosaniyeler içinde dönmelidir.
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import threading
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_common import percentile  # noqa: E402
+from cart import Cart  # noqa: E402
+from catalog import Catalog  # noqa: E402
+from checkout import PosSession  # noqa: E402
+from ledger import Ledger  # noqa: E402
+from order_journal import OrderJournal  # noqa: E402
+from tenders import Payment, SimulatorTerminal, TerminalWorker  # noqa: E402
+
+
+def checkout_samples(session, products, tickets, rng, split):
+    samples = []
+    for receipt in range(tickets):
+        for _ in range(rng.randint(1, 6)):
+            session.add_item(*rng.choice(products))
+        start = time.perf_counter_ns()
+        payment = None
+        if split:
+            payment = Payment(session.total())
+            payment.add_cash(payment.due // 2 + 1)
+            payment.add_card("kart", payment.remaining(), f"BENCH{receipt:06d}")
+        session.checkout(payment=payment)
+        samples.append(time.perf_counter_ns() - start)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tickets", type=int, default=1000)
+    parser.add_argument("--authorizations", type=int, default=50)
+    parser.add_argument("--terminal-delay", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    tmp_dir = tempfile.mkdtemp()
+    catalog = Catalog(os.path.join(ROOT, "menu"), os.path.join(tmp_dir, "catalog.cache"))
+    cart = Cart(storage=OrderJournal(journal_path=os.path.join(tmp_dir, "orders.journal"),
+                                     snapshot_path=os.path.join(tmp_dir, "orders.snapshot.json"),
+                                     legacy_path=None),
+                flush_delay=3600)
+    ledger = Ledger(os.path.join(tmp_dir, "sales.db"), legacy_counter=None)
+    session = PosSession(cart=cart, catalog=catalog, ledger=ledger)
+    products = [(category, product, size)
+                for category in catalog.categories()
+                for product, sizes in catalog.category(category).items()
+                for size, _ in sizes]
+    print(f"{args.tickets} fiş, geçici klasör: {tmp_dir}\n")
+
+    for label, split in (("tek ödeme (nakit)", False), ("bölünmüş (nakit + kart)", True)):
+        samples = checkout_samples(session, products, args.tickets, rng, split)
+        print(f"{label:26} p50 {percentile(samples, 50) / 1e3:8.1f} µs   p99 {percentile(samples, 99) / 1e3:8.1f} µs")
+    rows = ledger.conn.execute("SELECT COUNT(*) FROM payments").fetchone()[0]
+    assert rows == 2 * args.tickets, rows
+
+    worker = TerminalWorker(SimulatorTerminal(delay=args.terminal_delay))
+    done, submits, finished = threading.Event(), [], []
+    started = time.perf_counter()
+
+    def on_done(request, result, error):
+        finished.append(time.perf_counter())
+        if len(finished) == args.authorizations:
+            done.set()
+
+    for i in range(args.authorizations):
+        start = time.perf_counter_ns()
+        worker.authorize(10000 + i, f"bench-{i}", on_done=on_done)
+        submits.append(time.perf_counter_ns() - start)
+    done.wait()
+    worker.stop()
+    print(f"\n{args.authorizations} kart çekimi, terminal gecikmesi {args.terminal_delay * 1000:.0f} ms")
+    print(f"{'gönderim (arayüz bekler)':26} p50 {percentile(submits, 50) / 1e3:8.1f} µs   "
+          f"p99 {percentile(submits, 99) / 1e3:8.1f} µs")
+    print(f"{'son onaya kadar':26} {(finished[-1] - started) * 1000:8.0f} ms (terminal işlemleri sırayla yapar)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Bekletilen fişler arasında geçiş süresini ölçer.
+
+Kullanım:  python benchmarks/bench_tickets.py [--tickets 20] [--lines 10] [--switches 2000]
+
+Geçici bir klasörde `--tickets` kadar fiş açılır ve her birine `--lines`
+satır eklenir; sepete kampanya motoru ve ekrandaki listeyi taklit eden bir
+abone bağlanır. Fişler arasında rastgele geçilir ve her geçişin süresi
+(abonelerin yeni fişi okuması dahil) raporlanır; geçişler sırasında fiş
+dosyalarına hiç yazılmadığı kontrol edilir. Karşılaştırma için eski yöntem
+de ölçülür: tek sepetteki siparişi dosyaya kaydedip sepeti boşaltmak ve
+diğer siparişi dosyadan geri yüklemek.
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_common import percentile  # noqa: E402
+from cart import Cart  # noqa: E402
+from campaigns import PromotionEngine  # noqa: E402
+from held_tickets import TicketBook, MAIN_TICKET  # noqa: E402
+from order_journal import OrderJournal  # noqa: E402
+
+
+def file_state(directory):
+    return {name: os.stat(os.path.join(directory, name)).st_mtime_ns for name in os.listdir(directory)}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tickets", type=int, default=20)
+    parser.add_argument("--lines", type=int, default=10)
+    parser.add_argument("--switches", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    tmp_dir = tempfile.mkdtemp()
+    main_cart = Cart(storage=OrderJournal(journal_path=os.path.join(tmp_dir, "orders.journal"),
+                                          snapshot_path=os.path.join(tmp_dir, "orders.snapshot.json"),
+                                          legacy_path=None))
+    book = TicketBook(main_cart, directory=os.path.join(tmp_dir, "tickets"))
+    PromotionEngine([]).attach(book)
+    shown = []
+    book.subscribe(lambda event, line_id, line: event == "reset" and shown.__setitem__(slice(None), book.folded()))
+
+    keys = []
+    for number in range(args.tickets):
+        keys.append(book.open() if number else MAIN_TICKET)  # **Boş fişten çıkınca kapandığı için hemen doldurulur**
+        for _ in range(args.lines):
+            book.add(f"Ürün {rng.randrange(50)}", rng.choice((12, 16)), rng.randint(50, 250) * 100)
+    book.flush()
+    before = file_state(book.directory)
+
+    samples = []
+    for _ in range(args.switches):
+        key = rng.choice(keys)
+        start = time.perf_counter_ns()
+        book.switch(key)
+        samples.append(time.perf_counter_ns() - start)
+    book.flush()
+    assert file_state(book.directory) == before, "geçiş sırasında fiş dosyası yazıldı"
+
+    # **Eski yöntem: siparişi dosyaya kaydet, sepeti boşalt, diğerini geri yükle**
+    legacy, parked = [], os.path.join(tmp_dir, "parked.json")
+    for _ in range(min(args.switches, 200)):
+        start = time.perf_counter_ns()
+        with open(parked, "w", encoding="utf-8") as f:
+            json.dump(main_cart.lines(), f, ensure_ascii=False)
+        lines = main_cart.lines()
+        main_cart.clear()
+        for line in lines:
+            main_cart.add(*line)
+        main_cart.flush()
+        legacy.append(time.perf_counter_ns() - start)
+
+    print(f"{args.tickets} fiş, fiş başına {args.lines} satır, geçici klasör: {tmp_dir}\n")
+    print(f"{'':26} {'p50 (µs)':>10} {'p99 (µs)':>10}")
+    print(f"{'fişler arası geçiş':26} {percentile(samples, 50) / 1e3:10.1f} {percentile(samples, 99) / 1e3:10.1f}")
+    print(f"{'kaydet/boşalt/geri yükle':26} {percentile(legacy, 50) / 1e3:10.1f} {percentile(legacy, 99) / 1e3:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Ana menünün açılış ve sepet yenileme sürelerini ölçer.
+
+Ürünler iki yoldan eklenir: kategori sayfasında ürün ve boyut seçerek ve
+ana pencerede tek kısayol tuşuyla (hızlı giriş, pencere açılmaz).
+
+Kullanım:  python benchmarks/bench_ui.py [--adds 1000]
+Ekran gerekmez; Qt `offscreen` platformunda çalıştırılır.
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # **menu/ klasörü göreli yoldan okunur**
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+from PyQt6.QtCore import QEvent, Qt  # noqa: E402
+from PyQt6.QtGui import QKeyEvent  # noqa: E402
+from bench_common import percentile  # noqa: E402
+import cart  # noqa: E402
+from held_tickets import TicketBook  # noqa: E402
+from order_journal import OrderJournal  # noqa: E402
+import theme  # noqa: E402
+
+
+def report(label, samples):
+    for part, chunk in (("ilk 100", samples[:100]), ("son 100", samples[-100:])):
+        print(f"{label} ({part}): p50 {percentile(chunk, 50) * 1e3:.3f} ms, "
+              f"p99 {percentile(chunk, 99) * 1e3:.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--adds", type=int, default=1000)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    theme.apply(app)
+
+    # **Gerçek sepete dokunmamak için geçici bir dosyaya yazan sepet**
+    tmp_dir = tempfile.mkdtemp()
+    storage = OrderJournal(journal_path=os.path.join(tmp_dir, "orders.journal"),
+                           snapshot_path=os.path.join(tmp_dir, "orders.snapshot.json"), legacy_path=None)
+    cart._cart = TicketBook(cart.Cart(storage=storage), directory=os.path.join(tmp_dir, "tickets"))
+
+    from index import MainMenu
+
+    start = time.perf_counter()
+    window = MainMenu()
+    window.show()
+    app.processEvents()
+    print(f"MainMenu açılışı: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    page_start = time.perf_counter()
+    window.open_page("hotDrinks", "Sıcak İçecekler")
+    app.processEvents()
+    print(f"Kategori sayfası ilk açılış: {(time.perf_counter() - page_start) * 1000:.1f} ms")
+
+    page = window.pages["hotDrinks"]
+    drinks = list(page.drink_dict)
+    samples = []
+    for i in range(args.adds):
+        page.select_drink(drinks[i % len(drinks)])
+        tick = time.perf_counter()
+        page.select_size(0)
+        app.processEvents()
+        samples.append(time.perf_counter() - tick)
+
+    report("Ekleme + yenileme", samples)
+
+    cart.get_cart().clear()
+    window.attach_key_entry()
+    hotkey = QKeyEvent(QEvent.Type.KeyPress, Qt.Key.Key_F1, Qt.KeyboardModifier.NoModifier)
+    samples = []
+    for _ in range(args.adds):
+        tick = time.perf_counter()
+        window.handle_key(hotkey)
+        app.processEvents()
+        samples.append(time.perf_counter() - tick)
+    assert len(cart.get_cart()) == args.adds
+    report("Kısayol tuşu (F1)", samples)
+
+    cart.get_cart().clear()
+    cart.get_cart().flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Kasa uygulamasının soğuk açılış süresini `python -X importtime` ile ölçer.
+
+Kullanım:  python benchmarks/startup.py [--budget-ms 400] [--top 15]
+
+`import index` süresi bütçeyi aşarsa çıkış kodu 1 olur; böylece açılışta
+yüklenen yeni bir ağır modül fark edilir.
+"""
+import os
+import sys
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STARTUP_BUDGET_MS = 400
+
+# **Açılışta yüklenmemesi gereken modüller; ilk kullanımda veya ön yüklemede gelirler**
+LAZY_MODULES = (
+    "payments",
+    "printing",
+    "ledger",
+    "catalog",
+    "catalog_watcher",
+    "category_page",
+    "search",
+    "campaigns",
+    "inventory",
+    "outbox",
+    "perf_overlay",
+    "production",
+    "archive",
+    "hotkeys",
+    "tenders",
+    "sqlite3",
+    "numpy",
+    "win32print",
+)
+
+
+def measure():
+    """`import index` için importtime satırlarını [(modül, kendi_us, toplam_us)] olarak döndürür."""
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import index"],
+                            cwd=ROOT, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        sys.exit(result.stderr)
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(own), int(cumulative)))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    rows = measure()
+    total_ms = sum(own for _, own, _ in rows) / 1000
+
+    print(f"{'modül':40} {'kendi (ms)':>10} {'toplam (ms)':>12}")
+    for name, own, cumulative in sorted(rows, key=lambda row: row[2], reverse=True)[:args.top]:
+        print(f"{name:40} {own / 1000:10.1f} {cumulative / 1000:12.1f}")
+
+    loaded = {name for name, _, _ in rows}
+    eager = [module for module in LAZY_MODULES if module in loaded]
+    print(f"\nToplam import süresi: {total_ms:.1f} ms (bütçe {args.budget_ms:.0f} ms)")
+    if eager:
+        print("Açılışta yüklenmemesi gereken modüller yüklendi: " + ", ".join(eager))
+    if total_ms > args.budget_ms or eager:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
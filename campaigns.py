@@ -0,0 +1,319 @@
+import os
+import json
+import time
+import bisect
+import logging
+import threading
+from abc import ABC, abstractmethod
+from collections import Counter, defaultdict
+from catalog import product_name
+from money import parse_price
+
+CAMPAIGNS_FILE = os.path.join("menu", "campaigns.json")  # **Kampanya kuralları (JSON listesi)**
+
+log = logging.getLogger(__name__)
+
+
+# **Kurallar: her biri yalnızca kendi ürünlerinin satırlarını tutar ve indirimini kendisi günceller**
+class Rule(ABC):
+    """Kampanya kuralı tabanı. `products` boşsa kural tüm ürünlere uygulanır."""
+
+    def __init__(self, name, products=()):
+        self.name = name
+        self.products = frozenset(product_name(product) for product in products)
+        self.discount = 0  # **Kuralın sepete şu an verdiği indirim (kuruş)**
+
+    @abstractmethod
+    def add(self, line_id, line, now):
+        """`now` anında eklenen satırı değerlendirir ve `discount` alanını günceller."""
+
+    @abstractmethod
+    def remove(self, line_id):
+        """Satırı çıkarır; kural satırı hiç görmediyse bir şey yapmaz."""
+
+    @abstractmethod
+    def reset(self):
+        """Tüm satırları unutur, indirimi sıfırlar."""
+
+
+class BundleRule(Rule):
+    """Paket: listedeki ürünler birlikte alınınca sabit fiyat ("Latte + Kurabiye 250 TL")."""
+
+    def __init__(self, name, products, price):
+        super().__init__(name, products)
+        self.need = Counter(product_name(product) for product in products)
+        self.price = price
+        self.reset()
+
+    def reset(self):
+        self._prices = defaultdict(list)  # **ürün -> [(-fiyat, satır id)], pahalı olan önce**
+        self._products = {}
+        self.discount = 0
+
+    def add(self, line_id, line, now):
+        bisect.insort(self._prices[line[0]], (-line[2], line_id))
+        self._products[line_id] = line[0]
+        self._update()
+
+    def remove(self, line_id):
+        product = self._products.pop(line_id, None)
+        if product is not None:
+            prices = self._prices[product]
+            del prices[next(i for i, (_, other) in enumerate(prices) if other == line_id)]
+            self._update()
+
+    def _update(self):
+        bundles = min(len(self._prices[product]) // count for product, count in self.need.items())
+        full_price = sum(-price for product, count in self.need.items()
+                         for price, _ in self._prices[product][:bundles * count])
+        self.discount = max(0, full_price - bundles * self.price)
+
+
+class SizeUpgradeRule(Rule):
+    """Boyut yükseltme: belirtilen boyuttaki her satırdan sabit tutar düşülür."""
+
+    def __init__(self, name, products, size, amount):
+        super().__init__(name, products)
+        self.size = size
+        self.amount = amount
+        self.reset()
+
+    def reset(self):
+        self._lines = {}
+        self.discount = 0
+
+    def add(self, line_id, line, now):
+        if line[1] == self.size:
+            self._lines[line_id] = min(self.amount, line[2])
+            self.discount += self._lines[line_id]
+
+    def remove(self, line_id):
+        self.discount -= self._lines.pop(line_id, 0)
+
+
+class HappyHourRule(Rule):
+    """Belirli saatlerde (ve günlerde) yüzde indirim; satırın eklendiği ana göre uygulanır."""
+
+    def __init__(self, name, products, start, end, percent, days=None):
+        super().__init__(name, products)
+        self.start, self.end = _minutes(start), _minutes(end)
+        self.percent = percent
+        self.days = frozenset(days) if days else None  # **0 = Pazartesi**
+        self.reset()
+
+    def reset(self):
+        self._lines = {}
+        self.discount = 0
+
+    def active(self, now):
+        local = time.localtime(now)
+        if self.days is not None and local.tm_wday not in self.days:
+            return False
+        minute = local.tm_hour * 60 + local.tm_min
+        if self.start <= self.end:
+            return self.start <= minute < self.end
+        return minute >= self.start or minute < self.end  # **Gece yarısını aşan aralık**
+
+    def add(self, line_id, line, now):
+        if self.active(now):
+            self._lines[line_id] = (line[2] * self.percent + 50) // 100
+            self.discount += self._lines[line_id]
+
+    def remove(self, line_id):
+        self.discount -= self._lines.pop(line_id, 0)
+
+
+class BuyGetRule(Rule):
+    """N al M öde: her `buy + free` üründen en ucuz `free` tanesi bedava."""
+
+    def __init__(self, name, products, buy, free):
+        super().__init__(name, products)
+        self.buy, self.free = buy, free
+        self.reset()
+
+    def reset(self):
+        self._prices = []  # **[(fiyat, satır id)], ucuz olan önce**
+        self._by_id = {}
+        self.discount = 0
+
+    def add(self, line_id, line, now):
+        bisect.insort(self._prices, (line[2], line_id))
+        self._by_id[line_id] = line[2]
+        self._update()
+
+    def remove(self, line_id):
+        price = self._by_id.pop(line_id, None)
+        if price is not None:
+            del self._prices[bisect.bisect_left(self._prices, (price, line_id))]
+            self._update()
+
+    def _update(self):
+        free_count = len(self._prices) // (self.buy + self.free) * self.free
+        self.discount = sum(price for price, _ in self._prices[:free_count])
+
+
+def _minutes(text):
+    hour, minute = text.split(":")
+    return int(hour) * 60 + int(minute)
+
+
+def compile_rule(spec):
+    """JSON kural tanımını kural nesnesine çevirir; hatalı tanımda ValueError fırlatır."""
+    try:
+        kind, name, products = spec["type"], spec["name"], spec.get("products", [])
+        if kind == "bundle":
+            if not products:
+                raise ValueError("paket en az bir ürün içermeli")
+            return BundleRule(name, products, parse_price(spec["price"]))
+        if kind == "size_upgrade":
+            return SizeUpgradeRule(name, products, int(spec["size"]), parse_price(spec["discount"]))
+        if kind == "happy_hour":
+            percent = int(spec["percent"])
+            if not 0 < percent <= 100:
+                raise ValueError(f"geçersiz yüzde: {percent}")
+            return HappyHourRule(name, products, spec["start"], spec["end"], percent, spec.get("days"))
+        if kind == "buy_get":
+            buy, free = int(spec["buy"]), int(spec["free"])
+            if buy < 1 or free < 1:
+                raise ValueError("buy ve free en az 1 olmalı")
+            return BuyGetRule(name, products, buy, free)
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"eksik veya hatalı alan: {e}") from None
+    raise ValueError(f"bilinmeyen kampanya türü: {kind!r}")
+
+
+def load_rules(path=CAMPAIGNS_FILE):
+    """Kampanya dosyasını okur ve (kurallar, hatalar) döndürür; `"active": false` olanlar atlanır."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            specs = json.load(f)
+    except FileNotFoundError:
+        return [], []
+    except json.JSONDecodeError as e:
+        return [], [f"{path}: {e}"]
+
+    rules, errors = [], []
+    for number, spec in enumerate(specs, start=1):
+        if not spec.get("active", True):
+            continue
+        try:
+            rules.append(compile_rule(spec))
+        except ValueError as e:
+            errors.append(f"{path}: kural {number} ({spec.get('name', '?')}): {e}")
+    return rules, errors
+
+
+class PromotionEngine:
+    """Sepetteki kampanya indirimini her değişiklikte artımlı olarak güncelleyen motor.
+
+    Kurallar bir kez derlenir ve ürün adına göre indekslenir; eklenen veya
+    silinen bir satır yalnızca o ürünü ilgilendiren kuralları çalıştırır.
+    Toplam indirim, değişen kuralların eski ve yeni indirim farkı kadar
+    güncellenir; tüm kurallar sepetin tamamına karşı yeniden taranmaz.
+    Kuralların indirimleri toplanır, sepet toplamını aşamaz.
+    """
+
+    def __init__(self, rules, clock=time.time):
+        self.rules = list(rules)
+        self.clock = clock
+        self.cart = None
+        self.discount = 0
+        self._lines = {}  # **satır id -> satırı ilgilendiren kurallar**
+        self._added = {}  # **satır id -> eklendiği an; sıfırlamada saatli kampanyalar buna göre uygulanır**
+        self._listeners = []
+        self._lock = threading.Lock()
+
+        index = defaultdict(list)
+        self._any = []  # **Ürün listesi boş olan, her satıra bakan kurallar**
+        for rule in self.rules:
+            for product in rule.products:
+                index[product].append(rule)
+            if not rule.products:
+                self._any.append(rule)
+        self._index = {product: tuple(rules) + tuple(self._any) for product, rules in index.items()}
+        self._any = tuple(self._any)
+
+    def attach(self, cart):
+        """Motoru sepete bağlar ve sepetteki mevcut satırları değerlendirir."""
+        self.cart = cart
+        cart.subscribe(self._on_cart_changed)
+        with self._lock:
+            self._reset()
+        return self
+
+    def subscribe(self, callback):
+        """`callback()` indirim her yeniden hesaplandığında çağrılır."""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _on_cart_changed(self, event, line_id, line):
+        with self._lock:
+            if event == "add":
+                self._add(line_id, line)
+            elif event == "remove":
+                self._remove(line_id)
+            else:
+                self._reset()
+        for callback in list(self._listeners):
+            callback()
+
+    def _add(self, line_id, line, now=None):
+        now = self._added[line_id] = self.clock() if now is None else now
+        rules = self._index.get(line[0], self._any)
+        if not rules:
+            return
+        for rule in rules:
+            before = rule.discount
+            rule.add(line_id, line, now)
+            self.discount += rule.discount - before
+        self._lines[line_id] = rules
+
+    def _remove(self, line_id):
+        self._added.pop(line_id, None)
+        for rule in self._lines.pop(line_id, ()):
+            before = rule.discount
+            rule.remove(line_id)
+            self.discount += rule.discount - before
+
+    def _reset(self):
+        """Kuralları sepetin güncel haliyle yeniden kurar; önceden görülen satırlar ilk eklendikleri anla değerlendirilir."""
+        for rule in self.rules:
+            rule.reset()
+        self._lines.clear()
+        self.discount = 0
+        added, self._added = self._added, {}
+        for line_id, line in self.cart.items():
+            self._add(line_id, line, added.get(line_id))
+
+    def total(self):
+        """İndirim düşülmüş sepet toplamı (kuruş)."""
+        total = self.cart.total()
+        return total - min(self.discount, total)
+
+    def applied(self):
+        """Şu an indirim veren kampanyalar: [(ad, kuruş)]."""
+        return [(rule.name, rule.discount) for rule in self.rules if rule.discount]
+
+
+def promotions_for(cart, path=CAMPAIGNS_FILE):
+    """Sepete bağlı kampanya motorunu döndürür; her sepet için bir kez oluşturulur.
+
+    Motor sepetin `promotions` alanında tutulur ve sepetle birlikte silinir.
+    Bekletilen fişlerde (`TicketBook`) etkin fişin kendi motoru döner; ana
+    menü ve ödeme penceresi aynı fiş için aynı motoru kullanır.
+    """
+    current = getattr(cart, "current", None)
+    if current is not None:
+        cart = current()
+    engine = getattr(cart, "promotions", None)
+    if engine is None:
+        rules, errors = load_rules(path)
+        for error in errors:
+            log.error("Kampanya atlandı: %s", error)
+        engine = cart.promotions = PromotionEngine(rules).attach(cart)
+    return engine
@@ -0,0 +1,192 @@
+import os
+import atexit
+import logging
+import threading
+from itertools import count
+from money import to_kurus, format_tl
+from order_journal import OrderJournal
+from ticket import OrderLine, Ticket
+
+FLUSH_DELAY = 0.5  # **Diske yazmadan önce beklenecek süre (saniye)**
+
+log = logging.getLogger(__name__)
+
+
+class ConflictError(Exception):
+    """Sepet, beklenen sürümden sonra (ör. başka bir kasada) değiştirilmiş."""
+
+
+def format_line(line, quantity=1):
+    """Sipariş satırını ekranda ve fişte gösterilen metne çevirir; adet 1'den fazlaysa toplam fiyat yazılır."""
+    drink, size, price = line
+    if quantity == 1:
+        return f"{drink} ({size} oz) - {format_tl(price)} TL"
+    return f"{drink} ({size} oz) x{quantity} - {format_tl(price * quantity)} TL"
+
+
+class Cart:
+    """Tüm pencerelerin paylaştığı bellek içi sipariş sepeti.
+
+    Satırlar `Ticket` içinde `OrderLine` olarak tutulur; ekleme ve silme
+    O(1) çalışır, her değişiklik abonelere bildirilir ve disk yazımı arka
+    planda toplu (debounce edilmiş) olarak yapılır.
+    """
+
+    def __init__(self, storage=None, flush_delay=FLUSH_DELAY):
+        self.storage = storage if storage is not None else OrderJournal()
+        self.flush_delay = flush_delay
+        self._ticket = Ticket()  # **satır id -> OrderLine; toplam her değişiklikte güncellenir**
+        self.version = 0  # **Her değişiklikte artar; iyimser eşzamanlılık kontrolü için**
+        self.promotions = None  # **Sepete bağlı kampanya motoru (campaigns.promotions_for)**
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._timer = None
+
+        for line_id, (drink, size, price) in self.storage.load():
+            try:
+                price = to_kurus(price)  # **Eski kayıtlarda fiyat TL (float) olarak tutuluyordu**
+            except ValueError as e:
+                log.error("Kayıtlı sipariş satırı atlandı (%s %s oz): %s", drink, size, e)
+                continue
+            self._ticket.add(line_id, OrderLine.of(drink, size, price))
+        self._next_id = count(max(self._ticket.ids(), default=0) + 1)
+
+    # **Abonelik**
+    def subscribe(self, callback):
+        """`callback(event, line_id, line)` fonksiyonunu değişikliklere abone eder."""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, event, line_id=None, line=None):
+        for callback in list(self._listeners):
+            callback(event, line_id, line)
+
+    # **Sepet işlemleri**
+    def add(self, drink, size, price, line_id=None, expected_version=None):
+        """Sepete yeni bir satır ekler ve satır id'sini döndürür; fiyat kuruş cinsindendir.
+
+        `line_id` verilmezse sıradaki id kullanılır (sipariş servisinde id'yi
+        istemci üretir). `expected_version` verilirse ve sepet o sürümden
+        sonra değişmişse ConflictError fırlatılır.
+        """
+        if not isinstance(price, int) or price < 0:
+            raise ValueError(f"geçersiz fiyat: {price!r}")
+        line = OrderLine.of(drink, size, price)
+        with self._lock:
+            self._check_version(expected_version)
+            if line_id is None:
+                line_id = next(self._next_id)
+            elif line_id in self._ticket:
+                raise ValueError(f"satır id'si kullanımda: {line_id!r}")
+            self._ticket.add(line_id, line)
+            self.version += 1
+            self.storage.record("add", line_id, line)
+        self._schedule_flush()
+        self._notify("add", line_id, line)
+        return line_id
+
+    def remove(self, line_id, expected_version=None):
+        """Verilen id'ye sahip satırı sepetten çıkarır."""
+        with self._lock:
+            self._check_version(expected_version)
+            line = self._ticket.remove(line_id)
+            self.version += 1
+            self.storage.record("remove", line_id, line)
+        self._schedule_flush()
+        self._notify("remove", line_id, line)
+        return line
+
+    def _check_version(self, expected_version):
+        """Kilit tutulurken çağrılır."""
+        if expected_version is not None and expected_version != self.version:
+            raise ConflictError(f"sepet sürümü {self.version}, beklenen {expected_version}")
+
+    def clear(self, expected_version=None):
+        """Sepetteki tüm satırları siler.
+
+        `expected_version` verilirse ve sepet o sürümden sonra değişmişse
+        ConflictError fırlatılır.
+        """
+        with self._lock:
+            self._check_version(expected_version)
+            self._ticket.clear()
+            self.version += 1
+            self.storage.record("clear", None, None)
+        self._schedule_flush()
+        self._notify("clear")
+
+    def lines(self):
+        return self._ticket.lines()
+
+    def items(self):
+        return self._ticket.items()
+
+    def folded(self):
+        """Aynı satırlar tek satırda: [(satır, adet)]."""
+        return self._ticket.folded()
+
+    def total(self):
+        """Sepet toplamını kuruş cinsinden döndürür (O(1))."""
+        return self._ticket.total()
+
+    def __len__(self):
+        return len(self._ticket)
+
+    def __contains__(self, line_id):
+        return line_id in self._ticket
+
+    def __iter__(self):
+        return iter(self.lines())
+
+    # **Kalıcılık**
+    def _schedule_flush(self):
+        """Bekleyen bir yazma yoksa gecikmeli bir toplu yazma planlar."""
+        with self._lock:
+            if self._timer is not None:
+                return
+            self._timer = threading.Timer(self.flush_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Bekleyen değişiklikleri hemen diske yazar."""
+        with self._flush_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                items = self._ticket.items()
+                pending = self.storage.checkpoint()
+            self.storage.flush(items, pending)
+
+
+_cart = None
+
+
+def get_cart():
+    """Uygulama genelinde paylaşılan sepeti (etkin fişi) döndürür.
+
+    Dönen nesne bir `TicketBook`tur: bekletilen fişler arasında geçilse de
+    pencereler aynı nesneyi kullanmaya devam eder. `POS_ORDER_SERVICE`
+    tanımlıysa (ör. "tcp:192.168.1.10:8765") sepetler yerel dosya yerine
+    sipariş servisinde tutulur; fiş kimliği `POS_TERMINAL`'dir.
+    """
+    global _cart
+    if _cart is None:
+        from held_tickets import TicketBook
+        address = os.environ.get("POS_ORDER_SERVICE")
+        if address:
+            from order_service import RemoteCart, default_ticket
+            terminal = os.environ.get("POS_TERMINAL") or default_ticket()
+            _cart = TicketBook(RemoteCart(address, terminal),
+                               factory=lambda key: RemoteCart(address, f"{terminal}-{key}"))
+        else:
+            _cart = TicketBook(Cart())
+        atexit.register(_cart.flush)
+    return _cart
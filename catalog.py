@@ -0,0 +1,251 @@
+import os
+import pickle
+import hashlib
+import logging
+import threading
+from collections import namedtuple
+from money import parse_price
+
+MENU_DIR = "menu"
+CACHE_FILE = os.path.join(MENU_DIR, ".catalog.cache")  # **Derlenmiş menü önbelleği**
+CACHE_VERSION = 2
+
+log = logging.getLogger(__name__)
+
+# **Bir kategori dosyası yeniden okunduğunda eklenen, silinen ve fiyatı/boyutu değişen ürünler**
+MenuDiff = namedtuple("MenuDiff", "added removed changed")
+
+
+def product_name(raw):
+    """Menüdeki ürün adını ekranda kullanılan biçime getirir ("caramel MOCHA" -> "Caramel mocha")."""
+    return raw.strip().lower().capitalize()
+
+
+def parse_menu_file(path):
+    """`ürün,boyut,fiyat` satırlarını {ürün: {boyut: kuruş}} sözlüğüne çevirir.
+
+    Hatalı satırlar (ör. negatif fiyat) atlanır ve (sözlük, hatalar) döndürülür.
+    """
+    products, errors = {}, []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                name, size, price = line.split(",")
+                size, price = int(size), parse_price(price)
+            except ValueError as e:
+                errors.append(f"{path}:{line_no}: {e}")
+                continue
+            products.setdefault(product_name(name), {})[size] = price
+    return products, errors
+
+
+def _file_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def diff_products(old, new):
+    """İki {ürün: {boyut: kuruş}} sözlüğünü karşılaştırır, sıralar menü dosyasındaki gibidir."""
+    added = [product for product in new if product not in old]
+    removed = [product for product in old if product not in new]
+    changed = [product for product in new if product in old and new[product] != old[product]]
+    return MenuDiff(added, removed, changed)
+
+
+class Catalog:
+    """Tüm `menu/*.txt` dosyalarını bir kez yükleyen ve kategori/ürün/boyut ile indeksleyen katalog.
+
+    Ayrıştırılmış hali `menu/.catalog.cache` dosyasında saklanır; dosyaların
+    değiştirilme zamanı ve boyutu tutmadığında içerik özeti kontrol edilir,
+    o da değiştiyse yalnızca değişen dosya yeniden ayrıştırılır.
+    """
+
+    def __init__(self, menu_dir=MENU_DIR, cache_file=CACHE_FILE):
+        self.menu_dir = menu_dir
+        self.cache_file = cache_file
+        self._index = {}  # **kategori -> ürün -> boyut -> fiyat (kuruş)**
+        self._sources = {}  # **dosya adı -> (mtime_ns, boyut, sha1)**
+        self._views = {}
+        self._errors = {}  # **kategori -> atlanan satırlar**
+        self.errors = []  # **Son yüklemede atlanan hatalı menü satırları**
+        self._listeners = []
+        self._refresh_lock = threading.Lock()
+        self.load()
+
+    # **Yükleme ve önbellek**
+    def load(self):
+        cached = self._read_cache()
+        cached_sources = cached.get("sources", {})
+        cached_index = cached.get("index", {})
+        cached_errors = cached.get("errors", {})
+        changed = False
+
+        index, sources, errors = {}, {}, {}
+        for filename in sorted(os.listdir(self.menu_dir)):
+            if not filename.endswith(".txt"):
+                continue
+            path = os.path.join(self.menu_dir, filename)
+            category = filename[:-4]
+            stat = os.stat(path)
+            old = cached_sources.get(filename)
+
+            if old and old[:2] == (stat.st_mtime_ns, stat.st_size):
+                index[category] = cached_index[category]
+                errors[category] = cached_errors.get(category, [])
+                sources[filename] = old
+                continue
+
+            digest = _file_hash(path)
+            if old and old[2] == digest:
+                # **Sadece zaman damgası değişmiş**
+                index[category] = cached_index[category]
+                errors[category] = cached_errors.get(category, [])
+            else:
+                index[category], errors[category] = parse_menu_file(path)
+            sources[filename] = (stat.st_mtime_ns, stat.st_size, digest)
+            changed = True
+
+        if changed or set(sources) != set(cached_sources):
+            self._write_cache(index, sources, errors)
+
+        self._index, self._sources, self._views, self._errors = index, sources, {}, errors
+        self.errors = [error for category_errors in errors.values() for error in category_errors]
+        for error in self.errors:
+            log.error("Menü satırı atlandı: %s", error)
+
+    # **Canlı yenileme**
+    def subscribe(self, callback):
+        """`callback(kategori, MenuDiff)` her değişen kategori için çağrılır."""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def refresh(self):
+        """Değişen menü dosyalarını yeniden okur ve {kategori: MenuDiff} döndürür.
+
+        Yalnızca değişen dosyalar ayrıştırılır; yeni indeks hazırlandıktan sonra
+        tek atamayla yerine konur, böylece okuyanlar hiçbir zaman yarım
+        güncellenmiş bir katalog görmez. Sepetteki satırlar fiyatlarını
+        kendileri taşıdığı için açık siparişler etkilenmez.
+        """
+        with self._refresh_lock:
+            index, sources, errors = dict(self._index), dict(self._sources), dict(self._errors)
+            changes, dirty, seen = {}, False, set()
+
+            for filename in sorted(os.listdir(self.menu_dir)):
+                if not filename.endswith(".txt"):
+                    continue
+                seen.add(filename)
+                path = os.path.join(self.menu_dir, filename)
+                category = filename[:-4]
+                stat = os.stat(path)
+                old = sources.get(filename)
+                if old and old[:2] == (stat.st_mtime_ns, stat.st_size):
+                    continue
+
+                digest = _file_hash(path)
+                sources[filename] = (stat.st_mtime_ns, stat.st_size, digest)
+                dirty = True
+                if old and old[2] == digest:
+                    continue  # **Sadece zaman damgası değişmiş**
+
+                products, errors[category] = parse_menu_file(path)
+                for error in errors[category]:
+                    log.error("Menü satırı atlandı: %s", error)
+                diff = diff_products(index.get(category, {}), products)
+                index[category] = products
+                if any(diff):
+                    changes[category] = diff
+
+            for filename in set(sources) - seen:
+                category = filename[:-4]
+                del sources[filename]
+                errors.pop(category, None)
+                diff = diff_products(index.pop(category, {}), {})
+                if any(diff):
+                    changes[category] = diff
+                dirty = True
+
+            if not dirty:
+                return {}
+            self._write_cache(index, sources, errors)
+
+            # **Önce indeks, sonra görünümler: eski görünüm en fazla bir okuma boyunca görülür**
+            self._index = index
+            self._views = {name: view for name, view in self._views.items() if name not in changes}
+            self._sources, self._errors = sources, errors
+            self.errors = [error for category_errors in errors.values() for error in category_errors]
+
+        for category, diff in changes.items():
+            log.info("Menü güncellendi: %s (+%d -%d ~%d)", category,
+                     len(diff.added), len(diff.removed), len(diff.changed))
+            for callback in list(self._listeners):
+                callback(category, diff)
+        return changes
+
+    def _read_cache(self):
+        try:
+            with open(self.cache_file, "rb") as f:
+                cached = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return {}
+        if cached.get("version") != CACHE_VERSION:
+            return {}
+        return cached
+
+    def _write_cache(self, index, sources, errors):
+        tmp_path = self.cache_file + ".tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump({"version": CACHE_VERSION, "sources": sources, "index": index, "errors": errors}, f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.cache_file)
+        except OSError as e:
+            log.warning("Menü önbelleği yazılamadı: %s", e)
+
+    # **Sorgular**
+    def categories(self):
+        return list(self._index)
+
+    def category(self, name):
+        """Kategoriyi {ürün: [(boyut, kuruş), ...]} olarak döndürür; yoksa boş sözlük."""
+        view = self._views.get(name)
+        if view is None:
+            products = self._index.get(name, {})
+            view = {product: list(sizes.items()) for product, sizes in products.items()}
+            self._views[name] = view
+        return view
+
+    def sizes(self, category, product):
+        return self.category(category).get(product, [])
+
+    def category_of(self, product):
+        """Ürünün bulunduğu ilk kategoriyi döndürür; bulunamazsa None."""
+        for category, products in self._index.items():
+            if product in products:
+                return category
+        return None
+
+    def price(self, category, product, size):
+        return self._index[category][product][size]
+
+    def __contains__(self, category):
+        return category in self._index
+
+
+_catalog = None
+
+
+def get_catalog():
+    """Uygulama genelinde paylaşılan menü kataloğunu döndürür."""
+    global _catalog
+    if _catalog is None:
+        _catalog = Catalog()
+    return _catalog
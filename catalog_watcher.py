@@ -0,0 +1,103 @@
+import os
+import logging
+import threading
+
+POLL_INTERVAL = 1.0  # **Yoklama aralığı (saniye)**
+DEBOUNCE_MS = 200  # **Editörler dosyayı birkaç adımda yazar; son değişiklikten sonra beklenir**
+
+log = logging.getLogger(__name__)
+
+
+def _refresh(catalog):
+    try:
+        catalog.refresh()
+    except OSError as e:
+        log.warning("Menü yeniden yüklenemedi: %s", e)
+
+
+class PollingWatcher:
+    """Menü klasörünü belirli aralıklarla yoklayan yedek izleyici.
+
+    `Catalog.refresh` değişmeyen dosyalar için yalnızca `stat` çağırdığı
+    için yoklama ucuzdur. Bildirimler bu iş parçacığından gelir.
+    """
+
+    def __init__(self, catalog, interval=POLL_INTERVAL):
+        self.catalog = catalog
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="menu-poll", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            _refresh(self.catalog)
+
+    def stop(self):
+        self._stop.set()
+
+
+class QtWatcher:
+    """Menü klasörünü `QFileSystemWatcher` (Linux'ta inotify) ile izler.
+
+    Bildirimler arayüz iş parçacığında gelir. Dosyayı silip yeniden yazan
+    editörlerde izleme düşeceği için her yenilemeden sonra yollar tekrar eklenir.
+    """
+
+    def __init__(self, catalog, parent=None):
+        from PyQt6.QtCore import QFileSystemWatcher, QTimer
+        self.catalog = catalog
+        self._watcher = QFileSystemWatcher(parent)
+        self._timer = QTimer(parent)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(DEBOUNCE_MS)
+        self._timer.timeout.connect(self._reload)
+        self._watcher.directoryChanged.connect(self._changed)
+        self._watcher.fileChanged.connect(self._changed)
+
+    def start(self):
+        if not self._watch_paths():
+            return None
+        return self
+
+    def _watch_paths(self):
+        menu_dir = self.catalog.menu_dir
+        paths = [menu_dir] + [os.path.join(menu_dir, filename) for filename in os.listdir(menu_dir)
+                              if filename.endswith(".txt")]
+        watched = set(self._watcher.files()) | set(self._watcher.directories())
+        missing = [path for path in paths if path not in watched]
+        return not missing or not self._watcher.addPaths(missing)
+
+    def _changed(self, path):
+        self._timer.start()
+
+    def _reload(self):
+        _refresh(self.catalog)
+        self._watch_paths()
+
+    def stop(self):
+        self._timer.stop()
+        self._watcher.removePaths(self._watcher.files() + self._watcher.directories())
+
+
+def watch_catalog(catalog, parent=None):
+    """Kataloğu canlı izlemeye başlar ve izleyiciyi döndürür.
+
+    Çalışan bir Qt uygulaması varsa dosya sistemi bildirimleri kullanılır;
+    yoksa veya izleme kurulamazsa (ör. inotify sınırı) yoklamaya geçilir.
+    """
+    try:
+        from PyQt6.QtCore import QCoreApplication
+        has_app = QCoreApplication.instance() is not None
+    except ImportError:
+        has_app = False
+
+    if has_app:
+        watcher = QtWatcher(catalog, parent).start()
+        if watcher is not None:
+            return watcher
+        log.warning("Menü klasörü izlenemiyor, yoklamaya geçiliyor")
+    return PollingWatcher(catalog).start()
@@ -0,0 +1,277 @@
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
+    QMessageBox, QGridLayout
+)
+from PyQt6.QtCore import pyqtSignal
+from functools import partial
+from catalog import diff_products
+from checkout import PosSession
+from money import format_tl
+from order_view import OrderListModel, OrderListView
+import instrumentation
+import theme
+
+
+class CategoryPage(QWidget):
+    """`menu/<kategori>.txt` içeriğinden oluşturulan ortak kategori sayfası.
+
+    Ana menü her kategori için tek bir sayfa oluşturur ve tekrar açılışlarda
+    aynı pencereyi gösterir. Menü dosyası değiştiğinde sayfa yeniden
+    kurulmaz; yalnızca etkilenen ürün butonları eklenir, kaldırılır veya
+    güncellenir. Gizlenen sayfa sepet, kampanya ve stok bildirimlerini
+    dinlemeyi bırakır; gösterildiğinde abone olur ve güncel halden yenilenir.
+    """
+
+    menu_changed = pyqtSignal(object)
+    promotions_changed = pyqtSignal()
+    stock_changed = pyqtSignal(object)
+
+    def __init__(self, category, title, main_menu=None):
+        super().__init__()
+        self.category = category
+        self.main_menu = main_menu  
+        self.session = PosSession()
+        self.cart = self.session.cart
+        self.drink_dict = self.session.catalog.category(category)
+        self.selected_drink = None
+        self.selected_sizes = []
+
+        self.setWindowTitle(title)
+        self.setGeometry(100, 100, 600, 500)
+
+        main_layout = QVBoxLayout()
+
+        if self.drink_dict:
+            self.label_drink = QLabel("Bir ürün seçin:")
+        else:
+            self.label_drink = QLabel("Bu kategoride henüz ürün yok.")
+        main_layout.addWidget(self.label_drink)
+
+        self.drink_grid = QGridLayout()
+        self.product_buttons = {}
+        self._grid_slots = 0  # **Sıradaki boş hücre; silinen ürünlerin hücresi boş kalır**
+        for drink in self.drink_dict.keys():
+            self._add_product_button(drink)
+
+        main_layout.addLayout(self.drink_grid)
+
+        self.label_size = QLabel("")
+        self.label_size.hide()
+        main_layout.addWidget(self.label_size)
+
+        self.size_buttons_layout = QHBoxLayout()
+        self.size_buttons = []  # **Boyut butonları yeniden kullanılır, silinmez**
+        main_layout.addLayout(self.size_buttons_layout)
+
+        self.label_orders = QLabel("Siparişler:")
+        main_layout.addWidget(self.label_orders)
+
+        # **Liste sepet modelinden beslenir, sadece değişen satırlar çizilir**
+        self.order_model = OrderListModel(self.cart, self, attached=False)
+        self.order_list = OrderListView()
+        self.order_list.setModel(self.order_model)
+        main_layout.addWidget(self.order_list)
+
+        self.total_label = QLabel("Toplam: 0.00 TL")
+        self.total_label.setObjectName("totalLabel")
+        main_layout.addWidget(self.total_label)
+
+        bottom_buttons = QHBoxLayout()
+        self.delete_button = QPushButton("Seçili Ürünü Sil")
+        self.delete_button.setObjectName("deleteButton")
+        self.delete_button.clicked.connect(self.delete_selected_order)
+        bottom_buttons.addWidget(self.delete_button)
+
+        self.clear_button = QPushButton("Siparişleri Temizle")
+        self.clear_button.setObjectName("clearButton")
+        self.clear_button.clicked.connect(self.clear_orders)
+        bottom_buttons.addWidget(self.clear_button)
+
+        self.confirm_button = QPushButton("Siparişi Onayla")
+        self.confirm_button.setObjectName("confirmButton")
+        self.confirm_button.clicked.connect(self.confirm_order)
+        bottom_buttons.addWidget(self.confirm_button)
+
+        main_layout.addLayout(bottom_buttons)
+
+        self.setLayout(main_layout)
+
+        self.order_model.rowsInserted.connect(self.update_total)
+        self.order_model.rowsRemoved.connect(self.update_total)
+        self.order_model.modelReset.connect(self.update_total)
+        self.order_model.dataChanged.connect(self.update_total)  # **Aynı ürünün adedi değişti**
+
+        # **Bildirimler başka iş parçacığından gelirse sinyal arayüz iş parçacığına taşır. Sayfa yalnızca
+        # görünürken abone olur; ön yüklemede kurulan gizli sayfalar sepet, kampanya ve stok dinlemez**
+        self.menu_changed.connect(self.apply_menu_diff)
+        self.promotions_changed.connect(self.update_total)
+        self.stock_changed.connect(self.apply_stock_states)
+        self._listening = False
+        self._promotions = None  # **Abone olunan kampanya motoru (etkin fişinki)**
+        self.update_total()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._listen(True)
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._listen(False)
+
+    def _listen(self, active):
+        """Gizli sayfa bildirimleri dinlemez; gösterilince liste, toplam ve stok durumları yeniden okunur"""
+        if active == self._listening:
+            return
+        self._listening = active
+        if active:
+            self.order_model.attach()
+            self.session.catalog.subscribe(self._on_catalog_changed)
+            self.session.inventory.subscribe(self._on_stock_changed)
+            diff = diff_products(self.drink_dict, self.session.catalog.category(self.category))
+            if any(diff):
+                self.apply_menu_diff(diff)
+            inventory = self.session.inventory
+            self.apply_stock_states({drink: inventory.product_state(drink) for drink in self.product_buttons})
+            self.update_total()
+        else:
+            self.order_model.detach()
+            self._follow_promotions()
+            self.session.catalog.unsubscribe(self._on_catalog_changed)
+            self.session.inventory.unsubscribe(self._on_stock_changed)
+
+    def _follow_promotions(self):
+        """Etkin fişin kampanya motoruna abone olur; fiş değişince veya sayfa gizlenince eskisini bırakır"""
+        engine = self.session.promotions if self._listening else None
+        if engine is not self._promotions:
+            if self._promotions is not None:
+                self._promotions.unsubscribe(self._on_promotions_changed)
+            if engine is not None:
+                engine.subscribe(self._on_promotions_changed)
+            self._promotions = engine
+
+    def _on_promotions_changed(self):
+        self.promotions_changed.emit()
+
+    def _on_stock_changed(self, changed):
+        self.stock_changed.emit(changed)
+
+    def _add_product_button(self, drink):
+        btn = QPushButton(drink)
+        btn.setFixedSize(200, 60)
+        btn.setObjectName("productButton")
+        btn.clicked.connect(partial(self.select_drink, drink))
+        self.product_buttons[drink] = btn
+        self.drink_grid.addWidget(btn, *divmod(self._grid_slots, 4))
+        self._grid_slots += 1
+        self._set_stock_state(btn, self.session.inventory.product_state(drink))
+
+    @staticmethod
+    def _set_stock_state(btn, state):
+        # **Biten ürün seçilemez, azalan ürün renkle işaretlenir**
+        theme.set_state(btn, "stock", state or "")
+        btn.setEnabled(state != "out")
+
+    def apply_stock_states(self, changed):
+        """Stok durumu değişen ürünlerin butonlarını günceller; {ürün: durum} bellekten gelir"""
+        for drink, state in changed.items():
+            btn = self.product_buttons.get(drink)
+            if btn is not None:
+                self._set_stock_state(btn, state)
+
+    def _on_catalog_changed(self, category, diff):
+        if category == self.category:
+            self.menu_changed.emit(diff)
+
+    def apply_menu_diff(self, diff):
+        """Menü dosyası değiştiğinde yalnızca etkilenen butonları günceller; sepete dokunmaz"""
+        self.drink_dict = self.session.catalog.category(self.category)
+
+        for drink in diff.removed:
+            btn = self.product_buttons.pop(drink)
+            self.drink_grid.removeWidget(btn)
+            btn.deleteLater()
+        for drink in diff.added:
+            self._add_product_button(drink)
+
+        if self.selected_drink in diff.removed:
+            self.selected_drink = None
+            self.selected_sizes = []
+            self.label_size.hide()
+            for btn in self.size_buttons:
+                btn.hide()
+        elif self.selected_drink in diff.changed:
+            self.select_drink(self.selected_drink)
+
+        self.label_drink.setText("Bir ürün seçin:" if self.drink_dict else "Bu kategoride henüz ürün yok.")
+
+    def select_drink(self, drink):
+        # **Sadece önceki ve yeni seçili buton yeniden cilalanır**
+        if self.selected_drink in self.product_buttons:
+            theme.set_state(self.product_buttons[self.selected_drink], "selected", False)
+        theme.set_state(self.product_buttons[drink], "selected", True)
+
+        self.selected_drink = drink
+        self.label_size.setText(f"{drink} için boyut seçin:")
+        self.label_size.show()
+
+        self.selected_sizes = self.drink_dict[drink]
+
+        # **Eksik buton varsa bir kez oluştur, sonra sadece yazısını değiştir**
+        while len(self.size_buttons) < len(self.selected_sizes):
+            btn = QPushButton()
+            btn.setObjectName("sizeButton")
+            btn.setFixedSize(100, 50)
+            btn.clicked.connect(partial(self.select_size, len(self.size_buttons)))
+            self.size_buttons.append(btn)
+            self.size_buttons_layout.addWidget(btn)
+
+        for index, btn in enumerate(self.size_buttons):
+            if index < len(self.selected_sizes):
+                size, _ = self.selected_sizes[index]
+                btn.setText(f"{size} oz")
+                btn.show()
+            else:
+                btn.hide()
+
+    def select_size(self, index):
+        size, _ = self.selected_sizes[index]
+        self.add_order(size)
+
+    def add_order(self, size):
+        if not self.selected_drink:
+            QMessageBox.warning(self, "Uyarı", "Lütfen önce bir ürün seçin.")
+            return
+
+        with instrumentation.timer("add_order"):
+            self.session.add_item(self.category, self.selected_drink, size)
+
+    def update_total(self):
+        """Toplam fiyatı güncelle; liste model tarafından güncellenir"""
+        self._follow_promotions()
+        total = self.session.total()
+        text = f"Toplam: {format_tl(total)} TL"
+        if total != self.cart.total():
+            text += f"  (İndirim: {format_tl(self.cart.total() - total)} TL)"
+        self.total_label.setText(text)
+
+    def delete_selected_order(self):
+        """Seçili ürünü sepetten kaldırır, ana menü abonelik ile güncellenir"""
+        line_id = self.order_list.current_line_id()
+        if line_id is None:
+            QMessageBox.warning(self, "Uyarı", "Lütfen silmek için bir ürün seçin.")
+            return
+
+        try:
+            self.cart.remove(line_id)
+        except KeyError:
+            # **Satır başka kasada silinmiş, bildirimi henüz listeye ulaşmamış**
+            self.order_list.clear_current()
+
+    def clear_orders(self):
+        self.cart.clear()
+
+    def confirm_order(self):
+        """Sipariş onaylandığında hazırlık istasyonlarına gönderir ve pencereyi kapatır"""
+        self.session.confirm()
+        #QMessageBox.information(self, "Sipariş Onaylandı", "Siparişiniz güncellendi.")
+        self.close()
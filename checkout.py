@@ -0,0 +1,161 @@
+import time
+import logging
+from cart import get_cart, ConflictError
+from catalog import get_catalog
+from campaigns import promotions_for
+
+log = logging.getLogger(__name__)
+
+
+class EmptyOrderError(Exception):
+    """Boş sepet için ödeme alınmaya çalışıldı."""
+
+
+class PosSession:
+    """Sepet ve ödeme akışının arayüzden bağımsız (PyQt6 gerektirmeyen) hali.
+
+    Pencereler bu sınıfı kullanır; aynı akış ekran olmadan da sürülebilir
+    (ör. `benchmarks/bench_pipeline.py`).
+    """
+
+    def __init__(self, cart=None, catalog=None, ledger=None, promotions=None, inventory=None,
+                 outbox=None, production=None):
+        self.cart = cart if cart is not None else get_cart()
+        self.catalog = catalog if catalog is not None else get_catalog()
+        self._promotions = promotions
+        self._ledger = ledger
+        self._inventory = inventory
+        self._outbox = outbox
+        self._production = production
+
+    @property
+    def promotions(self):
+        """Kampanya motoru; bekletilen fişlerde her erişimde etkin fişin motoru döner."""
+        if self._promotions is not None:
+            return self._promotions
+        return promotions_for(self.cart)
+
+    @property
+    def ledger(self):
+        if self._ledger is None:
+            from ledger import get_ledger
+            self._ledger = get_ledger()
+        return self._ledger
+
+    @property
+    def inventory(self):
+        if self._inventory is None:
+            if self._ledger is None:
+                from inventory import get_inventory
+                self._inventory = get_inventory()
+            else:
+                from inventory import Inventory
+                self._inventory = Inventory(self._ledger)
+        return self._inventory
+
+    @property
+    def outbox(self):
+        """Merkeze gönderim kuyruğu; `POS_OUTBOX` tanımlı değilse None."""
+        if self._outbox is None:
+            from outbox import get_outbox
+            self._outbox = get_outbox()
+        return self._outbox
+
+    @property
+    def production(self):
+        """Barista/mutfak ekranlarına yayın istemcisi; `POS_PRODUCTION` tanımlı değilse None."""
+        if self._production is None:
+            from production import get_production
+            self._production = get_production()
+        return self._production
+
+    def add_item(self, category, product, size):
+        """Katalogdaki ürünü güncel fiyatıyla sepete ekler, satır id'sini döndürür."""
+        price = self.catalog.price(category, product, size)
+        return self.cart.add(product, size, price)
+
+    def remove(self, line_id):
+        return self.cart.remove(line_id)
+
+    def clear(self):
+        self.cart.clear()
+
+    def confirm(self):
+        """Sepetin henüz gönderilmemiş satırlarını hazırlık istasyonlarına gönderir (ağ beklenmez)."""
+        production = self.production
+        if production is not None:
+            production.sync(self.cart, self.catalog)
+
+    def total(self):
+        """Kampanya indirimi düşülmüş toplam (kuruş)."""
+        return self.promotions.total()
+
+    def discount(self):
+        return self.cart.total() - self.total()
+
+    def checkout(self, payment_method="nakit", payment=None):
+        """Sepeti satış defterine kaydeder, sepeti boşaltır ve fiş numarasını döndürür.
+
+        `payment` (tenders.Payment) verilirse ödeme türü ondan alınır ve ödeme
+        kalemleri fişle birlikte yazılır. Stok düşümü fişle aynı veritabanı
+        işleminde yapılır; gönderim kuyruğu varsa fiş ona da eklenir (ağ
+        beklenmez). Sepet boşsa EmptyOrderError, ödeme tutarı fiş toplamını
+        tutmuyorsa ConflictError fırlatır. Sepet ancak fiş deftere yazıldıktan
+        sonra boşaltılır: defter hatasında (ör. veritabanı kilitli) istisna
+        yükselir ve satırlar sepette kalır.
+        """
+        items, version, discount = self.cart.items(), self.cart.version, self.discount()
+        lines = [line for _, line in items]
+        if not lines:
+            raise EmptyOrderError("Boş sipariş veremezsiniz!")
+        total = sum(price for _, _, price in lines) - discount
+        payments = None
+        if payment is not None:
+            if payment.due != total or not payment.complete():
+                raise ConflictError(f"ödeme {payment.paid()} kuruş, fiş toplamı {total} kuruş")
+            payment_method, payments = payment.method(), list(payment.tenders)
+
+        # **Onaylanmadan ödemeye geçilen satırlar da istasyonlara gider**
+        self.confirm()
+
+        categories = [self.catalog.category_of(product) for product, _, _ in lines]
+        consumption = self.inventory.consumption(lines)
+        created_at = time.time()
+        receipt_no = self.ledger.record_sale(lines, payment_method=payment_method, categories=categories,
+                                             created_at=created_at, discount=discount, stock=consumption,
+                                             payments=payments)
+        self.inventory.applied(consumption)
+
+        self._settle(receipt_no, items, version)
+        if self.production is not None:
+            self.production.forget(self.cart)
+
+        outbox = self.outbox
+        if outbox is not None:
+            try:
+                outbox.submit({
+                    "receipt_no": receipt_no,
+                    "created_at": created_at,
+                    "payment_method": payment_method,
+                    "total": total,
+                    "discount": discount,
+                    "lines": [[category, product, size, price]
+                              for category, (product, size, price) in zip(categories, lines)],
+                    "payments": [list(tender) for tender in payments or ()],
+                })
+            except OSError:
+                log.exception("Fiş %s gönderim kuyruğuna eklenemedi; satış defterde duruyor", receipt_no)
+        return receipt_no
+
+    def _settle(self, receipt_no, items, version):
+        """Deftere yazılmış fişin satırlarını sepetten çıkarır; fiş bu noktada geri alınmaz."""
+        try:
+            try:
+                self.cart.clear(expected_version=version)
+            except ConflictError:
+                # **Ödeme sırasında başka kasadan eklenen satırlar sepette kalır, yalnızca satılanlar çıkarılır**
+                sold = {line_id for line_id, _ in items}
+                for line_id in [line_id for line_id, _ in self.cart.items() if line_id in sold]:
+                    self.cart.remove(line_id)
+        except Exception:
+            log.exception("Fiş %s kaydedildi ama sepet boşaltılamadı", receipt_no)
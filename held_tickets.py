@@ -0,0 +1,191 @@
+import os
+import json
+import logging
+import threading
+from functools import partial
+from cart import Cart
+from order_journal import OrderJournal
+
+TICKETS_DIR = "tickets"  # **Bekletilen her fişin günlüğü ve görüntüsü bu klasörde tutulur**
+NAMES_FILE = "names.json"  # **fiş numarası -> kasiyerin verdiği ad; yalnızca açma/kapamada yazılır**
+MAIN_TICKET = "0"  # **Varsayılan fiş: eski tek sepet (orders.journal)**
+MAIN_NAME = "Ana"
+
+log = logging.getLogger(__name__)
+
+
+def ticket_storage(directory, key):
+    """Bekletilen fiş için ayrı bir sepet günlüğü."""
+    path = os.path.join(directory, key)
+    return OrderJournal(journal_path=path + ".journal", snapshot_path=path + ".snapshot.json", legacy_path=None)
+
+
+class TicketBook:
+    """Adlandırılmış (bekletilen) fişleri tutar ve etkin fiş için `Cart` gibi davranır.
+
+    Her fiş bellekte kendi sepetiyle durur ve kendi günlüğüne yazar; fişler
+    arasında geçiş yalnızca etkin fiş anahtarını değiştirir, dosya yazılmaz.
+    Aboneler yalnızca etkin fişin değişikliklerini alır; geçişte "reset"
+    olayı gönderilir ve liste/kampanya motoru yeni fişi baştan okur.
+    """
+
+    def __init__(self, main_cart, directory=TICKETS_DIR, factory=None):
+        self.directory = directory
+        self.factory = factory or (lambda key: Cart(storage=ticket_storage(directory, key)))
+        self._carts = {}
+        self._names = {}
+        self._active = MAIN_TICKET
+        self._listeners = []
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+        self._attach(MAIN_TICKET, MAIN_NAME, main_cart)
+        for key, name in self._read_names().items():
+            cart = self.factory(key)
+            # **Sipariş servisine henüz bağlanmamış uzak fiş boş görünür; silinmez, bağlanınca dolar**
+            if len(cart) or not getattr(cart, "synced", True):
+                self._attach(key, name, cart)
+            else:
+                self._discard(key, cart)
+        self._write_names()
+
+    def _attach(self, key, name, cart):
+        self._carts[key] = cart
+        self._names[key] = name
+        cart.subscribe(partial(self._forward, key))
+
+    def _read_names(self):
+        try:
+            with open(os.path.join(self.directory, NAMES_FILE), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except json.JSONDecodeError:
+            log.error("Bekletilen fiş adları okunamadı: %s", os.path.join(self.directory, NAMES_FILE))
+            return {}
+
+    def _write_names(self):
+        path = os.path.join(self.directory, NAMES_FILE)
+        names = {key: name for key, name in self._names.items() if key != MAIN_TICKET}
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(names, f, ensure_ascii=False)
+        os.replace(path + ".tmp", path)
+
+    def _discard(self, key, cart):
+        """Sepeti durdurur ve fişin dosyalarını siler."""
+        cart.flush()
+        if hasattr(cart, "close"):
+            cart.close()  # **Uzak sepetin bağlantısı**
+        storage = getattr(cart, "storage", None)
+        if storage is not None:
+            storage.close()
+            for path in (storage.journal_path, storage.snapshot_path):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    # **Fişler**
+    @property
+    def active(self):
+        return self._active
+
+    def tickets(self):
+        """[(anahtar, ad, satır sayısı)], açılış sırasıyla."""
+        return [(key, self._names[key], len(cart)) for key, cart in self._carts.items()]
+
+    def name(self, key=None):
+        return self._names[self._active if key is None else key]
+
+    def open(self, name=None):
+        """Yeni boş bir fiş açar ve ona geçer; mevcut fiş olduğu gibi bekletilir."""
+        with self._lock:
+            key = str(max(int(key) for key in self._carts) + 1)
+        self._attach(key, name or f"Fiş {key}", self.factory(key))
+        self._write_names()
+        self.switch(key)
+        return key
+
+    def switch(self, key):
+        """Etkin fişi değiştirir (O(1), dosya yazmaz). Boş kalan bekletilmiş fiş kapatılır."""
+        if key not in self._carts:
+            raise KeyError(key)
+        with self._lock:
+            previous, self._active = self._active, key
+        if previous == key:
+            return
+        self._notify("reset")
+        cart = self._carts.get(previous)
+        if previous != MAIN_TICKET and cart is not None and not len(cart) and getattr(cart, "synced", True):
+            self.close(previous)
+
+    def close(self, key):
+        """Fişi kapatır ve dosyalarını siler; etkin fişse ana fişe geçilir."""
+        if key == MAIN_TICKET:
+            raise ValueError("ana fiş kapatılamaz")
+        if key == self._active:
+            self.switch(MAIN_TICKET)
+        cart = self._carts.pop(key, None)
+        if cart is None:
+            return
+        del self._names[key]
+        self._discard(key, cart)
+        self._write_names()
+
+    def current(self):
+        return self._carts[self._active]
+
+    # **Abonelik (yalnızca etkin fiş)**
+    def subscribe(self, callback):
+        """`callback(event, line_id, line)` fonksiyonunu etkin fişin değişikliklerine abone eder."""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, event, line_id=None, line=None):
+        for callback in list(self._listeners):
+            callback(event, line_id, line)
+
+    def _forward(self, key, event, line_id, line):
+        if key == self._active:
+            self._notify(event, line_id, line)
+
+    # **Cart ile aynı arayüz, etkin fiş üzerinde**
+    @property
+    def version(self):
+        return self.current().version
+
+    def add(self, drink, size, price, expected_version=None):
+        return self.current().add(drink, size, price, expected_version=expected_version)
+
+    def remove(self, line_id, expected_version=None):
+        return self.current().remove(line_id, expected_version=expected_version)
+
+    def clear(self, expected_version=None):
+        self.current().clear(expected_version=expected_version)
+
+    def lines(self):
+        return self.current().lines()
+
+    def items(self):
+        return self.current().items()
+
+    def folded(self):
+        return self.current().folded()
+
+    def total(self):
+        return self.current().total()
+
+    def __len__(self):
+        return len(self.current())
+
+    def __iter__(self):
+        return iter(self.current())
+
+    def flush(self):
+        for cart in list(self._carts.values()):
+            cart.flush()
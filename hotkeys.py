@@ -0,0 +1,206 @@
+import os
+import csv
+import time
+import logging
+import threading
+from collections import namedtuple
+from catalog import product_name, get_catalog
+from search import CODES_FILE, read_codes
+
+HOTKEYS_FILE = os.path.join("menu", "hotkeys.csv")  # **tuş,kategori,ürün,boyut**
+QUANTITY_KEY = "*"  # **"3*" sonrası okutulan kod veya basılan tuş 3 adet ekler**
+MAX_QUANTITY = 99  # **Yanlışlıkla adet sanılan uzun kodlar sepete yüzlerce satır eklemesin**
+SCAN_GAP = 0.03  # **Saniye; barkod okuyucu rakamları bundan kısa aralıklarla yazar**
+MIN_SCAN_LENGTH = 6  # **Daha kısa hızlı diziler elle yazılmış PLU kodu sayılır**
+
+log = logging.getLogger(__name__)
+
+# **Tek tuşla eklenecek ürün; fiyat tablo kurulurken katalogdan alınır**
+Sku = namedtuple("Sku", "category product size price")
+# **Enter ile biten girişin sonucu: okunan kod, bulunduysa ürünü ve adet**
+Entry = namedtuple("Entry", "code sku quantity")
+
+
+def read_hotkeys(path):
+    """`menu/hotkeys.csv` dosyasını {tuş: (kategori, ürün, boyut)} olarak okur; (tuşlar, hatalar) döndürür."""
+    hotkeys, errors = {}, []
+    try:
+        f = open(path, "r", newline="", encoding="utf-8")
+    except FileNotFoundError:
+        return hotkeys, errors
+
+    with f:
+        for line_no, row in enumerate(csv.reader(f), start=1):
+            if not row or row[0].startswith("#"):
+                continue
+            try:
+                key, category, product, size = (value.strip() for value in row[:4])
+                if not key or key.isdigit() or key == QUANTITY_KEY:
+                    raise ValueError(f"rakamlar ve {QUANTITY_KEY!r} adet için ayrılmıştır: {key!r}")
+                hotkeys[key] = (category, product_name(product), int(size))
+            except ValueError as e:
+                errors.append(f"{path}:{line_no}: {e}")
+    return hotkeys, errors
+
+
+class HotkeyTable:
+    """Tuş ve kod -> ürün tablosu; her tuş vuruşu tek bir sözlük aramasıdır.
+
+    Tuşlar `key_code` ile arayüzün tuş kodlarına (ör. Qt'nin birleşik tuş
+    değeri) bir kez çevrilir, fiyatlar katalogdan bir kez okunur. Katalog
+    değiştiğinde tablo bir sonraki aramada yeniden kurulur.
+    """
+
+    def __init__(self, catalog, hotkeys_path=HOTKEYS_FILE, codes_path=CODES_FILE, key_code=str):
+        self.catalog = catalog
+        self.hotkeys_path = hotkeys_path
+        self.codes_path = codes_path
+        self.key_code = key_code
+        self._state = None
+        self._lock = threading.Lock()
+        catalog.subscribe(self._on_catalog_changed)
+
+    def _on_catalog_changed(self, category, diff):
+        self._state = None
+
+    def _table(self):
+        state = self._state
+        if state is None:
+            with self._lock:
+                state = self._state
+                if state is None:
+                    state = self._state = self._build()
+        return state
+
+    def _sku(self, source, category, product, size):
+        try:
+            return Sku(category, product, size, self.catalog.price(category, product, size))
+        except KeyError:
+            log.warning("%s katalogda olmayan ürünü gösteriyor: %s %s (%s oz)", source, category, product, size)
+            return None
+
+    def _build(self):
+        keys, codes = {}, {}
+        hotkeys, errors = read_hotkeys(self.hotkeys_path)
+        for error in errors:
+            log.error("Kısayol tuşu atlandı: %s", error)
+        for key, (category, product, size) in hotkeys.items():
+            code = self.key_code(key)
+            sku = self._sku(f"Kısayol {key}", category, product, size)
+            if code is None:
+                log.error("Kısayol tuşu tanınmadı: %s", key)
+            elif sku is not None:
+                keys[code] = sku
+
+        # **Boyutu belli PLU kodları ve barkodlar da doğrudan eklenir; diğerleri aramaya kalır**
+        for code, match in read_codes(self.codes_path)[0].items():
+            if match.size is not None:
+                sku = self._sku(f"Ürün kodu {code}", *match)
+                if sku is not None:
+                    codes[code] = sku
+        return keys, codes
+
+    def key(self, code):
+        return self._table()[0].get(code)
+
+    def code(self, code):
+        return self._table()[1].get(code)
+
+    def __len__(self):
+        return len(self._table()[0])
+
+
+class KeyEntry:
+    """Kasiyerin klavye girişini ürün ve adede çeviren durum makinesi (arayüzden bağımsız).
+
+    Rakamlar bir tampona yazılır. Ardından kısayol tuşu gelirse tampon adettir,
+    Enter gelirse PLU kodu veya barkoddur; `*` tamponu açıkça adet yapar
+    ("3*101" Enter). Barkod okuyucu rakamları insanın yazamayacağı hızda
+    gönderir: Enter'dan önceki hızlı dizi barkod, ondan önce elle yazılan
+    rakamlar adet sayılır ("3" ve ardından okutma 3 adet ekler).
+    """
+
+    def __init__(self, table, clock=time.monotonic):
+        self.table = table
+        self.clock = clock
+        self.digits = []  # **[(rakam, zaman)]**
+        self.quantity = None
+
+    def digit(self, char, now=None):
+        self.digits.append((char, self.clock() if now is None else now))
+
+    def times(self):
+        """`*`: tampondaki rakamları adet yapar."""
+        if self.digits:
+            self.quantity = int(self._text(self.digits))
+            self.digits = []
+
+    def backspace(self):
+        if self.digits:
+            self.digits.pop()
+        else:
+            self.quantity = None
+
+    def clear(self):
+        self.digits = []
+        self.quantity = None
+
+    def pending(self):
+        return bool(self.digits) or self.quantity is not None
+
+    def hotkey(self, code):
+        """Kısayol tuşunu çözer; tanınırsa (Sku, adet) döndürür ve tamponu boşaltır, değilse None."""
+        sku = self.table.key(code)
+        if sku is None:
+            return None
+        quantity = self.quantity
+        if self.digits:
+            quantity = int(self._text(self.digits))
+        self.clear()
+        return sku, quantity or 1
+
+    def enter(self, now=None):
+        """Tampondaki kodu çözer ve tamponu boşaltır; tampon boşsa None."""
+        if not self.digits:
+            return None
+        digits, quantity = self.digits, self.quantity
+        burst = self._burst(digits, self.clock() if now is None else now)
+        if quantity is None and 0 < burst and len(digits) - burst >= MIN_SCAN_LENGTH:
+            quantity = int(self._text(digits[:burst]))
+            digits = digits[burst:]
+        code = self._text(digits)
+        self.clear()
+        return Entry(code, self.table.code(code), quantity or 1)
+
+    @staticmethod
+    def _burst(digits, now):
+        """Sondaki okuyucu hızındaki dizinin başladığı konum (Enter dahil)."""
+        start, previous = len(digits), now
+        while start > 0 and previous - digits[start - 1][1] <= SCAN_GAP:
+            start -= 1
+            previous = digits[start][1]
+        return start
+
+    @staticmethod
+    def _text(digits):
+        return "".join(char for char, _ in digits)
+
+    def text(self):
+        """Kasiyere gösterilen tampon, ör. "3 × 101"."""
+        parts = []
+        if self.quantity is not None:
+            parts.append(f"{self.quantity} ×")
+        if self.digits:
+            parts.append(self._text(self.digits))
+        return " ".join(parts)
+
+
+_hotkey_table = None
+
+
+def get_hotkey_table(key_code=str):
+    """Uygulama genelinde paylaşılan kısayol tablosunu döndürür."""
+    global _hotkey_table
+    if _hotkey_table is None:
+        _hotkey_table = HotkeyTable(get_catalog(), key_code=key_code)
+    return _hotkey_table
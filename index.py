@@ -1,29 +1,50 @@
 import sys
-import subprocess
-import json
-from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout, QGridLayout, QPushButton, QLabel, QListWidget, QMessageBox, QHBoxLayout
-from PyQt6.QtCore import pyqtSignal
-
-ORDERS_FILE = "orders.json"
-RECEIPT_FILE = "receipt_counter.json"  # **Fiş sayacı dosyası**
-
+import importlib
+from PyQt6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QGridLayout, QPushButton, QLabel, QMessageBox, QHBoxLayout,
+                             QLineEdit, QListWidget, QListWidgetItem, QInputDialog)
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QEvent
+from PyQt6.QtGui import QKeySequence, QShortcut
+from cart import get_cart
+from held_tickets import MAIN_TICKET
+from money import format_tl
+from order_view import OrderListModel, OrderListView
+import instrumentation
+import theme
+
+# **Buton adı -> menu/ klasöründeki kategori dosyası (uzantısız)**
 PAGES = {
-    "Sıcak İçecekler": "hot_drinks.py",
-    "Soğuk İçecekler": "cold_drinks.py",
-    "Ekstralar": "extras.py",
-    "Tatlılar": "desserts.py",
-    "Sandviçler": "sandwiches.py",
-    "Dolap İçecekleri": "fridge_drinks.py",
-    "Kampanyalar": "campaigns.py",
-    "Market": "market.py",
-    "Mackbear Shop": "shop.py"
+    "Sıcak İçecekler": "hotDrinks",
+    "Soğuk İçecekler": "coldDrinks",
+    "Ekstralar": "extras",
+    "Tatlılar": "desserts",
+    "Sandviçler": "sandwiches",
+    "Dolap İçecekleri": "fridgeDrinks",
+    "Kampanyalar": "campaigns",
+    "Market": "market",
+    "Mackbear Shop": "shop"
 }
+PAGE_TITLES = {category: label for label, category in PAGES.items()}
+
+# **Ana pencere açıldıktan sonra boşta iken yüklenecek modüller**
+PREWARM_MODULES = ("category_page", "payments", "printing")
+PREWARM_DELAY_MS = 100
+
+
+def qt_key_code(text):
+    """"F1", "Ctrl+1" gibi tuş adını tuş olayındaki birleşik değere çevirir; tanınmazsa None."""
+    sequence = QKeySequence(text)
+    return sequence[0].toCombined() if sequence.count() == 1 else None
+
 
 class MainMenu(QWidget):
     update_signal = pyqtSignal()
 
     def __init__(self):
         super().__init__()
+        self.cart = get_cart()
+        self.promotions = None  # **Etkin fişin kampanya motoru; ön yüklemede bağlanır**
+        self.pages = {}  # **Açılmış kategori sayfaları, tekrar kullanılmak üzere**
+        self.payment_windows = {}  # **fiş -> ödeme penceresi; kart onayı beklenirken sıradaki fişe geçilebilir**
 
         self.setWindowTitle("Mackbear Kasa Uygulaması")
         self.setGeometry(100, 100, 600, 500)
@@ -31,27 +52,52 @@ class MainMenu(QWidget):
         main_layout = QVBoxLayout()
 
         # **Fiş Sayacı (En Üste)**
-        self.receipt_count = 0  # **Fiş sayısını sıfırdan başlat**
-        self.receipt_label = QLabel(f"Toplam Kesilen Fiş: {self.receipt_count}")
-        self.receipt_label.setStyleSheet("font-size: 18px; font-weight: bold; color: white;")
+        self.receipt_label = QLabel("Toplam Kesilen Fiş: -")
+        self.receipt_label.setObjectName("receiptLabel")
         main_layout.addWidget(self.receipt_label)
 
+        # **Ürün arama: isim, PLU kodu veya barkod okuyucu (Enter ile biter)**
+        self.search_box = QLineEdit()
+        self.search_box.setObjectName("searchBox")
+        self.search_box.setPlaceholderText("Ürün ara veya kod okut...")
+        self.search_box.textChanged.connect(self.search)
+        self.search_box.returnPressed.connect(self.pick_first_result)
+        self.search_box.setFocusPolicy(Qt.FocusPolicy.ClickFocus)  # **Açılışta tuşlar hızlı girişe gider**
+
+        # **Hızlı giriş: kısayol tuşu, adet öneki ve barkod okuyucu; pencere açılmadan satır eklenir**
+        self.key_entry = None  # **Kısayol tablosu ön yüklemede kurulur**
+        self.key_buffer_label = QLabel()
+        self.key_buffer_label.setObjectName("keyBuffer")
+        self.key_buffer_label.hide()
+        self.key_entry_button = QPushButton("Hızlı Giriş")
+        self.key_entry_button.setObjectName("keyEntryButton")
+        self.key_entry_button.setCheckable(True)
+        self.key_entry_button.setChecked(True)
+        self.key_entry_button.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.key_entry_button.toggled.connect(self.toggle_key_entry)
+
+        search_row = QHBoxLayout()
+        search_row.addWidget(self.search_box)
+        search_row.addWidget(self.key_buffer_label)
+        search_row.addWidget(self.key_entry_button)
+        main_layout.addLayout(search_row)
+
+        self.search_results = QListWidget()
+        self.search_results.setObjectName("searchResults")
+        self.search_results.itemActivated.connect(self.pick_result)
+        self.search_results.hide()
+        main_layout.addWidget(self.search_results)
+
         # **Butonları GridLayout ile sıralıyoruz**
         grid_layout = QGridLayout()
         row, col = 0, 0
         max_columns = 3
 
-        for label, filename in PAGES.items():
+        for label, category in PAGES.items():
             btn = QPushButton(label)
             btn.setFixedSize(200, 60)
-            btn.setStyleSheet("""
-                QPushButton {
-                    font-size: 16px; font-weight: bold; background-color: white; color: black; 
-                    border: 2px solid black; border-radius: 10px;
-                }
-                QPushButton:hover { background-color: #f0f0f0; }
-            """)
-            btn.clicked.connect(lambda checked, f=filename: self.open_page(f))
+            btn.setObjectName("pageButton")
+            btn.clicked.connect(lambda checked, c=category, t=label: self.open_page(c, t))
             grid_layout.addWidget(btn, row, col)
 
             col += 1
@@ -61,29 +107,42 @@ class MainMenu(QWidget):
 
         main_layout.addLayout(grid_layout)
 
+        # **Bekletilen fişler: müşteri kenara çekilince yeni fiş açılır, fişler arası geçiş anında olur**
+        ticket_row = QHBoxLayout()
+        self.ticket_bar = QHBoxLayout()
+        self.ticket_buttons = {}
+        ticket_row.addLayout(self.ticket_bar)
+        ticket_row.addStretch()
+        self.hold_button = QPushButton("+ Yeni Fiş")
+        self.hold_button.setObjectName("holdButton")
+        self.hold_button.clicked.connect(self.hold_ticket)
+        ticket_row.addWidget(self.hold_button)
+        main_layout.addLayout(ticket_row)
+
         # **Sipariş Listesi**
         self.label_orders = QLabel("Seçilen Ürünler:")
-        self.label_orders.setStyleSheet("font-size: 18px; font-weight: bold")
+        self.label_orders.setObjectName("sectionLabel")
         main_layout.addWidget(self.label_orders)
 
-        self.order_list = QListWidget()
-        self.order_list.setStyleSheet("font-size: 14px;")
+        self.order_model = OrderListModel(self.cart, self)
+        self.order_list = OrderListView()
+        self.order_list.setModel(self.order_model)
         main_layout.addWidget(self.order_list)
 
         self.total_label = QLabel("Toplam: 0.00 TL")
-        self.total_label.setStyleSheet("font-size: 20px; font-weight: bold; color: red;")
+        self.total_label.setObjectName("totalLabel")
         main_layout.addWidget(self.total_label)
 
         # **Alt Butonlar (Silme & Ödeme)**
         bottom_buttons = QHBoxLayout()
 
         self.delete_button = QPushButton("Seçili Ürünü Sil")
-        self.delete_button.setStyleSheet("font-size: 16px;")
+        self.delete_button.setObjectName("deleteButton")
         self.delete_button.clicked.connect(self.delete_selected_order)
         bottom_buttons.addWidget(self.delete_button)
 
         self.complete_button = QPushButton("Siparişi Tamamla")
-        self.complete_button.setStyleSheet("font-size: 16px; background-color: green; color: white;")
+        self.complete_button.setObjectName("completeButton")
         self.complete_button.clicked.connect(self.complete_payment)
         bottom_buttons.addWidget(self.complete_button)
 
@@ -91,97 +150,316 @@ class MainMenu(QWidget):
 
         self.setLayout(main_layout)
 
-        self.update_signal.connect(self.load_orders)
-        self.load_orders()
-
-    def open_page(self, filename):
-        if filename == "hot_drinks.py":
-            from hot_drinks import HotDrinks
-            self.drink_window = HotDrinks(main_menu=self)
-            self.drink_window.show()
-        elif filename == "payments.py":
-            from payments import PaymentSystem
-            self.payment_window = PaymentSystem(main_menu=self)
-            self.payment_window.show()
-        else:
-            subprocess.Popen(["python", filename])
-
-    def load_orders(self):
-        try:
-            with open(ORDERS_FILE, "r", encoding="utf-8") as f:
-                orders = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            orders = []
-
-        self.order_list.clear()
-
-        if not orders:
-            self.order_list.addItem("Henüz sipariş eklenmedi!")
-            self.order_list.setStyleSheet("font-size: 16px; font-style: italic; color: gray;")
+        self.update_signal.connect(self.update_total)
+        self.order_model.rowsInserted.connect(self.update_total)
+        self.order_model.rowsRemoved.connect(self.update_total)
+        self.order_model.modelReset.connect(self.update_total)
+        self.order_model.dataChanged.connect(self.update_total)  # **Aynı ürünün adedi değişti**
+        self.refresh_tickets()
+        self.update_total()
+
+        # **Gizli performans paneli (Ctrl+Shift+D); ilk açılışta oluşturulur**
+        self.perf_overlay = None
+        QShortcut(QKeySequence("Ctrl+Shift+D"), self, activated=self.toggle_perf_overlay)
+
+        # **Defter, katalog ve sayfalar pencere göründükten sonra adım adım hazırlanır**
+        self._prewarm_steps = [self.update_receipt_count, self.check_menu, self.watch_menu, self.attach_promotions,
+                               self.get_search_index, self.attach_key_entry, self.start_outbox]
+        self._prewarm_steps += [lambda m=module: importlib.import_module(m) for module in PREWARM_MODULES]
+        self._prewarm_steps += [lambda c=category, t=label: self.get_page(c, t) for label, category in PAGES.items()]
+        QTimer.singleShot(PREWARM_DELAY_MS, self.prewarm)
+
+    def prewarm(self):
+        """Bekleyen ön yükleme adımlarından birini çalıştırır, olay döngüsünü bloklamadan devam eder"""
+        if not self._prewarm_steps:
+            return
+        self._prewarm_steps.pop(0)()
+        QTimer.singleShot(0, self.prewarm)
+
+    def check_menu(self):
+        """Menüde hatalı satır varsa kasiyere gösterir"""
+        from catalog import get_catalog
+        errors = get_catalog().errors
+        if errors:
+            QMessageBox.warning(self, "Menü Hatası", "Aşağıdaki menü satırları atlandı:\n\n" + "\n".join(errors))
+
+    def watch_menu(self):
+        """Menü dosyaları değiştiğinde katalog ve açık sayfalar yeniden başlatmadan güncellenir"""
+        from catalog import get_catalog
+        from catalog_watcher import watch_catalog
+        self.menu_watcher = watch_catalog(get_catalog(), parent=self)
+
+    def get_search_index(self):
+        from search import get_search_index
+        return get_search_index()
+
+    def search(self, text):
+        """Her tuş vuruşunda arama sonuçlarını günceller"""
+        self.search_results.clear()
+        for match in self.get_search_index().search(text):
+            label = match.product if match.size is None else f"{match.product} ({match.size} oz)"
+            item = QListWidgetItem(label)
+            item.setData(Qt.ItemDataRole.UserRole, match)
+            self.search_results.addItem(item)
+        self.search_results.setVisible(self.search_results.count() > 0)
+
+    def pick_first_result(self):
+        """Enter: okutulan kod tam eşleşirse onu, yoksa ilk sonucu seçer"""
+        match = self.get_search_index().lookup_code(self.search_box.text())
+        if match is None and self.search_results.count():
+            match = self.search_results.item(0).data(Qt.ItemDataRole.UserRole)
+        if match is not None:
+            self.show_pick_result(self.pick_match(match))
+
+    def pick_result(self, item):
+        self.show_pick_result(self.pick_match(item.data(Qt.ItemDataRole.UserRole)))
+
+    def show_pick_result(self, message):
+        if message is not None:
+            QMessageBox.warning(self, "Uyarı", message)
+
+    def pick_match(self, match):
+        """Boyutu belli kodu doğrudan sepete ekler, diğerlerinde ürünün sayfasını açıp ürünü seçer.
+
+        Eklenemezse (ör. ürün stokta yok) kasiyere gösterilecek mesajı döndürür.
+        """
+        self.search_box.clear()
+        self.search_box.clearFocus()
+        message = self.stock_message(match.product)
+        if message is not None:
+            return message
+        if match.size is not None:
+            from checkout import PosSession
+            PosSession(cart=self.cart).add_item(match.category, match.product, match.size)
+            return None
+        self.open_page(match.category, PAGE_TITLES.get(match.category, match.category))
+        self.pages[match.category].select_drink(match.product)
+        return None
+
+    def stock_message(self, product):
+        """Biten ürün satılamaz; kategori sayfasındaki pasif ürün butonuyla aynı kural"""
+        from inventory import OUT, get_inventory
+        if get_inventory().product_state(product) == OUT:
+            return f"Stokta yok: {product}"
+        return None
+
+    def attach_key_entry(self):
+        """Kısayol tablosunu kurar ve ana penceredeki tuşları dinlemeye başlar"""
+        from hotkeys import KeyEntry, get_hotkey_table
+        table = get_hotkey_table(qt_key_code)
+        len(table)  # **Tablo ilk tuş vuruşunda değil şimdi kurulur**
+        self.key_entry = KeyEntry(table)
+        QApplication.instance().installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        """Ana pencere etkinken yazı alanı dışındaki tuşlar hızlı girişe gider"""
+        if (event.type() == QEvent.Type.KeyPress and self.key_entry is not None
+                and self.key_entry_button.isChecked() and self.isActiveWindow()
+                and not isinstance(QApplication.focusWidget(), QLineEdit)):
+            return self.handle_key(event)
+        return super().eventFilter(obj, event)
+
+    def handle_key(self, event):
+        """Rakam, `*`, Enter veya kısayol tuşunu işler; tuş kullanıldıysa True döndürür"""
+        from hotkeys import QUANTITY_KEY
+        entry = self.key_entry
+        key, text = event.key(), event.text()
+        now = event.timestamp() / 1000  # **Olayın oluştuğu an: arayüz meşgulken biriken tuşlar okuyucu sanılmasın**
+        plain = not event.modifiers().value & ~Qt.KeyboardModifier.KeypadModifier.value
+        message = None
+        if event.isAutoRepeat():
+            return False
+        if plain and len(text) == 1 and text.isdigit():
+            entry.digit(text, now)
+        elif text == QUANTITY_KEY:
+            entry.times()
+        elif key in (Qt.Key.Key_Return, Qt.Key.Key_Enter) and entry.digits:
+            message = self.apply_entry(entry.enter(now))
+        elif key == Qt.Key.Key_Backspace and entry.pending():
+            entry.backspace()
+        elif key == Qt.Key.Key_Escape and entry.pending():
+            entry.clear()
         else:
-            self.order_list.setStyleSheet("font-size: 18px;")
-
-        total_price = sum(price for _, _, price in orders)
-        self.total_label.setText(f"Toplam: {total_price:.2f} TL")
-        self.total_label.setStyleSheet("font-size: 22px; font-weight: bold; color: red;")
-
-        for drink, size, price in orders:
-            self.order_list.addItem(f"{drink} ({size} oz) - {price:.2f} TL")
+            result = entry.hotkey(event.keyCombination().toCombined() & ~Qt.KeyboardModifier.KeypadModifier.value)
+            if result is None:
+                return False
+            message = self.add_sku(*result)
+        self.update_key_buffer(message)
+        return True
+
+    def apply_entry(self, entry):
+        """Enter ile biten kodu ekler; boyutu belli olmayan kodda ürünün sayfası açılır"""
+        if entry.sku is not None:
+            return self.add_sku(entry.sku, entry.quantity)
+        match = self.get_search_index().lookup_code(entry.code)
+        if match is None:
+            return f"Bilinmeyen kod: {entry.code}"
+        return self.pick_match(match)
+
+    def add_sku(self, sku, quantity=1):
+        """Ürünü pencere açmadan sepete ekler; eklenemezse kasiyere gösterilecek mesajı döndürür"""
+        from hotkeys import MAX_QUANTITY
+        if quantity > MAX_QUANTITY:
+            return f"Adet en fazla {MAX_QUANTITY} olabilir"
+        message = self.stock_message(sku.product)
+        if message is not None:
+            return message
+        with instrumentation.timer("key_entry"):
+            for _ in range(quantity):
+                self.cart.add(sku.product, sku.size, sku.price)
+        return None
+
+    def update_key_buffer(self, message=None):
+        """Yazılan adet/kodu veya son hatayı arama kutusunun yanında gösterir"""
+        text = message or self.key_entry.text()
+        self.key_buffer_label.setText(text)
+        theme.set_state(self.key_buffer_label, "error", message is not None)
+        self.key_buffer_label.setVisible(bool(text))
+
+    def toggle_key_entry(self, checked):
+        if self.key_entry is not None:
+            self.key_entry.clear()
+            self.update_key_buffer()
+
+    def get_page(self, category, title):
+        """Kategori sayfasını döndürür; her sayfa bir kez oluşturulur ve sonra yeniden kullanılır"""
+        page = self.pages.get(category)
+        if page is None:
+            from category_page import CategoryPage
+            page = CategoryPage(category, title, main_menu=self)
+            self.pages[category] = page
+        return page
+
+    def open_page(self, category, title):
+        """Kategori sayfasını açar; önceden oluşturulmuşsa aynı pencere gösterilir"""
+        with instrumentation.timer("open_page"):
+            page = self.get_page(category, title)
+            page.show()
+            page.raise_()
+            page.activateWindow()
+
+    def toggle_perf_overlay(self):
+        if self.perf_overlay is None:
+            from perf_overlay import PerfOverlay
+            self.perf_overlay = PerfOverlay(self)
+        self.perf_overlay.toggle()
+
+    def attach_promotions(self):
+        """Etkin fişin kampanya motorunu bağlar; indirim değiştikçe toplam güncellenir"""
+        self.follow_promotions(True)
+        self.update_total()
+
+    def follow_promotions(self, attach=False):
+        """Fiş değiştiyse yeni fişin motoruna abone olur; motor ödeme penceresiyle paylaşılır"""
+        if self.promotions is None and not attach:
+            return
+        from campaigns import promotions_for
+        engine = promotions_for(self.cart)
+        if engine is not self.promotions:
+            if self.promotions is not None:
+                self.promotions.unsubscribe(self.on_promotions_changed)
+            engine.subscribe(self.on_promotions_changed)
+            self.promotions = engine
+
+    def on_promotions_changed(self):
+        self.update_signal.emit()
+
+    def start_outbox(self):
+        """Önceki oturumdan kalan satış parçalarını ilk satışı beklemeden göndermeye başlar"""
+        from outbox import get_outbox
+        get_outbox()
+
+    def update_total(self):
+        """Toplam fiyatı güncelle; sipariş listesi model tarafından güncellenir"""
+        self.follow_promotions()
+        total = self.cart.total() if self.promotions is None else self.promotions.total()
+        text = f"Toplam: {format_tl(total)} TL"
+        if total != self.cart.total():
+            text += f"  (İndirim: {format_tl(self.cart.total() - total)} TL)"
+        self.total_label.setText(text)
+        self.update_ticket_buttons()
+
+    def refresh_tickets(self):
+        """Fiş butonlarını yeniden oluşturur; yalnızca fiş açılıp kapandığında çağrılır"""
+        for btn in self.ticket_buttons.values():
+            self.ticket_bar.removeWidget(btn)
+            btn.deleteLater()
+        self.ticket_buttons = {}
+        for key, _, _ in self.cart.tickets():
+            btn = QPushButton()
+            btn.setObjectName("ticketButton")
+            btn.clicked.connect(lambda checked, k=key: self.switch_ticket(k))
+            self.ticket_bar.addWidget(btn)
+            self.ticket_buttons[key] = btn
+        self.update_ticket_buttons()
+
+    def update_ticket_buttons(self):
+        """Fiş butonlarındaki ürün sayılarını ve etkin fişi günceller"""
+        for key, name, count in self.cart.tickets():
+            btn = self.ticket_buttons.get(key)
+            if btn is not None:
+                btn.setText(f"{name} ({count})")
+                theme.set_state(btn, "active", key == self.cart.active)
+        self.label_orders.setText(f"Seçilen Ürünler ({self.cart.name()}):")
+
+    def hold_ticket(self):
+        """Mevcut fişi bekletir ve yeni bir fiş açar"""
+        name, ok = QInputDialog.getText(self, "Yeni Fiş", "Fiş adı (boş bırakılabilir):")
+        if not ok:
+            return
+        self.cart.open(name.strip() or None)
+        self.refresh_tickets()
+
+    def switch_ticket(self, key):
+        """Bekletilen fişe geçer; sipariş listesi ve toplam yeni fişe göre yenilenir"""
+        self.cart.switch(key)
+        self.refresh_tickets()
+
+    def ticket_paid(self, key=None):
+        """Ödemesi alınan bekletilmiş fişi kapatır; etkin fişse ana fişe dönülür"""
+        key = self.cart.active if key is None else key
+        if key != MAIN_TICKET:
+            self.cart.close(key)
+        self.refresh_tickets()
+
+    def update_receipt_count(self):
+        """Bugün kesilen fiş sayısını satış defterinden göster"""
+        from ledger import get_ledger
+        self.receipt_label.setText(f"Toplam Kesilen Fiş: {get_ledger().receipt_count()}")
 
     def delete_selected_order(self):
-        selected_item = self.order_list.currentRow()
-        if selected_item == -1:
+        line_id = self.order_list.current_line_id()
+        if line_id is None:
             QMessageBox.warning(self, "Uyarı", "Lütfen silmek için bir ürün seçin!")
             return
 
         try:
-            with open(ORDERS_FILE, "r", encoding="utf-8") as f:
-                orders = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            orders = []
-
-        del orders[selected_item]
-
-        with open(ORDERS_FILE, "w", encoding="utf-8") as f:
-            json.dump(orders, f)
-
-        self.load_orders()
+            self.cart.remove(line_id)
+        except KeyError:
+            # **Satır başka kasada silinmiş, bildirimi henüz listeye ulaşmamış**
+            self.order_list.clear_current()
 
     def complete_payment(self):
-        """Siparişi tamamla, ödeme al ve fişi artır"""
-        try:
-            with open(ORDERS_FILE, "r", encoding="utf-8") as f:
-                orders = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            orders = []
-
-        if not orders:  # **Sipariş listesi boşsa işlem yapılmayacak**
+        """Ödeme penceresini aç; fiş, ödeme tamamlanınca deftere yazılır"""
+        if not len(self.cart):  # **Sipariş listesi boşsa işlem yapılmayacak**
             QMessageBox.warning(self, "Uyarı", "Boş sipariş veremezsiniz!")
             return
 
-        from payments import PaymentSystem
-        self.payment_window = PaymentSystem(main_menu=self)
-        self.payment_window.show()
-
-        # **Fiş sayacını artır**
-        self.receipt_count += 1
-        self.receipt_label.setText(f"Toplam Kesilen Fiş: {self.receipt_count}")
-
-        # **Siparişleri sıfırla**
-        with open(ORDERS_FILE, "w", encoding="utf-8") as f:
-            json.dump([], f)
-
-        self.load_orders()
+        window = self.payment_windows.get(self.cart.active)
+        if window is not None and window.isVisible():
+            window.raise_()
+            window.activateWindow()
+            return
 
-    def closeEvent(self, event):
-        """Uygulama kapanınca fiş sayacını sıfırla"""
-        self.receipt_count = 0
-        self.receipt_label.setText(f"Toplam Kesilen Fiş: {self.receipt_count}")
-        event.accept()
+        with instrumentation.timer("open_payment"):
+            from payments import PaymentSystem
+            window = self.payment_windows[self.cart.active] = PaymentSystem(main_menu=self)
+            window.show()
 
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    theme.apply(app)
     window = MainMenu()
     window.show()
     sys.exit(app.exec())
@@ -0,0 +1,173 @@
+import os
+import json
+import time
+import logging
+import threading
+from array import array
+
+ENABLED = os.environ.get("POS_PERF", "") not in ("", "0")  # **Kapalıyken zamanlayıcılar hiçbir şey yapmaz**
+RING_SIZE = 1024  # **Eylem başına tutulan son ölçüm sayısı**
+EXPORT_DIR = "perf"  # **perf.json ve perf.prom anlık görüntüleri**
+EXPORT_INTERVAL = 10.0  # **Saniye; yalnızca yeni ölçüm varsa yazılır**
+QUANTILES = (0.5, 0.9, 0.99)
+
+log = logging.getLogger(__name__)
+
+
+class Histogram:
+    """Bir eylemin son `size` süresini (ns) sabit boyutlu halka tamponda tutar."""
+
+    __slots__ = ("samples", "size", "count", "total_ns", "max_ns")
+
+    def __init__(self, size=RING_SIZE):
+        self.samples = array("q", bytes(8 * size))
+        self.size = size
+        self.count = 0  # **Toplam ölçüm sayısı; halkadaki konum count % size**
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def add(self, ns):
+        self.samples[self.count % self.size] = ns
+        self.count += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    def quantiles(self, quantiles=QUANTILES):
+        """Halkadaki ölçümlerden istenen yüzdelikleri (ns) döndürür."""
+        ordered = sorted(self.samples[:min(self.count, self.size)])
+        if not ordered:
+            return [0] * len(quantiles)
+        return [ordered[min(len(ordered) - 1, int(len(ordered) * q))] for q in quantiles]
+
+
+class _Timer:
+    __slots__ = ("recorder", "name", "start")
+
+    def __init__(self, recorder, name):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.recorder.record(self.name, time.perf_counter_ns() - self.start)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+NULL_TIMER = _NullTimer()
+
+
+class Recorder:
+    """Eylem adına göre histogramları tutar ve anlık görüntü olarak dışa aktarır."""
+
+    def __init__(self, ring_size=RING_SIZE):
+        self.ring_size = ring_size
+        self.histograms = {}
+        self._lock = threading.Lock()
+        self._exporter = None
+
+    def timer(self, name):
+        """`with recorder.timer("open_page"):` bloğunun süresini ölçer."""
+        return _Timer(self, name)
+
+    def record(self, name, ns):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram(self.ring_size)
+            histogram.add(ns)
+
+    def snapshot(self):
+        """{eylem: {"count", "p50_ms", "p90_ms", "p99_ms", "max_ms", "sum_ms"}}"""
+        with self._lock:
+            items = [(name, h.count, h.total_ns, h.max_ns, h.quantiles()) for name, h in self.histograms.items()]
+        result = {}
+        for name, count, total_ns, max_ns, quantiles in sorted(items):
+            entry = {"count": count}
+            for q, ns in zip(QUANTILES, quantiles):
+                entry[f"p{round(q * 100)}_ms"] = ns / 1e6
+            entry["max_ms"] = max_ns / 1e6
+            entry["sum_ms"] = total_ns / 1e6
+            result[name] = entry
+        return result
+
+    def to_json(self):
+        return json.dumps({"time": time.time(), "actions": self.snapshot()}, ensure_ascii=False, indent=2)
+
+    def to_prometheus(self):
+        """Prometheus metin biçimi; yüzdelikler halkadaki son ölçümlerden, toplamlar tüm çalışmadan."""
+        parts = ["# HELP pos_action_seconds Kasa eylemlerinin süresi",
+                 "# TYPE pos_action_seconds summary"]
+        for name, entry in self.snapshot().items():
+            for q in QUANTILES:
+                parts.append(f'pos_action_seconds{{action="{name}",quantile="{q}"}} '
+                             f'{entry[f"p{round(q * 100)}_ms"] / 1e3:.6g}')
+            parts.append(f'pos_action_seconds_sum{{action="{name}"}} {entry["sum_ms"] / 1e3:.6g}')
+            parts.append(f'pos_action_seconds_count{{action="{name}"}} {entry["count"]}')
+        return "\n".join(parts) + "\n"
+
+    def export(self, directory=EXPORT_DIR):
+        """perf.json ve perf.prom dosyalarını atomik olarak yazar."""
+        os.makedirs(directory, exist_ok=True)
+        for name, text in (("perf.json", self.to_json()), ("perf.prom", self.to_prometheus())):
+            path = os.path.join(directory, name)
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(path + ".tmp", path)
+
+    def start_exporter(self, directory=None, interval=None):
+        """Yeni ölçüm geldikçe dosyaları arka planda periyodik olarak yeniler."""
+        if self._exporter is not None:
+            return
+        directory = directory or EXPORT_DIR
+        interval = interval or EXPORT_INTERVAL
+
+        def run():
+            exported = 0
+            while True:
+                time.sleep(interval)
+                with self._lock:
+                    total = sum(h.count for h in self.histograms.values())
+                if total != exported:
+                    try:
+                        self.export(directory)
+                        exported = total
+                    except OSError as e:
+                        log.warning("Performans ölçümleri yazılamadı: %s", e)
+
+        self._exporter = threading.Thread(target=run, name="perf-export", daemon=True)
+        self._exporter.start()
+
+
+_recorder = Recorder()
+
+
+def get_recorder():
+    return _recorder
+
+
+def timer(name):
+    """Ölçüm açıksa eylemi zamanlar; kapalıyken paylaşılan boş zamanlayıcıyı döndürür."""
+    if not ENABLED:
+        return NULL_TIMER
+    _recorder.start_exporter()
+    return _Timer(_recorder, name)
+
+
+def record(name, ns):
+    """Başka yerde ölçülmüş bir süreyi (ns) ekler, ör. arka plan işinin bitişi."""
+    if ENABLED:
+        _recorder.start_exporter()
+        _recorder.record(name, ns)
@@ -0,0 +1,230 @@
+import os
+import csv
+import sys
+import logging
+import argparse
+from collections import defaultdict
+from catalog import product_name
+
+RECIPES_FILE = os.path.join("menu", "recipes.csv")  # **ürün,boyut,malzeme,miktar (boyutsuz satırlar her boyuta eklenir)**
+
+LOAD_STOCK_SQL = "SELECT item, quantity, low_threshold FROM stock"
+UPSERT_STOCK_SQL = ("INSERT INTO stock (item, quantity, low_threshold) VALUES (?, ?, ?) "
+                    "ON CONFLICT(item) DO UPDATE SET quantity = excluded.quantity, "
+                    "low_threshold = excluded.low_threshold")
+RESTOCK_SQL = "UPDATE stock SET quantity = quantity + ? WHERE item = ?"
+DELETE_STOCK_SQL = "DELETE FROM stock WHERE item = ?"
+
+LOW, OUT = "low", "out"
+
+log = logging.getLogger(__name__)
+
+
+def read_recipes(path):
+    """Reçete dosyasını {(ürün, boyut veya None): {malzeme: miktar}} olarak okur; (reçeteler, hatalar) döndürür."""
+    recipes, errors = defaultdict(dict), []
+    try:
+        f = open(path, "r", newline="", encoding="utf-8")
+    except FileNotFoundError:
+        return {}, errors
+
+    with f:
+        for line_no, row in enumerate(csv.reader(f), start=1):
+            if not row or row[0].startswith("#"):
+                continue
+            try:
+                product, size, item, quantity = (value.strip() for value in row)
+                size = int(size) if size else None
+                quantity = int(quantity)
+                if quantity <= 0:
+                    raise ValueError(f"miktar pozitif olmalı: {quantity}")
+            except ValueError as e:
+                errors.append(f"{path}:{line_no}: {e}")
+                continue
+            recipes[(product_name(product), size)][item] = quantity
+    return dict(recipes), errors
+
+
+class Inventory:
+    """Ürün (SKU) ve malzeme stoklarını satış defterinin veritabanında tutar.
+
+    Sadece `stock` tablosunda satırı olan kalemler takip edilir. Reçetesi
+    olan ürünler malzemelerini, olmayanlar kendi adındaki kalemi tüketir.
+    Stok seviyeleri ve azalan/biten ürünler bellekte tutulur; butonlar her
+    çizimde sorgu atmaz. Satışta düşüm `Ledger.record_sale` içinde fişle
+    aynı işlemde yapılır; önbellek işlem başarılı olunca `applied` ile güncellenir.
+    """
+
+    def __init__(self, ledger, recipes_path=RECIPES_FILE):
+        self.ledger = ledger
+        self.recipes, errors = read_recipes(recipes_path)
+        for error in errors:
+            log.error("Reçete satırı atlandı: %s", error)
+
+        self._levels = {}  # **kalem -> [miktar, azalma eşiği]**
+        for item, quantity, threshold in ledger.conn.execute(LOAD_STOCK_SQL):
+            self._levels[item] = [quantity, threshold]
+
+        # **Hangi ürün hangi kalemleri tüketir (tüm boyutlar birlikte) ve tersi**
+        self._needs, self._used_by = defaultdict(set), defaultdict(set)
+        for (product, _), items in self.recipes.items():
+            self._needs[product].update(items)
+            for item in items:
+                self._used_by[item].add(product)
+        self._states = {}  # **ürün -> LOW/OUT; durumu normal olan ürün tutulmaz**
+        self._refresh_states(self._products_using(self._levels))
+        self._listeners = []
+
+    # **Sorgular (bellekten)**
+    def level(self, item):
+        entry = self._levels.get(item)
+        return None if entry is None else entry[0]
+
+    def levels(self):
+        """Takip edilen kalemler: [(kalem, miktar, eşik)]."""
+        return sorted((item, quantity, threshold) for item, (quantity, threshold) in self._levels.items())
+
+    def product_state(self, product):
+        """Ürünün stok durumu: "out" (biten kalem var), "low" (azalan kalem var) veya None."""
+        return self._states.get(product)
+
+    def low_products(self):
+        return dict(self._states)
+
+    def _item_state(self, item):
+        quantity, threshold = self._levels[item]
+        if quantity <= 0:
+            return OUT
+        if quantity <= threshold:
+            return LOW
+        return None
+
+    def _refresh_states(self, products):
+        """Verilen ürünlerin durumunu yeniden hesaplar, değişenleri {ürün: durum} döndürür."""
+        changed = {}
+        for product in products:
+            items = [item for item in self._needs.get(product) or (product,) if item in self._levels]
+            states = {self._item_state(item) for item in items}
+            state = OUT if OUT in states else LOW if LOW in states else None
+            if self._states.get(product) != state:
+                changed[product] = state
+                if state is None:
+                    self._states.pop(product, None)
+                else:
+                    self._states[product] = state
+        return changed
+
+    def _products_using(self, items):
+        """Kalemleri tüketen ürünler; reçetede geçmeyen kalem, aynı adlı ürünün kendisidir."""
+        products = set()
+        for item in items:
+            products.update(self._used_by.get(item) or (item,))
+        return products
+
+    # **Satış**
+    def consumption(self, lines):
+        """Satırların tükettiği takip edilen kalemleri {kalem: miktar} olarak toplar."""
+        totals = defaultdict(int)
+        for product, size, _ in lines:
+            recipes = [recipe for recipe in (self.recipes.get((product, size)), self.recipes.get((product, None)))
+                       if recipe]
+            for recipe in recipes or [{product: 1}]:
+                for item, quantity in recipe.items():
+                    if item in self._levels:
+                        totals[item] += quantity
+        return dict(totals)
+
+    def applied(self, consumption):
+        """Deftere yazılmış düşümü önbelleğe uygular ve durumu değişen ürünleri bildirir."""
+        for item, quantity in consumption.items():
+            self._levels[item][0] -= quantity
+        self._changed(set(consumption))
+
+    # **Stok girişi**
+    def set_level(self, item, quantity, low_threshold=None):
+        """Kalemin sayım sonucunu yazar; kalem yoksa takibe alınır."""
+        if low_threshold is None:
+            low_threshold = self._levels.get(item, [0, 0])[1]
+        with self.ledger.conn:
+            self.ledger.conn.execute(UPSERT_STOCK_SQL, (item, quantity, low_threshold))
+        self._levels[item] = [quantity, low_threshold]
+        self._changed({item})
+
+    def restock(self, item, quantity):
+        """Gelen malı mevcut stoka ekler."""
+        if item not in self._levels:
+            raise KeyError(item)
+        with self.ledger.conn:
+            self.ledger.conn.execute(RESTOCK_SQL, (quantity, item))
+        self._levels[item][0] += quantity
+        self._changed({item})
+
+    def untrack(self, item):
+        with self.ledger.conn:
+            self.ledger.conn.execute(DELETE_STOCK_SQL, (item,))
+        self._levels.pop(item, None)
+        self._changed({item})
+
+    # **Abonelik**
+    def subscribe(self, callback):
+        """`callback({ürün: durum})` ürünlerin stok durumu değiştiğinde çağrılır."""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _changed(self, items):
+        changed = self._refresh_states(self._products_using(items))
+        if changed:
+            for callback in list(self._listeners):
+                callback(changed)
+
+
+_inventory = None
+
+
+def get_inventory():
+    """Uygulama genelinde paylaşılan stok takibini döndürür."""
+    global _inventory
+    if _inventory is None:
+        from ledger import get_ledger
+        _inventory = Inventory(get_ledger())
+    return _inventory
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stok sayımı ve mal girişi")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="takip edilen kalemleri listele")
+    set_parser = sub.add_parser("set", help="sayım sonucunu yaz (kalem yoksa takibe al)")
+    set_parser.add_argument("item")
+    set_parser.add_argument("quantity", type=int)
+    set_parser.add_argument("--low", type=int, help="azalma eşiği")
+    add_parser = sub.add_parser("add", help="gelen malı stoka ekle")
+    add_parser.add_argument("item")
+    add_parser.add_argument("quantity", type=int)
+    remove_parser = sub.add_parser("remove", help="kalemi takipten çıkar")
+    remove_parser.add_argument("item")
+    args = parser.parse_args()
+
+    inventory = get_inventory()
+    if args.command == "set":
+        inventory.set_level(args.item, args.quantity, args.low)
+    elif args.command == "add":
+        try:
+            inventory.restock(args.item, args.quantity)
+        except KeyError:
+            sys.exit(f"{args.item} takip edilmiyor; önce 'set' ile sayım girin")
+    elif args.command == "remove":
+        inventory.untrack(args.item)
+
+    for item, quantity, threshold in inventory.levels():
+        mark = " (bitti)" if quantity <= 0 else " (azaldı)" if quantity <= threshold else ""
+        print(f"{item:30} {quantity:8d}  eşik {threshold}{mark}")
+
+
+if __name__ == "__main__":
+    main()
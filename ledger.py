@@ -0,0 +1,194 @@
+import json
+import time
+import sqlite3
+import threading
+
+LEDGER_FILE = "sales.db"  # **Tamamlanan satışların kalıcı defteri**
+RECEIPT_FILE = "receipt_counter.json"  # **Eski fiş sayacı, ilk açılışta içeri aktarılır**
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS receipts (
+    receipt_no INTEGER PRIMARY KEY,
+    created_at REAL NOT NULL,
+    total_kurus INTEGER NOT NULL,
+    payment_method TEXT NOT NULL DEFAULT 'nakit',
+    discount_kurus INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS sale_lines (
+    id INTEGER PRIMARY KEY,
+    receipt_no INTEGER NOT NULL REFERENCES receipts(receipt_no),
+    created_at REAL NOT NULL,
+    category TEXT,
+    product TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    price_kurus INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS payments (
+    id INTEGER PRIMARY KEY,
+    receipt_no INTEGER NOT NULL REFERENCES receipts(receipt_no),
+    method TEXT NOT NULL,
+    amount_kurus INTEGER NOT NULL,
+    change_kurus INTEGER NOT NULL DEFAULT 0,
+    reference TEXT
+);
+CREATE TABLE IF NOT EXISTS stock (
+    item TEXT PRIMARY KEY,
+    quantity INTEGER NOT NULL,
+    low_threshold INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_receipts_created_at ON receipts(created_at);
+CREATE INDEX IF NOT EXISTS idx_sale_lines_created_at ON sale_lines(created_at);
+CREATE INDEX IF NOT EXISTS idx_sale_lines_product ON sale_lines(product, size, created_at);
+CREATE INDEX IF NOT EXISTS idx_sale_lines_receipt_no ON sale_lines(receipt_no);
+CREATE INDEX IF NOT EXISTS idx_payments_receipt_no ON payments(receipt_no);
+"""
+
+# **Sorgular sabit metin olarak tutulur; sqlite3 bunları bağlantı başına derleyip önbellekler**
+NEXT_RECEIPT_SQL = "UPDATE counters SET value = value + 1 WHERE name = 'receipt_no'"
+INSERT_RECEIPT_SQL = ("INSERT INTO receipts (receipt_no, created_at, total_kurus, payment_method, discount_kurus) "
+                      "VALUES (?, ?, ?, ?, ?)")
+INSERT_LINE_SQL = ("INSERT INTO sale_lines (receipt_no, created_at, category, product, size, price_kurus) "
+                   "VALUES (?, ?, ?, ?, ?, ?)")
+INSERT_PAYMENT_SQL = ("INSERT INTO payments (receipt_no, method, amount_kurus, change_kurus, reference) "
+                      "VALUES (?, ?, ?, ?, ?)")
+CONSUME_STOCK_SQL = "UPDATE stock SET quantity = quantity - ? WHERE item = ?"
+COUNT_RECEIPTS_SQL = "SELECT COUNT(*) FROM receipts WHERE created_at >= ? AND created_at < ?"
+LAST_RECEIPT_SQL = "SELECT value FROM counters WHERE name = 'receipt_no'"
+RECEIPT_LINES_SQL = "SELECT product, size, price_kurus FROM sale_lines WHERE receipt_no = ? ORDER BY id"
+RECEIPT_PAYMENTS_SQL = ("SELECT method, amount_kurus, change_kurus, reference FROM payments "
+                        "WHERE receipt_no = ? ORDER BY id")
+PRODUCT_SALES_SQL = ("SELECT COUNT(*), COALESCE(SUM(price_kurus), 0) FROM sale_lines "
+                     "WHERE product = ? AND size = ? AND created_at >= ? AND created_at < ?")
+RECEIPTS_BETWEEN_SQL = ("SELECT receipt_no, created_at, total_kurus, payment_method, discount_kurus FROM receipts "
+                        "WHERE created_at >= ? AND created_at < ? ORDER BY created_at")
+# **Ödeme türü başına (fiş, kuruş): bölünmüş fiş her ödeme türünde sayılır; ödeme kalemi olmayan eski fişler kendi türüyle**
+PAYMENT_TOTALS_SQL = ("SELECT method, COUNT(*), SUM(amount) FROM ("
+                      "SELECT p.method AS method, SUM(p.amount_kurus) AS amount FROM payments p "
+                      "JOIN receipts r ON r.receipt_no = p.receipt_no "
+                      "WHERE r.created_at >= ? AND r.created_at < ? GROUP BY p.receipt_no, p.method "
+                      "UNION ALL SELECT r.payment_method, r.total_kurus FROM receipts r "
+                      "WHERE r.created_at >= ? AND r.created_at < ? "
+                      "AND NOT EXISTS (SELECT 1 FROM payments p WHERE p.receipt_no = r.receipt_no)"
+                      ") GROUP BY method")
+LINES_BETWEEN_SQL = ("SELECT receipt_no, created_at, category, product, size, price_kurus FROM sale_lines "
+                     "WHERE created_at >= ? AND created_at < ? ORDER BY created_at")
+
+
+def start_of_day(timestamp=None):
+    """Verilen zamanın (varsayılan: şimdi) yerel gün başlangıcını döndürür."""
+    local = time.localtime(time.time() if timestamp is None else timestamp)
+    return time.mktime((local.tm_year, local.tm_mon, local.tm_mday, 0, 0, 0, 0, 0, -1))
+
+
+class Ledger:
+    """Tamamlanan fişleri SQLite (WAL) veritabanında saklayan satış defteri."""
+
+    def __init__(self, path=LEDGER_FILE, legacy_counter=RECEIPT_FILE):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")  # **WAL ile çökme güvenli, her işlemde fsync yok**
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+        with self.conn:
+            self.conn.execute("INSERT OR IGNORE INTO counters (name, value) VALUES ('receipt_no', ?)",
+                              (self._read_legacy_counter(legacy_counter),))
+
+    @staticmethod
+    def _read_legacy_counter(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return int(json.load(f))
+        except (OSError, ValueError, TypeError):
+            return 0
+
+    def record_sale(self, lines, payment_method="nakit", categories=None, created_at=None, discount=0,
+                    stock=None, payments=None):
+        """Fişi ve satırlarını tek bir işlemde kaydeder, yeni fiş numarasını döndürür.
+
+        `lines` (ürün, boyut, kuruş) satırlarıdır; `categories` verilirse her
+        satırın kategorisini aynı sırayla içerir. `discount` kampanya
+        indirimidir, fiş toplamından düşülür; satır fiyatları değişmez.
+        `stock` verilirse ({kalem: miktar}) stoktan aynı işlemde düşülür.
+        `payments` verilirse [(tür, kuruş, para üstü, onay kodu)] ödeme
+        kalemleri de aynı işlemde yazılır (bölünmüş ödeme).
+        """
+        lines = list(lines)
+        created_at = time.time() if created_at is None else created_at
+        categories = categories or [None] * len(lines)
+        total = sum(price for _, _, price in lines) - discount
+
+        with self._lock, self.conn:
+            self.conn.execute(NEXT_RECEIPT_SQL)
+            receipt_no = self.conn.execute(LAST_RECEIPT_SQL).fetchone()[0]
+            self.conn.execute(INSERT_RECEIPT_SQL, (receipt_no, created_at, total, payment_method, discount))
+            self.conn.executemany(INSERT_LINE_SQL, [
+                (receipt_no, created_at, category, product, size, price)
+                for category, (product, size, price) in zip(categories, lines)
+            ])
+            if payments:
+                self.conn.executemany(INSERT_PAYMENT_SQL, [(receipt_no, *payment) for payment in payments])
+            if stock:
+                self.conn.executemany(CONSUME_STOCK_SQL, [(quantity, item) for item, quantity in stock.items()])
+        return receipt_no
+
+    # **Sorgular**
+    def last_receipt_no(self):
+        return self.conn.execute(LAST_RECEIPT_SQL).fetchone()[0]
+
+    def receipt_count(self, start=None, end=None):
+        """Verilen aralıkta (varsayılan: bugün) kesilen fiş sayısı."""
+        start = start_of_day() if start is None else start
+        end = start + 86400 if end is None else end
+        return self.conn.execute(COUNT_RECEIPTS_SQL, (start, end)).fetchone()[0]
+
+    def receipt_lines(self, receipt_no):
+        return self.conn.execute(RECEIPT_LINES_SQL, (receipt_no,)).fetchall()
+
+    def receipt_payments(self, receipt_no):
+        """Fişin ödeme kalemleri [(tür, kuruş, para üstü, onay kodu)]; eski fişlerde boş."""
+        return self.conn.execute(RECEIPT_PAYMENTS_SQL, (receipt_no,)).fetchall()
+
+    def product_sales(self, product, size, start, end):
+        """Bir ürünün aralıktaki (adet, toplam kuruş) satışı."""
+        return self.conn.execute(PRODUCT_SALES_SQL, (product, size, start, end)).fetchone()
+
+    def lines_between(self, start, end, batch_size=1000):
+        """Aralıktaki satış satırlarını bellek kullanımı sabit kalacak şekilde parça parça üretir."""
+        return self._stream(LINES_BETWEEN_SQL, (start, end), batch_size)
+
+    def receipts_between(self, start, end, batch_size=1000):
+        """Aralıktaki fişleri (no, zaman, toplam, ödeme türü, indirim) parça parça üretir."""
+        return self._stream(RECEIPTS_BETWEEN_SQL, (start, end), batch_size)
+
+    def payment_totals(self, start, end):
+        """Aralıktaki ödemeler [(ödeme türü, fiş, kuruş)]; tutarlar ödeme kalemlerinden (para üstü hariç) alınır."""
+        return self.conn.execute(PAYMENT_TOTALS_SQL, (start, end, start, end)).fetchall()
+
+    def _stream(self, sql, params, batch_size):
+        cursor = self.conn.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield from rows
+
+    def close(self):
+        self.conn.close()
+
+
+_ledger = None
+
+
+def get_ledger():
+    """Uygulama genelinde paylaşılan satış defterini döndürür."""
+    global _ledger
+    if _ledger is None:
+        _ledger = Ledger()
+    return _ledger
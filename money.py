@@ -0,0 +1,48 @@
+import re
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+KURUS = 100  # **1 TL = 100 kuruş**
+PRICE_PATTERN = re.compile(r"([0-9]+)(?:\.([0-9]{1,2}))?")  # **"172", "172.5", "172.55"; üs ve üçüncü ondalık yok**
+
+
+def parse_price(text):
+    """Menüdeki "172.55" gibi bir fiyatı kuruş cinsinden tam sayıya çevirir.
+
+    Yalnızca rakamlar ve en fazla iki ondalık kabul edilir. Sayı olmayan,
+    negatif, üslü ("1e2") veya kuruştan küçük basamaklı ("1.005") değerler
+    sessizce yuvarlanmaz; ValueError fırlatılır.
+    """
+    text = str(text).strip()
+    match = PRICE_PATTERN.fullmatch(text)
+    if match is None:
+        if text.startswith("-"):
+            raise ValueError(f"negatif fiyat: {text!r}")
+        raise ValueError(f"geçersiz fiyat: {text!r}")
+    lira, kurus = match.groups()
+    return int(lira) * KURUS + int((kurus or "0").ljust(2, "0"))
+
+
+def to_kurus(value):
+    """Eski kayıtlardaki float/str TL tutarını kuruşa çevirir; tam sayılar zaten kuruştur."""
+    if isinstance(value, int):
+        if value < 0:
+            raise ValueError(f"negatif fiyat: {value!r}")
+        return value
+    if not isinstance(value, float):
+        return parse_price(value)
+    # **float TL'nin ikili gösterimindeki kalıntı (ör. 0.30000000000000004) en yakın kuruşa yuvarlanır**
+    amount = Decimal(repr(value))
+    if not amount.is_finite() or amount < 0:
+        raise ValueError(f"geçersiz fiyat: {value!r}")
+    try:
+        return int((amount * KURUS).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+    except InvalidOperation:
+        raise ValueError(f"geçersiz fiyat: {value!r}") from None
+
+
+def format_tl(kurus):
+    """Kuruş tutarını "172.55" biçiminde yazar."""
+    sign = "-" if kurus < 0 else ""
+    lira, kurus = divmod(abs(kurus), KURUS)
+    return f"{sign}{lira}.{kurus:02d}"
+
@@ -0,0 +1,182 @@
+import os
+import json
+import logging
+import threading
+
+JOURNAL_FILE = "orders.journal"  # **Sadece eklenen değişiklik kayıtları (NDJSON)**
+SNAPSHOT_FILE = "orders.snapshot.json"  # **Sıkıştırılmış sepet görüntüsü**
+LEGACY_ORDERS_FILE = "orders.json"  # **Eski format, ilk açılışta içeri aktarılır**
+COMPACT_EVERY = 500  # **Bu kadar kayıttan sonra görüntü alınır ve günlük kısaltılır**
+
+log = logging.getLogger(__name__)
+
+
+class OrderJournal:
+    """Sepet değişikliklerini önceden yazılan (write-ahead) bir günlüğe ekler.
+
+    Her ekleme/silme/temizleme günlüğe tek satırlık bir JSON kaydı olarak
+    eklenir ve toplu halde fsync edilir. Açılışta son görüntü okunup günlük
+    üzerine oynatılır; günlük belirli aralıklarla görüntüye sıkıştırılır.
+    """
+
+    def __init__(self, journal_path=JOURNAL_FILE, snapshot_path=SNAPSHOT_FILE,
+                 legacy_path=LEGACY_ORDERS_FILE, compact_every=COMPACT_EVERY):
+        self.journal_path = journal_path
+        self.snapshot_path = snapshot_path
+        self.legacy_path = legacy_path
+        self.compact_every = compact_every
+        self._seq = 0  # **Son verilen kayıt sıra numarası**
+        self._pending = []  # **Henüz diske yazılmamış kayıtlar**
+        self._since_compact = 0
+        self._file = None
+        self._lock = threading.Lock()
+
+    # **Açılış ve kurtarma**
+    def load(self):
+        """Görüntüyü okur, günlüğü üzerine oynatır ve (satır id, satır) listesi döndürür."""
+        lines, seq = self._read_snapshot()
+        replayed = 0
+
+        if seq is None:
+            lines, seq = self._read_legacy(), 0
+
+        for record in self._read_journal():
+            if record["seq"] <= seq:
+                continue  # **Görüntüye zaten dahil edilmiş kayıt**
+            self._apply(lines, record)
+            seq = record["seq"]
+            replayed += 1
+
+        self._seq = seq
+        self._since_compact = replayed
+        items = list(lines.items())
+        if replayed >= self.compact_every or not os.path.exists(self.snapshot_path):
+            self.compact(items, seq)
+        return items
+
+    def _read_snapshot(self):
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            return {}, None
+        except json.JSONDecodeError:
+            broken_path = self.snapshot_path + ".corrupt"
+            os.replace(self.snapshot_path, broken_path)
+            log.error("Sepet görüntüsü bozuk, %s olarak ayrıldı", broken_path)
+            return {}, 0
+
+        lines = {line_id: (drink, size, price) for line_id, drink, size, price in snapshot["lines"]}
+        return lines, snapshot["seq"]
+
+    def _read_legacy(self):
+        """Eski `orders.json` dosyasındaki siparişleri içeri aktarır."""
+        if not self.legacy_path or os.path.exists(self.journal_path):
+            return {}
+        try:
+            with open(self.legacy_path, "r", encoding="utf-8") as f:
+                orders = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except json.JSONDecodeError:
+            log.error("%s okunamadı, eski siparişler içeri aktarılmadı", self.legacy_path)
+            return {}
+        return {line_id: tuple(order) for line_id, order in enumerate(orders, start=1)}
+
+    def _read_journal(self):
+        """Günlükteki geçerli kayıtları sırayla üretir, yarım kalan son satırı keser."""
+        try:
+            f = open(self.journal_path, "rb")
+        except FileNotFoundError:
+            return
+
+        with f:
+            good_offset = 0
+            for raw in f:
+                try:
+                    if not raw.endswith(b"\n"):
+                        raise ValueError("yarım kayıt")
+                    record = json.loads(raw)
+                except ValueError:
+                    break
+                good_offset += len(raw)
+                yield record
+            end = f.seek(0, os.SEEK_END)
+
+        if good_offset < end:
+            # **Çökme anında yarım yazılan kısmı sakla ve günlükten çıkar**
+            with open(self.journal_path, "rb") as f:
+                f.seek(good_offset)
+                tail = f.read()
+            with open(self.journal_path + ".corrupt", "ab") as f:
+                f.write(tail)
+            with open(self.journal_path, "r+b") as f:
+                f.truncate(good_offset)
+            log.warning("Günlüğün son %d baytı okunamadı ve ayrıldı", end - good_offset)
+
+    @staticmethod
+    def _apply(lines, record):
+        op = record["op"]
+        if op == "add":
+            lines[record["id"]] = tuple(record["line"])
+        elif op == "remove":
+            lines.pop(record["id"], None)
+        elif op == "clear":
+            lines.clear()
+
+    # **Yazma**
+    def record(self, event, line_id, line):
+        """Değişikliği bekleyen kayıtlara ekler; diske `flush` ile yazılır."""
+        self._seq += 1
+        record = {"seq": self._seq, "op": event}
+        if line_id is not None:
+            record["id"] = line_id
+        if event == "add":
+            record["line"] = list(line)
+        self._pending.append(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def checkpoint(self):
+        """Sepet kilitliyken bekleyen kayıtları ve son sıra numarasını ayırır."""
+        pending, self._pending = self._pending, []
+        return pending, self._seq
+
+    def flush(self, items, pending):
+        """Ayrılan kayıtları tek seferde ekleyip fsync eder, gerekirse sıkıştırır."""
+        records, seq = pending
+        if not records:
+            return
+
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.journal_path, "a", encoding="utf-8")
+            self._file.write("".join(records))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._since_compact += len(records)
+
+        if self._since_compact >= self.compact_every:
+            self.compact(items, seq)
+
+    def compact(self, items, seq):
+        """Sepetin görüntüsünü atomik olarak yazar ve günlüğü boşaltır."""
+        snapshot = {"seq": seq, "lines": [[line_id, *line] for line_id, line in items]}
+        tmp_path = self.snapshot_path + ".tmp"
+
+        with self._lock:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+
+            # **Görüntü yazıldı; eski kayıtlar artık gereksiz**
+            if self._file is not None:
+                self._file.close()
+            self._file = open(self.journal_path, "w", encoding="utf-8")
+            self._since_compact = 0
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
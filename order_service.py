@@ -0,0 +1,462 @@
+import os
+import re
+import sys
+import json
+import socket
+import random
+import asyncio
+import logging
+import argparse
+import threading
+from collections import deque
+from functools import partial
+from itertools import islice
+from cart import Cart, ConflictError
+from order_journal import OrderJournal
+from ticket import OrderLine, Ticket
+
+SERVICE_DIR = "carts"  # **Sunucuda her fişin günlüğü bu klasörde tutulur**
+DEFAULT_ADDRESS = "tcp:127.0.0.1:8765"
+REQUEST_TIMEOUT = 5.0  # **Bağlanma ve sepetin ilk alınması için süre sınırı**
+RETRY_DELAY = 0.5  # **Bağlantı kurulamazsa ilk bekleme (saniye), her denemede iki katına çıkar**
+MAX_RETRY_DELAY = 30.0
+FLUSH_TIMEOUT = 2.0  # **Kapanışta bekleyen değişikliklerin servise işlenmesi için beklenecek süre**
+SUBSCRIBER_BUFFER = 1024 * 1024  # **Okumayan aboneye biriktirilecek en fazla bayt**
+
+log = logging.getLogger(__name__)
+
+
+def default_ticket():
+    """Bu kasanın varsayılan fiş kimliği (bilgisayar adı)."""
+    return re.sub(r"[^A-Za-z0-9_-]", "-", socket.gethostname()) or "kasa"
+
+
+def parse_address(address):
+    """"tcp:host:port" veya "unix:/yol/pos.sock" adresini (tür, hedef) olarak çözer."""
+    kind, _, target = address.partition(":")
+    if kind == "tcp":
+        host, _, port = target.rpartition(":")
+        return "tcp", (host or "127.0.0.1", int(port))
+    if kind == "unix":
+        return "unix", target
+    raise ValueError(f"geçersiz servis adresi: {address!r}")
+
+
+def _encode(message):
+    return (json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+# **Sunucu**
+class OrderService:
+    """Birden fazla kasanın sepetlerini fiş kimliğine göre tutan yerel servis.
+
+    İstemciler satır satır JSON gönderir; her istek bir yanıt alır, aboneler
+    ayrıca sepetteki her değişikliği sürüm numarasıyla birlikte anında alır.
+    İstekteki `version` alanı güncel sürümle uyuşmazsa işlem "conflict"
+    hatasıyla reddedilir. Satır id'sini istemci verebilir; aynı id ile
+    tekrar gelen ekleme yok sayılır, böylece yeniden gönderim zararsızdır.
+    """
+
+    def __init__(self, data_dir=SERVICE_DIR):
+        self.data_dir = data_dir
+        self.carts = {}
+        self.subscribers = {}  # **fiş kimliği -> yazıcı akışları**
+        os.makedirs(data_dir, exist_ok=True)
+
+    def cart(self, ticket):
+        if not re.fullmatch(r"[A-Za-z0-9_-]{1,64}", ticket):
+            raise ValueError(f"geçersiz fiş kimliği: {ticket!r}")
+        cart = self.carts.get(ticket)
+        if cart is None:
+            path = os.path.join(self.data_dir, ticket)
+            cart = Cart(storage=OrderJournal(journal_path=path + ".journal",
+                                             snapshot_path=path + ".snapshot.json",
+                                             legacy_path=None))
+            cart.subscribe(partial(self._publish, ticket))
+            self.carts[ticket] = cart
+            self.subscribers[ticket] = set()
+        return cart
+
+    def _publish(self, ticket, event, line_id, line):
+        message = _encode({"event": event, "ticket": ticket, "version": self.carts[ticket].version,
+                           "line_id": line_id, "line": list(line) if line else None})
+        for writer in list(self.subscribers[ticket]):
+            # **Okumayan abone sunucunun belleğini büyütmesin: bağlantısı kesilir, istemci yeniden bağlanıp sepeti baştan alır**
+            if writer.transport.get_write_buffer_size() > SUBSCRIBER_BUFFER:
+                log.warning("Sipariş servisi: %s fişinin okumayan abonesi bırakıldı", ticket)
+                self.subscribers[ticket].discard(writer)
+                writer.transport.abort()
+                continue
+            writer.write(message)
+
+    def dispatch(self, request, writer):
+        """Tek bir isteği işler ve yanıtı döndürür."""
+        op = request.get("op")
+        if op == "tickets":
+            return {"ok": True, "tickets": {t: len(c) for t, c in self.carts.items()}}
+
+        cart = self.cart(request["ticket"])
+        expected = request.get("version")
+        if expected is not None and expected != cart.version:
+            return {"ok": False, "error": "conflict", "version": cart.version}
+
+        if op in ("get", "subscribe"):
+            if op == "subscribe":
+                self.subscribers[request["ticket"]].add(writer)
+            return {"ok": True, "version": cart.version,
+                    "lines": [[line_id, *line] for line_id, line in cart.items()]}
+        if op == "add":
+            drink, size, price = request["line"]
+            line_id = request.get("line_id")
+            if line_id is None or line_id not in cart:
+                line_id = cart.add(drink, size, price, line_id=line_id)
+            return {"ok": True, "version": cart.version, "line_id": line_id}
+        if op == "remove":
+            try:
+                cart.remove(request["line_id"])
+            except KeyError:
+                return {"ok": False, "error": "not_found", "version": cart.version}
+            return {"ok": True, "version": cart.version}
+        if op == "clear":
+            line_ids = request.get("line_ids")
+            if line_ids is None:
+                cart.clear()
+            else:
+                # **Yalnızca istemcinin gördüğü satırlar silinir; bu arada başka kasadan eklenenler kalır**
+                for line_id in line_ids:
+                    if line_id in cart:
+                        cart.remove(line_id)
+            return {"ok": True, "version": cart.version}
+        return {"ok": False, "error": f"bilinmeyen işlem: {op}"}
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                raw = await reader.readline()
+                if not raw:
+                    break
+                request = {}
+                try:
+                    request = json.loads(raw)
+                    response = self.dispatch(request, writer)
+                except (ValueError, KeyError, TypeError) as e:
+                    response = {"ok": False, "error": str(e)}
+                response["id"] = request.get("id")
+                writer.write(_encode(response))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for subscribers in self.subscribers.values():
+                subscribers.discard(writer)
+            writer.close()
+
+    async def serve(self, address=DEFAULT_ADDRESS):
+        kind, target = parse_address(address)
+        if kind == "tcp":
+            server = await asyncio.start_server(self.handle, *target)
+        else:
+            server = await asyncio.start_unix_server(self.handle, target)
+        log.info("Sipariş servisi dinleniyor: %s", address)
+        async with server:
+            await server.serve_forever()
+
+    def flush(self):
+        for cart in self.carts.values():
+            cart.flush()
+
+
+# **İstemci**
+class RemoteCart:
+    """Sipariş servisindeki bir fişi yerel `Cart` gibi kullanan istemci.
+
+    Satırların bir kopyası yerelde tutulur; okuma işlemleri ağa çıkmaz.
+    Değişiklikler önce bu kopyaya uygulanıp abonelere bildirilir, ardından
+    arka plandaki iş parçacığı tarafından sırayla servise gönderilir:
+    arayüz ağı beklemez. Satır id'leri istemcide üretildiği için gönderim
+    tekrarlanabilir. Servis kapalıysa açılış beklemez; bağlantı artan
+    aralıklarla yeniden denenir ve kurulunca sepet servisten alınıp henüz
+    işlenmemiş değişiklikler üzerine uygulanır. Başka kasaların
+    değişiklikleri servisten gelen bildirimlerle yerel kopyaya işlenir.
+    """
+
+    def __init__(self, address, ticket, timeout=REQUEST_TIMEOUT, retry_delay=RETRY_DELAY):
+        self.address = address
+        self.ticket = ticket
+        self.timeout = timeout
+        self.retry_delay = retry_delay
+        self.version = 0  # **Yerel kopyadaki her değişiklikte artar (başka kasalarınkiler dahil)**
+        self.synced = False  # **Sepetin servisteki hali en az bir kez alındı mı**
+        self.promotions = None  # **Sepete bağlı kampanya motoru (campaigns.promotions_for)**
+        self._ticket = Ticket()
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._outgoing = deque()  # **Servisin henüz yanıtlamadığı istekler, gönderilme sırasıyla**
+        self._sent = 0  # **`_outgoing` başındaki gönderilmiş istek sayısı**
+        self._sock = None
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"order-service-{ticket}", daemon=True)
+        self._thread.start()
+
+    # **Bağlantı (arka plandaki iş parçacığında)**
+    def _run(self):
+        delay = self.retry_delay
+        while not self._stopping.is_set():
+            try:
+                sock, stream = self._connect()
+            except (OSError, ValueError) as e:
+                log.warning("Sipariş servisine bağlanılamadı (%s), %.1f sn sonra tekrar denenecek: %s",
+                            self.address, delay, e)
+                self._stopping.wait(delay * random.uniform(1.0, 1.5))
+                delay = min(delay * 2, MAX_RETRY_DELAY)
+                continue
+
+            delay = self.retry_delay
+            threading.Thread(target=self._read_loop, args=(sock, stream), name=f"order-service-{self.ticket}-read",
+                             daemon=True).start()
+            try:
+                self._send_loop(sock)
+            except OSError as e:
+                log.warning("Sipariş servisine yazılamadı: %s", e)
+            self._disconnect(sock)
+
+    def _connect(self):
+        """Bağlanır, fişe abone olur ve servisteki sepeti bekleyen değişikliklerle birlikte yerel kopyaya alır."""
+        kind, target = parse_address(self.address)
+        family = socket.AF_INET if kind == "tcp" else socket.AF_UNIX
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(self.timeout)
+            sock.connect(target)
+            stream = sock.makefile("rb")
+            sock.sendall(_encode({"op": "subscribe", "ticket": self.ticket}))
+            response = json.loads(stream.readline())
+            if not response.get("ok"):
+                raise ConnectionError(response.get("error"))
+            sock.settimeout(None)
+        except BaseException:
+            sock.close()
+            raise
+
+        ticket = Ticket((line_id, OrderLine.of(drink, size, price))
+                        for line_id, drink, size, price in response["lines"])
+        with self._changed:
+            for request in self._outgoing:
+                self._replay(ticket, request)
+            self._ticket = ticket
+            self.version += 1
+            self.synced = True
+            self._sent = 0  # **Yanıtı gelmemiş istekler yeniden gönderilir**
+            self._sock = sock
+        self._notify("reset")
+        return sock, stream
+
+    @staticmethod
+    def _replay(ticket, request):
+        """Servisin henüz işlemediği isteği servisten alınan sepete uygular."""
+        op = request["op"]
+        if op == "add":
+            if request["line_id"] not in ticket:
+                ticket.add(request["line_id"], OrderLine.of(*request["line"]))
+        elif op == "remove":
+            if request["line_id"] in ticket:
+                ticket.remove(request["line_id"])
+        elif op == "clear":
+            for line_id in request["line_ids"]:
+                if line_id in ticket:
+                    ticket.remove(line_id)
+
+    def _send_loop(self, sock):
+        while True:
+            with self._changed:
+                while not self._stopping.is_set() and self._sock is sock and self._sent == len(self._outgoing):
+                    self._changed.wait()
+                if self._stopping.is_set() or self._sock is not sock:
+                    return
+                batch = list(islice(self._outgoing, self._sent, None))
+                self._sent = len(self._outgoing)
+            sock.sendall(b"".join(_encode(dict(request, ticket=self.ticket)) for request in batch))
+
+    def _read_loop(self, sock, stream):
+        try:
+            for raw in stream:
+                message = json.loads(raw)
+                if "event" in message:
+                    self._apply(message)
+                else:
+                    self._acknowledge(message)
+        except (OSError, ValueError) as e:
+            if self._sock is sock:
+                log.warning("Sipariş servisi bağlantısı koptu: %s", e)
+        finally:
+            self._disconnect(sock)
+
+    def _disconnect(self, sock):
+        with self._changed:
+            if self._sock is sock:
+                self._sock = None
+                self._sent = 0
+                self._changed.notify_all()
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        sock.close()
+
+    def _acknowledge(self, response):
+        """Servisin yanıtladığı isteği kuyruktan çıkarır (yanıtlar istek sırasıyla gelir)."""
+        with self._changed:
+            if not self._sent:
+                return
+            request = self._outgoing.popleft()
+            self._sent -= 1
+            self._changed.notify_all()
+        if not response["ok"] and response.get("error") != "not_found":
+            log.error("Sipariş servisi isteği reddetti (%s): %s", request["op"], response.get("error"))
+
+    def _apply(self, message):
+        """Servisten gelen değişikliği yerel kopyaya uygular; bu kasanın kendi değişiklikleri zaten uygulanmıştır."""
+        event, line_id = message["event"], message["line_id"]
+        line = OrderLine.of(*message["line"]) if message["line"] else None
+        with self._lock:
+            if event == "add":
+                if line_id in self._ticket or self._removing(line_id):
+                    return
+                self._ticket.add(line_id, line)
+            elif event == "remove":
+                if line_id not in self._ticket:
+                    return
+                self._ticket.remove(line_id)
+            elif event == "clear":
+                self._ticket.clear()
+            self.version += 1
+        self._notify(event, line_id, line)
+
+    def _removing(self, line_id):
+        """Satırı silen bir istek servise işlenmeyi bekliyor mu (kilit tutulurken çağrılır)."""
+        return any(request["op"] == "remove" and request["line_id"] == line_id
+                   or request["op"] == "clear" and line_id in request["line_ids"]
+                   for request in self._outgoing)
+
+    def _send(self, request):
+        """İsteği gönderim kuyruğuna ekler (kilit tutulurken çağrılır)."""
+        self._outgoing.append(request)
+        self._changed.notify_all()
+
+    def _check_version(self, expected_version):
+        if expected_version is not None and expected_version != self.version:
+            raise ConflictError(f"sepet sürümü {self.version}, beklenen {expected_version}")
+
+    def _new_id(self):
+        """Başka kasaların id'leriyle çakışmayacak satır id'si (JSON'da tam sayı olarak kalır)."""
+        while True:
+            line_id = random.getrandbits(52)
+            if line_id and line_id not in self._ticket:
+                return line_id
+
+    # **Cart ile aynı arayüz**
+    def subscribe(self, callback):
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, event, line_id=None, line=None):
+        for callback in list(self._listeners):
+            callback(event, line_id, line)
+
+    def add(self, drink, size, price, expected_version=None):
+        if not isinstance(price, int) or price < 0:
+            raise ValueError(f"geçersiz fiyat: {price!r}")
+        line = OrderLine.of(drink, size, price)
+        with self._lock:
+            self._check_version(expected_version)
+            line_id = self._new_id()
+            self._ticket.add(line_id, line)
+            self.version += 1
+            self._send({"op": "add", "line_id": line_id, "line": list(line)})
+        self._notify("add", line_id, line)
+        return line_id
+
+    def remove(self, line_id, expected_version=None):
+        with self._lock:
+            self._check_version(expected_version)
+            line = self._ticket.remove(line_id)
+            self.version += 1
+            self._send({"op": "remove", "line_id": line_id})
+        self._notify("remove", line_id, line)
+        return line
+
+    def clear(self, expected_version=None):
+        """Görülen satırları siler; sürüm kontrolü yerel kopya üzerinde yapılır, ağ beklenmez."""
+        with self._lock:
+            self._check_version(expected_version)
+            line_ids = list(self._ticket.ids())
+            self._ticket.clear()
+            self.version += 1
+            self._send({"op": "clear", "line_ids": line_ids})
+        self._notify("clear")
+
+    def lines(self):
+        with self._lock:
+            return self._ticket.lines()
+
+    def items(self):
+        with self._lock:
+            return self._ticket.items()
+
+    def folded(self):
+        with self._lock:
+            return self._ticket.folded()
+
+    def total(self):
+        return self._ticket.total()
+
+    def __len__(self):
+        return len(self._ticket)
+
+    def __contains__(self, line_id):
+        return line_id in self._ticket
+
+    def __iter__(self):
+        return iter(self.lines())
+
+    def flush(self, timeout=FLUSH_TIMEOUT):
+        """Bekleyen değişikliklerin servise işlenmesini en fazla `timeout` saniye bekler; bağlantı yoksa beklemez."""
+        with self._changed:
+            self._changed.wait_for(lambda: not self._outgoing or self._sock is None, timeout)
+
+    def close(self):
+        """Bağlantıyı kapatır; gönderilmemiş değişiklikler atılır."""
+        with self._changed:
+            self._stopping.set()
+            sock = self._sock
+            self._changed.notify_all()
+        if sock is not None:
+            self._disconnect(sock)
+        self._thread.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kasalar arası ortak sipariş servisi")
+    parser.add_argument("--listen", default=os.environ.get("POS_ORDER_SERVICE", DEFAULT_ADDRESS),
+                        help='"tcp:0.0.0.0:8765" veya "unix:/tmp/pos.sock"')
+    parser.add_argument("--data-dir", default=SERVICE_DIR)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    service = OrderService(args.data_dir)
+    try:
+        asyncio.run(service.serve(args.listen))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.flush()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, pyqtSignal
+from PyQt6.QtWidgets import QListView
+from PyQt6.QtGui import QPainter
+from cart import format_line
+from ticket import Ticket
+import theme
+
+EMPTY_TEXT = "Henüz sipariş eklenmedi!"
+
+
+class OrderListModel(QAbstractListModel):
+    """Sepeti gösteren model; aynı ürünler tek satırda adetle gösterilir.
+
+    Yalnızca eklenen/silinen satırlar ya da adedi değişen satır bildirilir.
+    `attached=False` ile oluşturulan model `attach()` çağrılana kadar sepeti dinlemez.
+    """
+
+    cart_event = pyqtSignal(str, object, object)
+
+    def __init__(self, cart, parent=None, attached=True):
+        super().__init__(parent)
+        self.cart = cart
+        self._ticket = Ticket(cart.items())
+        self._rows = [line for line, _ in self._ticket.folded()]  # **Katlanmış satırlar, ekrandaki sırayla**
+        self._positions = {line: row for row, line in enumerate(self._rows)}  # **satır -> sıra; adet değişimi O(1)**
+
+        # **Sepet başka bir iş parçacığından değişirse sinyal arayüz iş parçacığına taşır**
+        self.cart_event.connect(self._apply)
+        if attached:
+            cart.subscribe(self._on_cart_changed)
+
+    def _on_cart_changed(self, event, line_id, line):
+        self.cart_event.emit(event, line_id, line)
+
+    def _apply(self, event, line_id, line):
+        if event == "add":
+            if line_id in self._ticket:
+                return  # **Yeniden kurulmuş listeye geç ulaşan bildirim**
+            self._ticket.add(line_id, line)
+            if self._ticket.quantity(line) > 1:
+                self._row_changed(line)
+                return
+            row = len(self._rows)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._rows.append(line)
+            self._positions[line] = row
+            self.endInsertRows()
+        elif event == "remove":
+            if line_id not in self._ticket:
+                return
+            line = self._ticket.remove(line_id)
+            if self._ticket.quantity(line):
+                self._row_changed(line)
+                return
+            row = self._positions.pop(line)
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._rows[row]
+            for shifted in range(row, len(self._rows)):
+                self._positions[self._rows[shifted]] = shifted
+            self.endRemoveRows()
+        else:
+            self.beginResetModel()
+            self._ticket = Ticket(self.cart.items())
+            self._rows = [line for line, _ in self._ticket.folded()]
+            self._positions = {line: row for row, line in enumerate(self._rows)}
+            self.endResetModel()
+
+    def _row_changed(self, line):
+        index = self.index(self._positions[line])
+        self.dataChanged.emit(index, index)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and index.isValid():
+            line = self._rows[index.row()]
+            return format_line(line, self._ticket.quantity(line))
+        return None
+
+    def line_id(self, row):
+        """Listedeki satırın sepet id'sini döndürür; adetli satırda en son eklenen birim silinir."""
+        return self._ticket.last_id(self._rows[row])
+
+    def attach(self):
+        """Sepete yeniden abone olur ve satırları sepetin güncel halinden kurar."""
+        self.cart.subscribe(self._on_cart_changed)
+        self._apply("reset", None, None)
+
+    def detach(self):
+        """Sepet bildirimlerini dinlemeyi bırakır (ör. sayfa gizlenince)."""
+        self.cart.unsubscribe(self._on_cart_changed)
+
+    def close(self):
+        self.detach()
+
+
+class OrderListView(QListView):
+    """Sepet boşken bilgilendirme yazısı çizen sipariş listesi."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setObjectName("orderList")
+        self.setUniformItemSizes(True)  # **Satır yüksekliği bir kez hesaplanır**
+
+    def setModel(self, model):
+        super().setModel(model)
+        model.rowsInserted.connect(self.update_empty_state)
+        model.rowsRemoved.connect(self.update_empty_state)
+        model.modelReset.connect(self.update_empty_state)
+        self.update_empty_state()
+
+    def update_empty_state(self):
+        """Boş sepet durumunu sadece boş/dolu geçişlerinde günceller"""
+        theme.set_state(self, "empty", self.model().rowCount() == 0)
+
+    def current_line_id(self):
+        """Seçili satırın sepet id'sini döndürür; seçim yoksa None."""
+        index = self.currentIndex()
+        if not index.isValid():
+            return None
+        return self.model().line_id(index.row())
+
+    def clear_current(self):
+        """Seçimi kaldırır (ör. seçili satır bu arada başka kasada silindiyse)."""
+        self.setCurrentIndex(QModelIndex())
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.model() is not None and self.model().rowCount() == 0:
+            # **Yazı tipi ve renk stil sayfasındaki [empty="true"] kuralından gelir**
+            painter = QPainter(self.viewport())
+            painter.setFont(self.font())
+            painter.setPen(self.palette().color(self.foregroundRole()))
+            painter.drawText(self.viewport().rect().adjusted(6, 6, -6, -6),
+                             Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop, EMPTY_TEXT)
+            painter.end()
@@ -0,0 +1,364 @@
+import os
+import gzip
+import json
+import time
+import random
+import shutil
+import logging
+import threading
+import urllib.error
+import urllib.request
+from abc import ABC, abstractmethod
+
+OUTBOX_DIR = "outbox"  # **Gönderilmeyi bekleyen satış parçaları**
+BATCH_SIZE = 200  # **Bir parçadaki en fazla kayıt**
+FLUSH_INTERVAL = 5.0  # **Parça dolmasa da bu kadar saniye sonra kapatılır**
+MAX_BYTES = 50 * 1024 * 1024  # **Bekleyen parçaların disk sınırı; aşılırsa en eskiler silinir**
+RETRY_DELAY = 1.0  # **İlk yeniden deneme beklemesi (saniye), her denemede iki katına çıkar**
+MAX_RETRY_DELAY = 300.0
+
+CURRENT_FILE = "current.ndjson"
+SEQ_FILE = "seq"  # **Kullanılan en büyük parça sıra numarası; kuyruk boşalsa da anahtarlar tekrar kullanılmaz**
+CHUNK_SUFFIX = ".ndjson.gz"
+
+log = logging.getLogger(__name__)
+
+
+class PermanentError(Exception):
+    """Karşı taraf parçayı reddetti; tekrar göndermek anlamsız."""
+
+
+# **Hedefler: hepsi `send(data, key)` ile gzip'li NDJSON parçasını ve tekillik anahtarını alır**
+class Sink(ABC):
+    @abstractmethod
+    def send(self, data, key):
+        """Parçayı gönderir; tekrar denenmesi anlamsızsa PermanentError, diğer hatalarda istisna fırlatır."""
+
+
+class HttpSink(Sink):
+    """Parçayı merkeze HTTP POST ile gönderir.
+
+    `Idempotency-Key` başlığı parça adıdır; aynı parça tekrar gönderilirse
+    sunucu onu yok sayabilir. 409 yanıtı "zaten alındı" sayılır.
+    """
+
+    def __init__(self, url, token=None, timeout=10.0):
+        self.url = url
+        self.token = token
+        self.timeout = timeout
+
+    def send(self, data, key):
+        headers = {"Content-Type": "application/x-ndjson", "Content-Encoding": "gzip", "Idempotency-Key": key}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        request = urllib.request.Request(self.url, data=data, headers=headers, method="POST")
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+        except urllib.error.HTTPError as e:
+            if e.code == 409:
+                return
+            if 400 <= e.code < 500 and e.code not in (408, 429):
+                raise PermanentError(f"HTTP {e.code}") from e
+            raise
+
+
+class DirectorySink(Sink):
+    """Parçaları bir klasöre (ör. ağ paylaşımı) kopyalar."""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def send(self, data, key):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, key + CHUNK_SUFFIX)
+        with open(path + ".tmp", "wb") as f:
+            f.write(data)
+        os.replace(path + ".tmp", path)
+
+
+class NullSink(Sink):
+    """Hiçbir yere göndermez."""
+
+    def send(self, data, key):
+        pass
+
+
+def sink_from_env():
+    """`POS_OUTBOX` ortam değişkenine göre hedef seçer; tanımlı değilse None.
+
+    Örnekler: "https://merkez.example.com/api/sales", "dir:/mnt/merkez", "null".
+    HTTP için `POS_OUTBOX_TOKEN` tanımlıysa Bearer anahtarı olarak gönderilir.
+    """
+    spec = os.environ.get("POS_OUTBOX")
+    if not spec:
+        return None
+    if spec.startswith(("http://", "https://")):
+        return HttpSink(spec, token=os.environ.get("POS_OUTBOX_TOKEN"))
+    kind, _, arg = spec.partition(":")
+    if kind == "dir":
+        return DirectorySink(arg)
+    if kind == "null":
+        return NullSink()
+    raise ValueError(f"bilinmeyen gönderim hedefi: {spec!r}")
+
+
+class Outbox:
+    """Satışları diske yazıp arka planda merkeze gönderen kuyruk.
+
+    `submit` kaydı `current.ndjson` dosyasına ekler ve hemen döner; ağa
+    çıkmaz. Kayıtlar `batch_size` kadar olunca veya `flush_interval` dolunca
+    sıkıştırılmış bir parçaya (`<kasa>-<sıra>.ndjson.gz`) çevrilir. İşçi iş
+    parçacığı parçaları sırayla gönderir ve başarılı olanları siler; hata
+    olursa artan beklemeyle tekrar dener. Bellekte en fazla bir parça tutulur;
+    disk kullanımı `max_bytes` ile sınırlıdır. Sıra numarası `seq` dosyasında
+    tutulur; kuyruk boşalıp kasa yeniden açılsa da aynı anahtar tekrar üretilmez.
+    """
+
+    def __init__(self, sink, directory=OUTBOX_DIR, terminal=None, batch_size=BATCH_SIZE,
+                 flush_interval=FLUSH_INTERVAL, max_bytes=MAX_BYTES, retry_delay=RETRY_DELAY):
+        if terminal is None:
+            from order_service import default_ticket
+            terminal = os.environ.get("POS_TERMINAL") or default_ticket()
+        self.sink = sink
+        self.directory = directory
+        self.terminal = terminal
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.retry_delay = retry_delay
+        self.sent_chunks = 0
+        self.dropped_chunks = 0
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._current_path = os.path.join(directory, CURRENT_FILE)
+        self._failed_dir = os.path.join(directory, "failed")
+        os.makedirs(self._failed_dir, exist_ok=True)
+
+        self._seq_path = os.path.join(directory, SEQ_FILE)
+        chunks = self._chunks()
+        self._seq = max(self._read_seq(), max(
+            (int(name[:-len(CHUNK_SUFFIX)].rpartition("-")[2]) for name in chunks), default=0)) + 1
+        self._recover()
+        self._bytes = sum(os.path.getsize(os.path.join(directory, name)) for name in self._chunks())
+        self._count = self._count_current()
+        self._opened_at = time.monotonic()
+        self._file = open(self._current_path, "a", encoding="utf-8")
+
+        self._thread = threading.Thread(target=self._run, name="outbox", daemon=True)
+        self._thread.start()
+
+    # **Açılış**
+    def _chunks(self):
+        return sorted(name for name in os.listdir(self.directory) if name.endswith(CHUNK_SUFFIX))
+
+    def _read_seq(self):
+        try:
+            with open(self._seq_path, "r", encoding="utf-8") as f:
+                return int(f.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
+        except ValueError:
+            log.error("Gönderim kuyruğu sıra dosyası okunamadı: %s", self._seq_path)
+            return 0
+
+    def _write_seq(self, seq):
+        """Sıra numarasını parça oluşmadan önce diske yazar; yeniden açılışta geriye gitmez."""
+        with open(self._seq_path + ".tmp", "w", encoding="utf-8") as f:
+            f.write(str(seq))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(self._seq_path + ".tmp", self._seq_path)
+
+    def _recover(self):
+        """Yarıda kalan parça kapatmalarını aynı sıra numarasıyla tamamlar."""
+        for name in sorted(os.listdir(self.directory)):
+            if name.startswith("sealing-"):
+                seq = int(name[len("sealing-"):].partition(".")[0])
+                self._compress(os.path.join(self.directory, name), seq)
+                if seq >= self._seq:
+                    self._seq = seq + 1
+                    self._write_seq(seq)
+            elif name.endswith(".tmp"):
+                os.remove(os.path.join(self.directory, name))
+
+    def _count_current(self):
+        """Mevcut dosyadaki tam satırları sayar, yarım yazılmış son satırı keser."""
+        try:
+            with open(self._current_path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return 0
+        good = data.rfind(b"\n") + 1
+        if good < len(data):
+            with open(self._current_path, "r+b") as f:
+                f.truncate(good)
+            log.warning("Gönderim kuyruğunda yarım kalan son kayıt atıldı")
+        return data.count(b"\n")
+
+    # **Yazma**
+    def submit(self, record):
+        """Satış kaydını kuyruğa ekler; ağ beklenmez."""
+        line = json.dumps(dict(record, terminal=self.terminal), ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            if not self._count:
+                self._opened_at = time.monotonic()
+            self._file.write(line)
+            self._file.flush()
+            self._count += 1
+            if self._count >= self.batch_size:
+                self._wake.set()  # **Sıkıştırma ve fsync işçi iş parçacığında yapılır**
+
+    def flush(self):
+        """Bekleyen kayıtları hemen parçaya çevirir ve göndermeyi tetikler."""
+        with self._lock:
+            self._seal()
+
+    def _seal(self):
+        """Mevcut dosyayı sıkıştırılmış bir parçaya çevirir (kilit tutulurken çağrılır).
+
+        Disk hatasında OSError yükselir; kayıtlar `current.ndjson`da kalır ya da
+        `sealing-*` dosyası açılışta aynı sıra numarasıyla tamamlanır.
+        """
+        if not self._count:
+            return
+        self._write_seq(self._seq)
+        seq = self._seq
+        self._file.close()
+        # **Önce yeniden adlandır: çökme olursa açılışta aynı sıra numarasıyla tamamlanır**
+        sealing = os.path.join(self.directory, f"sealing-{seq:08d}.ndjson")
+        try:
+            os.replace(self._current_path, sealing)
+        finally:
+            self._file = open(self._current_path, "a", encoding="utf-8")
+        self._count = 0
+        self._seq += 1  # **Sıkıştırma yarıda kalsa da bu numara bir daha kullanılmaz**
+        self._bytes += self._compress(sealing, seq)
+        self._enforce_limit()
+        self._wake.set()
+
+    def _compress(self, source, seq):
+        path = os.path.join(self.directory, f"{self.terminal}-{seq:08d}{CHUNK_SUFFIX}")
+        with open(source, "rb") as src, open(path + ".tmp", "wb") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as dst:
+                shutil.copyfileobj(src, dst)
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(path + ".tmp", path)
+        os.remove(source)
+        return os.path.getsize(path)
+
+    def _enforce_limit(self):
+        """Disk sınırı aşıldıysa en eski parçaları siler; satışlar defterde durmaya devam eder."""
+        chunks = None
+        while self._bytes > self.max_bytes:
+            chunks = chunks or self._chunks()
+            if len(chunks) <= 1:
+                return
+            path = os.path.join(self.directory, chunks.pop(0))
+            try:
+                size = os.path.getsize(path)
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            self._bytes -= size
+            self.dropped_chunks += 1
+            log.error("Gönderim kuyruğu %d baytı aştı, en eski parça silindi: %s", self.max_bytes, path)
+
+    # **Gönderme**
+    def _run(self):
+        delay, retry_at = self.retry_delay, 0.0
+        while not self._stopping.is_set():
+            timeout = self.flush_interval
+            if retry_at:
+                timeout = max(0.0, min(timeout, retry_at - time.monotonic()))
+            self._wake.wait(timeout)
+            self._wake.clear()
+
+            # **Beklerken de parçalar kapatılır; çevrimdışıyken parça boyu sınırlı kalır**
+            with self._lock:
+                if self._count >= self.batch_size or (
+                        self._count and time.monotonic() - self._opened_at >= self.flush_interval):
+                    try:
+                        self._seal()
+                    except OSError as e:
+                        log.error("Gönderim kuyruğu parçası kapatılamadı, sonra tekrar denenecek: %s", e)
+            if time.monotonic() < retry_at:
+                continue
+
+            sent = self.sent_chunks
+            try:
+                drained = self._drain()
+            except OSError as e:
+                log.error("Gönderim kuyruğu okunamadı, sonra tekrar denenecek: %s", e)
+                drained = False
+            if drained:
+                delay, retry_at = self.retry_delay, 0.0
+            else:
+                if self.sent_chunks > sent:
+                    delay = self.retry_delay  # **Bir kısmı gittiyse bağlantı var; bekleme baştan başlar**
+                retry_at = time.monotonic() + delay * random.uniform(1.0, 1.5)
+                delay = min(delay * 2, MAX_RETRY_DELAY)
+
+    def _drain(self):
+        """Parçaları eskiden yeniye gönderir; tekrar denenecek bir hata olursa False döndürür."""
+        for name in self._chunks():
+            if self._stopping.is_set():
+                return True
+            path = os.path.join(self.directory, name)
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+            except FileNotFoundError:
+                continue  # **Disk sınırı nedeniyle silinmiş**
+
+            key = name[:-len(CHUNK_SUFFIX)]
+            try:
+                self.sink.send(data, key)
+            except PermanentError as e:
+                log.error("Parça %s reddedildi, failed/ klasörüne taşındı: %s", key, e)
+                try:
+                    os.replace(path, os.path.join(self._failed_dir, name))
+                except FileNotFoundError:
+                    continue  # **Disk sınırı nedeniyle silinmiş**
+            except Exception as e:
+                log.warning("Parça %s gönderilemedi, sonra tekrar denenecek: %s", key, e)
+                return False
+            else:
+                self.sent_chunks += 1
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    continue
+            with self._lock:
+                self._bytes -= len(data)
+        return True
+
+    def pending(self):
+        """Bekleyen (parça sayısı, bayt, henüz parçaya çevrilmemiş kayıt sayısı)."""
+        with self._lock:
+            return len(self._chunks()), self._bytes, self._count
+
+    def stop(self):
+        """İşçi iş parçacığını durdurur; gönderilemeyenler diskte kalır."""
+        self._stopping.set()
+        self._wake.set()
+        self._thread.join()
+        with self._lock:
+            self._file.close()
+
+
+_outbox = None
+
+
+def get_outbox():
+    """Paylaşılan gönderim kuyruğunu döndürür; `POS_OUTBOX` tanımlı değilse None."""
+    global _outbox
+    if _outbox is None:
+        sink = sink_from_env()
+        if sink is None:
+            return None
+        _outbox = Outbox(sink)
+    return _outbox
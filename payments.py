@@ -1,15 +1,38 @@
 import sys
-import json
-import win32print  # Windows yazıcı modülü
-import win32ui
-from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout, QLabel, QPushButton, QListWidget, QMessageBox
+import time
+import sqlite3
+from PyQt6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QListWidget,
+                             QLineEdit, QMessageBox)
+from PyQt6.QtCore import pyqtSignal, QTimer
+from cart import format_line, get_cart, ConflictError
+from checkout import PosSession, EmptyOrderError
+from money import format_tl, parse_price
+from printing import get_spooler, render_receipt
+from tenders import AUTHORIZATION_TIMEOUT, CASH, TENDER_TYPES, Payment, TenderError, get_terminal
+from ticket import fold
+import instrumentation
+import theme
 
-ORDERS_FILE = "orders.json"
+# **Ödeme türü -> buton yazısı**
+TENDER_LABELS = {"nakit": "Nakit", "kart": "Kart", "yemek kartı": "Yemek Kartı"}
 
 class PaymentSystem(QWidget):
+    print_done = pyqtSignal(object, object)  # **Yazdırma kuyruğundan gelen sonuç**
+    terminal_done = pyqtSignal(object, object, object)  # **Kart terminalinden gelen sonuç**
+
     def __init__(self,main_menu=None):
         super().__init__()
         self.main_menu = main_menu 
+        # **Ödeme açıldığı fişe bağlıdır: kart onayı beklenirken ana menüde sıradaki fişe geçilebilir**
+        book = get_cart()
+        self.ticket = getattr(book, "active", None)
+        self.session = PosSession(cart=book.current() if hasattr(book, "current") else book)
+        self.cart = self.session.cart
+        self.receipt_no = None
+        self.receipt = None  # **Son kesilen fişin metni; pencere sıfırlandıktan sonra da yazdırılabilir**
+        self.payment = None
+        self.pending = None  # **Onayı beklenen kart isteği**
+        self.pending_method = None
 
         self.setWindowTitle("Ödeme & Fiş Yazdırma")
         self.setGeometry(100, 100, 400, 400)
@@ -23,71 +46,278 @@ class PaymentSystem(QWidget):
         layout.addWidget(self.order_list)
 
         self.total_label = QLabel("Toplam: 0.00 TL")
-        self.total_label.setStyleSheet("font-size: 20px; font-weight: bold; color: red;")
+        self.total_label.setObjectName("totalLabel")
         layout.addWidget(self.total_label)
 
+        # **Ödeme kalemleri: tutar boşsa kalanın tamamı, nakitte fazlası para üstü olur**
+        self.tender_list = QListWidget()
+        self.tender_list.setObjectName("tenderList")
+        layout.addWidget(self.tender_list)
+
+        self.remaining_label = QLabel("")
+        self.remaining_label.setObjectName("remainingLabel")
+        layout.addWidget(self.remaining_label)
+
+        self.amount_box = QLineEdit()
+        self.amount_box.setObjectName("amountBox")
+        self.amount_box.returnPressed.connect(lambda: self.add_tender(CASH))
+        layout.addWidget(self.amount_box)
+
+        tender_buttons = QHBoxLayout()
+        self.tender_buttons = []
+        for method in TENDER_TYPES:
+            btn = QPushButton(TENDER_LABELS.get(method, method))
+            btn.setObjectName("tenderButton")
+            btn.clicked.connect(lambda checked, m=method: self.add_tender(m))
+            tender_buttons.addWidget(btn)
+            self.tender_buttons.append(btn)
+        self.undo_button = QPushButton("Geri Al")
+        self.undo_button.setObjectName("deleteButton")
+        self.undo_button.clicked.connect(self.remove_tender)
+        tender_buttons.addWidget(self.undo_button)
+        layout.addLayout(tender_buttons)
+
+        # **Terminal cevap vermezse kasiyer beklemeyi bırakabilir; süre dolunca da bırakılır**
+        self.cancel_card_button = QPushButton("Kart Onayını İptal Et")
+        self.cancel_card_button.setObjectName("clearButton")
+        self.cancel_card_button.clicked.connect(lambda checked: self.cancel_card())
+        self.cancel_card_button.hide()
+        layout.addWidget(self.cancel_card_button)
+        self.auth_timer = QTimer(self)
+        self.auth_timer.setSingleShot(True)
+        self.auth_timer.timeout.connect(self.authorization_timed_out)
+
+        self.terminal_status = QLabel("")
+        self.terminal_status.setObjectName("terminalStatus")
+        layout.addWidget(self.terminal_status)
+
         self.complete_button = QPushButton("Ödemeyi Tamamla")
-        self.complete_button.setStyleSheet("font-size: 25px; background-color: green; color: white;")  # **Ödeme butonu büyütüldü ve yeşil yapıldı**
+        self.complete_button.setObjectName("completeButton")
         self.complete_button.clicked.connect(self.complete_payment)
         layout.addWidget(self.complete_button)
 
         self.print_button = QPushButton("Fişi Yazdır")
-        self.print_button.setStyleSheet("font-size: 18px;")  # **Ödeme butonu büyütüldü ve yeşil yapıldı**
+        self.print_button.setObjectName("printButton")
         self.print_button.clicked.connect(self.print_receipt)
         layout.addWidget(self.print_button)
 
+        self.print_status = QLabel("")
+        layout.addWidget(self.print_status)
+
         self.setLayout(layout)
+        self.print_done.connect(self.show_print_result)
+        self.terminal_done.connect(self.show_terminal_result)
         self.load_orders()
 
     def load_orders(self):
-        """Siparişleri `orders.json` dosyasından yükler."""
+        """Siparişleri ödemesi alınan fişin sepetinden yükler."""
+        with instrumentation.timer("load_orders"):
+            self.lines = self.cart.lines()
+            self.total = self.session.total()
+            self.discounts = self.session.promotions.applied()
+
+            self.order_list.clear()
+            self.total_label.setText(f"Toplam: {format_tl(self.total)} TL")
+
+            for line, quantity in fold(self.lines):
+                self.order_list.addItem(format_line(line, quantity))
+            for name, amount in self.discounts:
+                self.order_list.addItem(f"{name}: -{format_tl(amount)} TL")
+
+        self.void_cards()
+        self.payment = Payment(self.total)
+        self.update_payment()
+
+    def update_payment(self):
+        """Ödeme kalemlerini, kalan tutarı ve buton durumlarını günceller."""
+        remaining, change = self.payment.remaining(), self.payment.change()
+        self.tender_list.clear()
+        for method, amount, tender_change, reference in self.payment.tenders:
+            text = f"{TENDER_LABELS.get(method, method)}: {format_tl(amount + tender_change)} TL"
+            self.tender_list.addItem(text + (f" ({reference})" if reference else ""))
+        text = f"Kalan: {format_tl(remaining)} TL"
+        if change:
+            text += f"  Para üstü: {format_tl(change)} TL"
+        self.remaining_label.setText(text)
+        self.amount_box.setPlaceholderText(f"Tutar (boş: {format_tl(remaining)} TL)")
+
+        busy = self.pending is not None
+        for btn in self.tender_buttons:
+            btn.setEnabled(not busy and remaining > 0)
+        self.undo_button.setEnabled(not busy and bool(self.payment.tenders))
+        self.complete_button.setEnabled(not busy)
+        self.cancel_card_button.setVisible(busy)
+
+    def read_amount(self):
+        text = self.amount_box.text().strip().replace(",", ".")
+        if not text:
+            return self.payment.remaining()
+        try:
+            return parse_price(text)
+        except ValueError:
+            raise TenderError(f"Geçersiz tutar: {text}") from None
+
+    def add_tender(self, method):
+        """Nakdi hemen ekler; kart çekimini terminale gönderir ve sonucu beklemeden döner."""
+        if self.pending is not None or self.payment is None:
+            return
         try:
-            with open(ORDERS_FILE, "r") as f:
-                orders = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            orders = []
+            amount = self.read_amount()
+            if method == CASH:
+                self.payment.add_cash(amount)
+            else:
+                self.payment.check_card(amount)
+                self._auth_started = time.perf_counter_ns()
+                self.pending_method = method
+                self.pending = get_terminal().authorize(amount, f"{self.ticket}-{self.cart.version}",
+                                                        on_done=self.terminal_done.emit)
+                self.auth_timer.start(int(AUTHORIZATION_TIMEOUT * 1000))
+                self.terminal_status.setText(f"Kart onayı bekleniyor ({format_tl(amount)} TL)...")
+        except TenderError as e:
+            QMessageBox.warning(self, "Uyarı", str(e))
+            return
+        self.amount_box.clear()
+        self.update_payment()
+        if self.payment.complete():
+            self.complete_payment()
+
+    def show_terminal_result(self, request, result, error):
+        """Kart terminalinin cevabını işler (arayüz iş parçacığında çalışır)."""
+        if request.op == "void":
+            if error is not None:
+                QMessageBox.warning(self, "Kart İptali Başarısız",
+                                    f"{request.reference} onaylı çekimi terminalden iptal edilemedi: {error}\n"
+                                    "Lütfen çekimi terminalden elle iptal edin.")
+            return
+        if request is not self.pending:
+            return
+        instrumentation.record("card_authorization", time.perf_counter_ns() - self._auth_started)
+        self.auth_timer.stop()
+        self.pending = None
+        if error is not None:
+            self.terminal_status.setText(f"Terminale ulaşılamadı: {error}")
+        elif not result.approved:
+            self.terminal_status.setText(result.message)
+        else:
+            self.payment.add_card(self.pending_method, request.amount, result.code)
+            self.terminal_status.setText(f"Onaylandı ({result.code})")
+        self.update_payment()
+        if self.payment.complete():
+            self.complete_payment()
+
+    def cancel_card(self, message="Kart onayı iptal edildi."):
+        """Beklenen kart onayını bırakır; terminal sonradan onaylarsa çekim otomatik iptal edilir."""
+        if self.pending is None or not get_terminal().cancel(self.pending):
+            return False  # **Cevap yolda; sonuç birazdan işlenecek**
+        self.auth_timer.stop()
+        self.pending = None
+        self.terminal_status.setText(message)
+        self.update_payment()
+        return True
+
+    def authorization_timed_out(self):
+        self.cancel_card(f"Terminal {AUTHORIZATION_TIMEOUT:.0f} saniyede cevap vermedi, kart onayı iptal edildi.")
+
+    def remove_tender(self):
+        """Seçili (yoksa son) ödeme kalemini geri alır; kart çekimi terminalden iptal edilir."""
+        if self.pending is not None or self.payment is None or not self.payment.tenders:
+            return
+        row = self.tender_list.currentRow()
+        tender = self.payment.remove(row if row >= 0 else len(self.payment.tenders) - 1)
+        if tender.reference is not None:
+            get_terminal().void(tender.reference, on_done=self.terminal_done.emit)
+        self.update_payment()
 
-        self.order_list.clear()
-        total_price = sum(price for _, _, price in orders)
-        self.total_label.setText(f"Toplam: {total_price:.2f} TL")
+    def void_cards(self):
+        """Fişi kesilmemiş ödemenin onaylı kart çekimlerini terminalden iptal eder."""
+        if self.payment is None:
+            return
+        for tender in self.payment.tenders:
+            if tender.reference is not None:
+                get_terminal().void(tender.reference, on_done=self.terminal_done.emit)
+        self.payment = None
 
-        for drink, size, price in orders:
-            self.order_list.addItem(f"{drink} ({size} oz) - {price:.2f} TL")
+    def closeEvent(self, event):
+        # **Beklenen onay bırakılır; cevabı yoldaysa pencere sonucu işleyene kadar açık kalır**
+        if self.pending is not None and not self.cancel_card():
+            event.ignore()
+            return
+        self.void_cards()
+        super().closeEvent(event)
 
     def print_receipt(self):
-        """Windows yazıcısından fiş çıkarır."""
-        try:
-            printer_name = win32print.GetDefaultPrinter()  # Varsayılan yazıcıyı al
-
-            receipt_text = "\n".join(self.order_list.item(i).text() for i in range(self.order_list.count()))
-            receipt_text += f"\n-------------------------\nToplam: {self.total_label.text()}\n\nTeşekkürler!"
-
-            hprinter = win32print.OpenPrinter(printer_name)
-            printer_info = win32print.GetPrinter(hprinter, 2)
-            pdc = win32ui.CreateDC()
-            pdc.CreatePrinterDC(printer_name)
-            pdc.StartDoc('Fiş Yazdırma')
-            pdc.StartPage()
-            pdc.TextOut(100, 100, receipt_text)
-            pdc.EndPage()
-            pdc.EndDoc()
-            pdc.DeleteDC()
-
-            QMessageBox.information(self, "Başarılı", "Fiş yazdırıldı!")
-        except Exception as e:
-            QMessageBox.warning(self, "Hata", f"Fiş yazdırma başarısız: {e}")
+        """Fişi yazdırma kuyruğuna ekler; yazdırma arka planda yapılır.
+
+        Son kesilen fiş varsa o (fiş numarası ve ödeme kalemleriyle), yoksa
+        ödemesi alınmakta olan siparişin ön izlemesi yazdırılır.
+        """
+        with instrumentation.timer("print_receipt"):
+            self._print_started = time.perf_counter_ns()
+            data = self.receipt
+            if data is None:
+                data = render_receipt(self.lines, self.total, discounts=self.discounts)
+            self.print_status.setText("Fiş yazdırılıyor...")
+            get_spooler().submit(data, on_done=self.print_done.emit)
+
+    def show_print_result(self, job, error):
+        """Yazdırma sonucunu gösterir (arayüz iş parçacığında çalışır)."""
+        # **Kuyruğa eklemeden yazıcının bitirmesine kadar geçen süre**
+        instrumentation.record("print_job", time.perf_counter_ns() - self._print_started)
+        if error is None:
+            self.print_status.setText("Fiş yazdırıldı!")
+        else:
+            self.print_status.setText("")
+            QMessageBox.warning(self, "Hata", f"Fiş yazdırma başarısız: {error}")
 
     def complete_payment(self):
-        """Ödemeyi tamamlar ve siparişleri temizler."""
-        with open(ORDERS_FILE, "w") as f:
-            json.dump([], f)
+        """Fişi ödeme kalemleriyle satış defterine kaydeder, yazdırır ve siparişleri temizler.
+
+        Hiç ödeme girilmediyse tutarın tamamı nakit alınmış sayılır.
+        """
+        # **Uyarı pencereleri kasiyeri beklediği için yalnızca başarılı ödeme ölçülür**
+        start = time.perf_counter_ns()
+        if self.pending is not None or self.payment is None:
+            return
+        if not self.payment.tenders and self.payment.remaining() > 0:
+            self.payment.add_cash(self.payment.remaining())
+        if not self.payment.complete():
+            QMessageBox.warning(self, "Uyarı", f"Kalan tutar: {format_tl(self.payment.remaining())} TL")
+            return
+        try:
+            self.receipt_no = self.session.checkout(payment=self.payment)
+        except EmptyOrderError as e:
+            QMessageBox.warning(self, "Uyarı", str(e))
+            return
+        except ConflictError:
+            QMessageBox.warning(self, "Uyarı", "Sipariş ödeme sırasında değiştirildi, lütfen kontrol edin.")
+            self.load_orders()
+            return
+        except (sqlite3.Error, OSError) as e:
+            # **Fiş kesilmedi, sepet duruyor; onaylı kart çekimleri iptal edilir ve ödeme baştan alınır**
+            self.load_orders()
+            QMessageBox.critical(self, "Hata", f"Satış kaydedilemedi, sipariş sepette duruyor: {e}")
+            return
+
+        # **Sepet sıfırlanmadan önce kesilen fiş yazdırma kuyruğuna eklenir**
+        self.receipt = render_receipt(self.lines, self.total, self.receipt_no, self.discounts,
+                                      self.payment.tenders)
+        self.print_receipt()
+        change = self.payment.change()
+        self.payment = None  # **Kesilen fişin kart çekimleri iptal edilmez**
+        if self.main_menu:
+            self.main_menu.update_receipt_count()
+            self.main_menu.ticket_paid(self.ticket)
 
         self.load_orders()
+        instrumentation.record("complete_payment", time.perf_counter_ns() - start)
         #QMessageBox.information(self, "Ödeme Tamamlandı", "Sipariş sıfırlandı ve ödeme alındı!")
+        if change:
+            QMessageBox.information(self, "Para Üstü", f"Para üstü: {format_tl(change)} TL")
         self.close()
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    theme.apply(app)
     window = PaymentSystem()
     window.show()
     sys.exit(app.exec())
@@ -0,0 +1,41 @@
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtWidgets import QLabel
+import instrumentation
+
+REFRESH_MS = 1000
+
+
+class PerfOverlay(QLabel):
+    """Ana menünün üstünde eylem başına p50/p99 sürelerini gösteren gizli panel.
+
+    Yalnızca görünürken saniyede bir yenilenir; Ctrl+Shift+D ile açılıp kapanır.
+    """
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.setObjectName("perfOverlay")
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.hide()
+
+    def toggle(self):
+        if self.isVisible():
+            self.timer.stop()
+            self.hide()
+            return
+        self.refresh()
+        self.show()
+        self.raise_()
+        self.timer.start(REFRESH_MS)
+
+    def refresh(self):
+        if not instrumentation.ENABLED:
+            self.setText("Ölçüm kapalı (POS_PERF=1 ile başlatın)")
+        else:
+            rows = [f"{'eylem':18} {'adet':>6} {'p50 ms':>8} {'p99 ms':>8}"]
+            for name, entry in instrumentation.get_recorder().snapshot().items():
+                rows.append(f"{name:18} {entry['count']:6d} {entry['p50_ms']:8.1f} {entry['p99_ms']:8.1f}")
+            self.setText("\n".join(rows))
+        self.adjustSize()
+        self.move(self.parentWidget().width() - self.width() - 8, 8)
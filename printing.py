@@ -0,0 +1,233 @@
+import os
+import sys
+import time
+import queue
+import socket
+import logging
+import threading
+from abc import ABC, abstractmethod
+from itertools import count
+from cart import format_line
+from money import format_tl
+from ticket import fold
+
+RECEIPT_DIR = "receipts"  # **Dosya yazıcısının fişleri bıraktığı klasör**
+MAX_ATTEMPTS = 5
+RETRY_DELAY = 0.5  # **İlk yeniden deneme beklemesi (saniye), her denemede iki katına çıkar**
+MAX_RETRY_DELAY = 10.0
+
+log = logging.getLogger(__name__)
+
+
+def render_receipt(lines, total, receipt_no=None, discounts=(), payments=()):
+    """Fiş metnini oluşturur ve UTF-8 bayt dizisi olarak döndürür.
+
+    Aynı ürünler tek satırda adetle yazılır. `discounts` uygulanan
+    kampanyaların (ad, kuruş) listesidir; `total` indirimli toplamdır.
+    `payments` ödeme kalemleridir [(tür, kuruş, para üstü, onay kodu)].
+    """
+    parts = []
+    if receipt_no is not None:
+        parts.append(f"Fiş No: {receipt_no}")
+        parts.append(time.strftime("%d.%m.%Y %H:%M"))
+        parts.append("")
+    parts.extend(format_line(line, quantity) for line, quantity in fold(lines))
+    if discounts:
+        parts.append("")
+        parts.extend(f"{name}: -{format_tl(amount)} TL" for name, amount in discounts)
+    parts.append("-------------------------")
+    parts.append(f"Toplam: {format_tl(total)} TL")
+    for method, amount, change, reference in payments:
+        parts.append(f"{method}: {format_tl(amount + change)} TL" + (f" ({reference})" if reference else ""))
+    change = sum(payment[2] for payment in payments)
+    if change:
+        parts.append(f"Para üstü: {format_tl(change)} TL")
+    parts.append("")
+    parts.append("Teşekkürler!")
+    return ("\n".join(parts) + "\n").encode("utf-8")
+
+
+# **Yazıcı arka uçları: hepsi `send(data)` ile UTF-8 fiş baytlarını alır**
+class PrinterBackend(ABC):
+    @abstractmethod
+    def send(self, data):
+        """Fişi yazdırır; hata olursa istisna fırlatır (kuyruk tekrar dener)."""
+
+
+class WindowsBackend(PrinterBackend):
+    """Windows varsayılan yazıcısına GDI ile yazdırır."""
+
+    def __init__(self, printer_name=None):
+        self.printer_name = printer_name
+
+    def send(self, data):
+        import win32print  # Windows yazıcı modülü
+        import win32ui
+
+        printer_name = self.printer_name or win32print.GetDefaultPrinter()
+        pdc = win32ui.CreateDC()
+        pdc.CreatePrinterDC(printer_name)
+        try:
+            pdc.StartDoc('Fiş Yazdırma')
+            pdc.StartPage()
+            y = 100
+            for line in data.decode("utf-8").splitlines():
+                pdc.TextOut(100, y, line)
+                y += 60
+            pdc.EndPage()
+            pdc.EndDoc()
+        finally:
+            pdc.DeleteDC()
+
+
+class EscPosBackend(PrinterBackend):
+    """Termal fiş yazıcısına ham ESC/POS baytları gönderir.
+
+    `target` bir aygıt dosyası ("/dev/usb/lp0") ya da ağ yazıcısı için
+    ("192.168.1.50", 9100) biçiminde bir adrestir.
+    """
+
+    INIT = b"\x1b@"
+    TURKISH_CODEPAGE = b"\x1bt\x0d"  # **PC857**
+    FEED_AND_CUT = b"\n\n\n\x1dV\x00"
+
+    def __init__(self, target, timeout=5.0):
+        self.target = target
+        self.timeout = timeout
+
+    def send(self, data):
+        text = data.decode("utf-8").encode("cp857", errors="replace")
+        payload = self.INIT + self.TURKISH_CODEPAGE + text + self.FEED_AND_CUT
+        if isinstance(self.target, tuple):
+            with socket.create_connection(self.target, timeout=self.timeout) as conn:
+                conn.sendall(payload)
+        else:
+            with open(self.target, "wb") as f:
+                f.write(payload)
+
+
+class FileBackend(PrinterBackend):
+    """Fişleri klasöre metin dosyası olarak yazar (Linux ve test için)."""
+
+    def __init__(self, directory=RECEIPT_DIR):
+        self.directory = directory
+        self._names = count(1)
+
+    def send(self, data):
+        os.makedirs(self.directory, exist_ok=True)
+        name = f"fis-{time.strftime('%Y%m%d-%H%M%S')}-{next(self._names)}.txt"
+        with open(os.path.join(self.directory, name), "wb") as f:
+            f.write(data)
+
+
+class NullBackend(PrinterBackend):
+    """Hiçbir şey yazdırmaz."""
+
+    def send(self, data):
+        pass
+
+
+def backend_from_env():
+    """`POS_PRINTER` ortam değişkenine göre yazıcı seçer.
+
+    Örnekler: "windows", "escpos:/dev/usb/lp0", "escpos:192.168.1.50:9100",
+    "file:receipts", "null". Tanımlı değilse Windows'ta varsayılan yazıcı,
+    diğer sistemlerde `receipts/` klasörü kullanılır.
+    """
+    spec = os.environ.get("POS_PRINTER") or ("windows" if sys.platform == "win32" else "file")
+    kind, _, arg = spec.partition(":")
+    if kind == "windows":
+        return WindowsBackend(arg or None)
+    if kind == "escpos":
+        host, _, port = arg.rpartition(":")
+        if host and port.isdigit():
+            return EscPosBackend((host, int(port)))
+        return EscPosBackend(arg)
+    if kind == "file":
+        return FileBackend(arg or RECEIPT_DIR)
+    if kind == "null":
+        return NullBackend()
+    raise ValueError(f"bilinmeyen yazıcı: {spec!r}")
+
+
+class PrintJob:
+    def __init__(self, job_id, data, on_done):
+        self.job_id = job_id
+        self.data = data
+        self.on_done = on_done
+        self.attempts = 0
+        self.error = None
+
+
+class PrintSpooler:
+    """Fişleri arka plandaki bir iş parçacığında sırayla yazdırır.
+
+    Başarısız işler artan beklemeyle yeniden denenir; sonuç `on_done(job, error)`
+    ile bildirilir (error başarılıysa None). Geri çağırma işçi iş parçacığında
+    çalışır; arayüz güncellemeleri bir Qt sinyali üzerinden yapılmalıdır.
+    """
+
+    def __init__(self, backend, max_attempts=MAX_ATTEMPTS, retry_delay=RETRY_DELAY):
+        self.backend = backend
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self._queue = queue.Queue()
+        self._ids = count(1)
+        self._thread = threading.Thread(target=self._run, name="print-spooler", daemon=True)
+        self._thread.start()
+
+    def submit(self, data, on_done=None):
+        """Fişi kuyruğa ekler ve hemen döner."""
+        job = PrintJob(next(self._ids), data, on_done)
+        self._queue.put(job)
+        return job
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            self._print(job)
+
+    def _print(self, job):
+        delay = self.retry_delay
+        while True:
+            job.attempts += 1
+            try:
+                self.backend.send(job.data)
+                job.error = None
+                break
+            except Exception as e:
+                job.error = e
+                if job.attempts >= self.max_attempts:
+                    log.error("Fiş %d yazdırılamadı: %s", job.job_id, e)
+                    break
+                log.warning("Fiş %d yazdırılamadı (deneme %d), %.1f sn sonra tekrar: %s",
+                            job.job_id, job.attempts, delay, e)
+                time.sleep(delay)
+                delay = min(delay * 2, MAX_RETRY_DELAY)
+
+        if job.on_done is not None:
+            try:
+                job.on_done(job, job.error)
+            except Exception:
+                log.exception("Yazdırma sonucu bildirilemedi")
+
+    def stop(self):
+        """Kuyruktaki işler bittikten sonra iş parçacığını durdurur."""
+        self._queue.put(None)
+        self._thread.join()
+
+
+_spooler = None
+
+
+def get_spooler():
+    """Uygulama genelinde paylaşılan yazdırma kuyruğunu döndürür."""
+    global _spooler
+    if _spooler is None:
+        _spooler = PrintSpooler(backend_from_env())
+    return _spooler
@@ -0,0 +1,307 @@
+import os
+import sys
+import json
+import time
+import queue
+import socket
+import asyncio
+import logging
+import argparse
+import threading
+import weakref
+from collections import deque
+from itertools import count
+
+DEFAULT_ADDRESS = "tcp:127.0.0.1:8766"
+JOURNAL_FILE = "production.journal"  # **Açık hazırlık kalemleri; açılışta oynatılıp kısaltılır**
+RETRY_DELAY = 1.0  # **Yayın kanalına bağlanılamazsa tekrar deneme aralığı (saniye)**
+MAX_PENDING = 10000  # **Bağlantı yokken bellekte bekletilen en fazla mesaj; aşılırsa en eski sipariş atılır**
+SUBSCRIBER_BUFFER = 1024 * 1024  # **Okumayan ekrana biriktirilecek en fazla bayt**
+STATS_WINDOW = 50  # **İstasyon başına ortalama hazırlık süresi için son kalem sayısı**
+
+# **Kategori -> hazırlık istasyonu; listede olmayan kategoriler (dolap, market...) gönderilmez**
+STATIONS = {
+    "hotDrinks": "bar",
+    "coldDrinks": "bar",
+    "extras": "bar",
+    "desserts": "mutfak",
+    "sandwiches": "mutfak",
+}
+
+log = logging.getLogger(__name__)
+
+
+def encode(message):
+    """Mesajı kanalda kullanılan tek satırlık JSON biçimine çevirir."""
+    return (json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+# **Yayın merkezi**
+class ProductionHub:
+    """Onaylanan siparişleri istasyon ekranlarına anında dağıtan yerel yayın kanalı.
+
+    Kasalar "order" ve "void", ekranlar "done" mesajı gönderir; her mesaj
+    açık kalemlere uygulanır, günlüğe eklenir ve yalnızca ilgili istasyona
+    abone olan ekranlara iletilir. Yeni bağlanan ekran açık kalemlerin
+    anlık görüntüsünü alır, sonrasında yalnızca değişiklikleri alır.
+    """
+
+    def __init__(self, journal_path=JOURNAL_FILE):
+        self.journal_path = journal_path
+        self.items = {}  # **kalem id -> kalem; yalnızca hazırlanmayı bekleyenler**
+        self.prep_times = {}  # **istasyon -> son hazırlık süreleri (saniye)**
+        self.subscribers = {}  # **yazıcı akışı -> istasyonlar (None: hepsi)**
+        self._load()
+        self._journal = open(journal_path, "a", encoding="utf-8")
+
+    def _load(self):
+        """Günlüğü oynatır ve yalnızca açık kalemleri içerecek şekilde yeniden yazar."""
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for raw in f:
+                    try:
+                        self.apply(json.loads(raw))
+                    except ValueError:
+                        break  # **Çökme anında yarım kalan son satır**
+        except FileNotFoundError:
+            pass
+        tmp_path = self.journal_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            if self.items:
+                f.write(json.dumps({"event": "order", "items": list(self.items.values())}, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, self.journal_path)
+
+    def apply(self, message):
+        """Mesajı açık kalemlere uygular; ekranlara gidecek hale getirip döndürür."""
+        event = message["event"]
+        if event == "order":
+            for item in message["items"]:
+                self.items[item["id"]] = item
+        elif event in ("void", "done"):
+            now = message.setdefault("at", time.time())
+            removed = [self.items.pop(item_id, None) for item_id in message["items"]]
+            message["items"] = [item["id"] for item in removed if item is not None]
+            if event == "done":
+                for item in removed:
+                    if item is not None:
+                        times = self.prep_times.setdefault(item["station"], deque(maxlen=STATS_WINDOW))
+                        times.append(now - item["at"])
+                message["stats"] = self.stats()
+        return message
+
+    def stats(self):
+        """İstasyon başına ortalama hazırlık süresi (saniye)."""
+        return {station: sum(times) / len(times) for station, times in self.prep_times.items() if times}
+
+    def publish(self, message):
+        message = self.apply(message)
+        if not message["items"]:
+            return
+        self._journal.write(json.dumps(message, ensure_ascii=False) + "\n")
+        self._journal.flush()
+        for writer, stations in list(self.subscribers.items()):
+            # **Takılan ekran kanalın belleğini büyütmesin: bağlantısı kesilir, ekran yeniden bağlanıp anlık görüntüyü alır**
+            if writer.transport.get_write_buffer_size() > SUBSCRIBER_BUFFER:
+                log.warning("Hazırlık kanalı: okumayan ekran bırakıldı")
+                del self.subscribers[writer]
+                writer.transport.abort()
+                continue
+            outgoing = message
+            if stations is not None and message["event"] == "order":
+                items = [item for item in message["items"] if item["station"] in stations]
+                if not items:
+                    continue
+                outgoing = dict(message, items=items)
+            writer.write(encode(outgoing))
+
+    def snapshot(self, stations=None):
+        items = [item for item in self.items.values() if stations is None or item["station"] in stations]
+        return {"event": "snapshot", "items": items, "stats": self.stats()}
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                raw = await reader.readline()
+                if not raw:
+                    break
+                try:
+                    request = json.loads(raw)
+                    op = request["op"]
+                    if op == "subscribe":
+                        stations = request.get("stations")
+                        stations = frozenset(stations) if stations else None
+                        writer.write(encode(self.snapshot(stations)))
+                        self.subscribers[writer] = stations
+                    elif op == "publish":
+                        self.publish(request["message"])
+                    elif op == "done":
+                        self.publish({"event": "done", "items": request["items"]})
+                except (ValueError, KeyError, TypeError) as e:
+                    log.warning("Geçersiz hazırlık mesajı atlandı: %s", e)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.subscribers.pop(writer, None)
+            writer.close()
+
+    async def serve(self, address=DEFAULT_ADDRESS):
+        from order_service import parse_address
+        kind, target = parse_address(address)
+        if kind == "tcp":
+            server = await asyncio.start_server(self.handle, *target)
+        else:
+            server = await asyncio.start_unix_server(self.handle, target)
+        log.info("Hazırlık kanalı dinleniyor: %s", address)
+        async with server:
+            await server.serve_forever()
+
+
+def connect(address, timeout=5.0):
+    """Yayın kanalına bağlı bir soket döndürür."""
+    from order_service import parse_address
+    kind, target = parse_address(address)
+    sock = socket.socket(socket.AF_INET if kind == "tcp" else socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    sock.connect(target)
+    sock.settimeout(None)
+    return sock
+
+
+# **Kasa tarafı**
+class ProductionClient:
+    """Sepetin hazırlanacak satırlarını yayın kanalına gönderen kasa istemcisi.
+
+    `sync` sepeti daha önce gönderilenlerle karşılaştırır ve yalnızca yeni
+    satırları ("order") ve sonradan silinenleri ("void") kuyruğa koyar.
+    Gönderim arka planda yapılır; kanal kapalıysa mesajlar bellekte bekler
+    ve bağlantı gelince sırayla gönderilir, kasa hiç beklemez.
+    """
+
+    def __init__(self, address, terminal):
+        self.address = address
+        self.terminal = terminal
+        self._prefix = f"{terminal}-{int(time.time()):x}"  # **Kalem id'leri kasa yeniden açılınca çakışmasın**
+        self._ids = count(1)
+        self._sent = weakref.WeakKeyDictionary()  # **sepet -> {satır id: kalem id veya None}**
+        self.dropped_messages = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="production", daemon=True)
+        self._thread.start()
+
+    def sync(self, cart, catalog):
+        """Sepetteki yeni satırları istasyonlara gönderir, silinenleri iptal eder."""
+        ticket = cart.current() if hasattr(cart, "current") else cart
+        sent = self._sent.setdefault(ticket, {})
+        items = dict(cart.items())
+
+        now, new = time.time(), []
+        order = f"{self._prefix}-{next(self._ids)}"
+        name = cart.name() if hasattr(cart, "name") else self.terminal
+        for line_id, (product, size, _) in items.items():
+            if line_id in sent:
+                continue
+            station = STATIONS.get(catalog.category_of(product))
+            sent[line_id] = None
+            if station is not None:
+                sent[line_id] = f"{order}-{line_id}"
+                new.append({"id": sent[line_id], "order": order, "terminal": self.terminal, "ticket": name,
+                            "station": station, "product": product, "size": size, "at": now})
+        voided = [sent.pop(line_id) for line_id in [line_id for line_id in sent if line_id not in items]]
+        voided = [item_id for item_id in voided if item_id is not None]
+
+        if new:
+            self._queue.put({"op": "publish", "message": {"event": "order", "items": new}})
+        if voided:
+            self._queue.put({"op": "publish", "message": {"event": "void", "items": voided}})
+
+    def forget(self, cart):
+        """Ödemesi alınan sepetin gönderim kaydını siler; sonraki müşteri yeni sipariş olur."""
+        self._sent.pop(cart.current() if hasattr(cart, "current") else cart, None)
+
+    def _hold(self, pending, message):
+        """Mesajı gönderilmeyi bekleyenlere ekler.
+
+        Henüz gönderilmemiş kalemin iptali kalemi bekleyen siparişten çıkarır;
+        ikisi de gönderilmez. Sınır aşılırsa iptaller korunur, en eski sipariş
+        atılır ve sayılır: ekranda sahipsiz kalem kalmaz.
+        """
+        event = message["message"]
+        if event["event"] == "void":
+            voided, unsent = set(event["items"]), set()
+            for held in pending:
+                held_event = held["message"]
+                if held_event["event"] == "order":
+                    items = [item for item in held_event["items"] if item["id"] not in voided]
+                    if len(items) != len(held_event["items"]):
+                        unsent.update(item["id"] for item in held_event["items"] if item["id"] in voided)
+                        held_event["items"] = items
+            pending[:] = [held for held in pending if held["message"]["items"]]
+            event["items"] = [item_id for item_id in event["items"] if item_id not in unsent]
+            if not event["items"]:
+                return
+        pending.append(message)
+        while len(pending) > MAX_PENDING:
+            index = next((i for i, held in enumerate(pending) if held["message"]["event"] == "order"), 0)
+            dropped = pending.pop(index)
+            self.dropped_messages += 1
+            log.error("Hazırlık kanalı kuyruğu %d mesajı aştı, bekleyen en eski %s mesajı atıldı (%d kalem)",
+                      MAX_PENDING, dropped["message"]["event"], len(dropped["message"]["items"]))
+
+    def _run(self):
+        pending, sock = [], None
+        while True:
+            if not pending:
+                self._hold(pending, self._queue.get())
+            while True:
+                try:
+                    self._hold(pending, self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not pending:
+                continue
+            try:
+                if sock is None:
+                    sock = connect(self.address)
+                sock.sendall(b"".join(encode(message) for message in pending))
+                pending.clear()
+            except OSError as e:
+                log.warning("Hazırlık kanalına gönderilemedi (%d mesaj bekliyor): %s", len(pending), e)
+                if sock is not None:
+                    sock.close()
+                    sock = None
+                time.sleep(RETRY_DELAY)
+
+
+_client = None
+
+
+def get_production():
+    """Paylaşılan hazırlık istemcisini döndürür; `POS_PRODUCTION` tanımlı değilse None."""
+    global _client
+    if _client is None:
+        address = os.environ.get("POS_PRODUCTION")
+        if not address:
+            return None
+        from order_service import default_ticket
+        _client = ProductionClient(address, os.environ.get("POS_TERMINAL") or default_ticket())
+    return _client
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Barista/mutfak ekranları için hazırlık kanalı")
+    parser.add_argument("--listen", default=os.environ.get("POS_PRODUCTION", DEFAULT_ADDRESS),
+                        help='"tcp:0.0.0.0:8766" veya "unix:/tmp/pos-production.sock"')
+    parser.add_argument("--journal", default=JOURNAL_FILE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    hub = ProductionHub(args.journal)
+    try:
+        asyncio.run(hub.serve(args.listen))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    sys.exit(main())
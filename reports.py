@@ -0,0 +1,311 @@
+import io
+import csv
+import sys
+import time
+import argparse
+import threading
+from collections import defaultdict
+from ledger import get_ledger, start_of_day
+from money import format_tl
+
+# **Kapanmış günlerin özetleri; aylık rapor satırları değil bu özetleri okur**
+ROLLUP_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rollup_days (
+    day REAL PRIMARY KEY,
+    built_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rollup_lines (
+    day REAL NOT NULL,
+    category TEXT NOT NULL,
+    product TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    quantity INTEGER NOT NULL,
+    total_kurus INTEGER NOT NULL,
+    PRIMARY KEY (day, category, product, size)
+);
+CREATE TABLE IF NOT EXISTS rollup_receipts (
+    day REAL NOT NULL,
+    hour INTEGER NOT NULL,
+    receipts INTEGER NOT NULL,
+    total_kurus INTEGER NOT NULL,
+    discount_kurus INTEGER NOT NULL,
+    PRIMARY KEY (day, hour)
+);
+CREATE TABLE IF NOT EXISTS rollup_payments (
+    day REAL NOT NULL,
+    method TEXT NOT NULL,
+    receipts INTEGER NOT NULL,
+    total_kurus INTEGER NOT NULL,
+    PRIMARY KEY (day, method)
+);
+"""
+ROLLUP_EXISTS_SQL = "SELECT 1 FROM rollup_days WHERE day = ?"
+INSERT_ROLLUP_DAY_SQL = "INSERT OR REPLACE INTO rollup_days (day, built_at) VALUES (?, ?)"
+INSERT_ROLLUP_LINE_SQL = ("INSERT OR REPLACE INTO rollup_lines (day, category, product, size, quantity, total_kurus) "
+                          "VALUES (?, ?, ?, ?, ?, ?)")
+INSERT_ROLLUP_RECEIPT_SQL = ("INSERT OR REPLACE INTO rollup_receipts (day, hour, receipts, total_kurus, discount_kurus) "
+                             "VALUES (?, ?, ?, ?, ?)")
+INSERT_ROLLUP_PAYMENT_SQL = ("INSERT OR REPLACE INTO rollup_payments (day, method, receipts, total_kurus) "
+                             "VALUES (?, ?, ?, ?)")
+ROLLUP_LINES_SQL = "SELECT category, product, size, quantity, total_kurus FROM rollup_lines WHERE day = ?"
+ROLLUP_RECEIPTS_SQL = "SELECT hour, receipts, total_kurus, discount_kurus FROM rollup_receipts WHERE day = ?"
+ROLLUP_PAYMENTS_SQL = "SELECT method, receipts, total_kurus FROM rollup_payments WHERE day = ?"
+
+TEXT_WIDTH = 40  # **Fiş yazıcısı satır genişliği**
+
+_schema_lock = threading.Lock()
+_schema_ready = set()
+
+
+def next_day(day):
+    """Gün başlangıcından sonraki günün başlangıcı (yaz saati geçişlerinde de doğru)."""
+    return start_of_day(day + 90000)
+
+
+class ZReport:
+    """Bir zaman aralığının satış özeti.
+
+    Satırlar, fişler ve ödemeler tek tek `add_line`/`add_receipt`/`add_payment`
+    ile eklenir; bellek kullanımı satır sayısına değil farklı ürün sayısına
+    bağlıdır.
+    """
+
+    def __init__(self, start, end):
+        self.start, self.end = start, end
+        self.receipts = 0
+        self.net = 0  # **İndirim düşülmüş fiş toplamları**
+        self.discount = 0
+        self.products = defaultdict(lambda: [0, 0])  # **(kategori, ürün, boyut) -> [adet, kuruş]**
+        self.hours = defaultdict(lambda: [0, 0])  # **saat -> [fiş, kuruş]**
+        self.payments = defaultdict(lambda: [0, 0])  # **ödeme türü -> [fiş, kuruş]; bölünmüş fiş her türde sayılır**
+
+    def add_line(self, category, product, size, price, quantity=1):
+        entry = self.products[(category or "", product, size)]
+        entry[0] += quantity
+        entry[1] += price
+
+    def add_receipt(self, hour, total, discount, receipts=1):
+        self.receipts += receipts
+        self.net += total
+        self.discount += discount
+        self.hours[hour][0] += receipts
+        self.hours[hour][1] += total
+
+    def add_payment(self, method, total, receipts=1):
+        self.payments[method][0] += receipts
+        self.payments[method][1] += total
+
+    def merge(self, other):
+        for key, (quantity, total) in other.products.items():
+            self.add_line(*key, total, quantity)
+        for hour, (receipts, total) in other.hours.items():
+            self.hours[hour][0] += receipts
+            self.hours[hour][1] += total
+        for method, (receipts, total) in other.payments.items():
+            self.add_payment(method, total, receipts)
+        self.receipts += other.receipts
+        self.net += other.net
+        self.discount += other.discount
+
+    @property
+    def gross(self):
+        return sum(total for _, total in self.products.values())
+
+    def categories(self):
+        """Kategori başına [adet, kuruş]."""
+        totals = defaultdict(lambda: [0, 0])
+        for (category, _, _), (quantity, total) in self.products.items():
+            totals[category][0] += quantity
+            totals[category][1] += total
+        return dict(totals)
+
+
+# **Akış halinde okuma ve günlük özetler**
+def stream_into(report, ledger, start, end):
+    """Aralıktaki satırları ve fişleri defterden parça parça okuyup rapora ekler."""
+    for _, _, category, product, size, price in ledger.lines_between(start, end):
+        report.add_line(category, product, size, price)
+    for _, created_at, total, _, discount in ledger.receipts_between(start, end):
+        report.add_receipt(time.localtime(created_at).tm_hour, total, discount)
+    for method, receipts, total in ledger.payment_totals(start, end):
+        report.add_payment(method, total, receipts)
+    return report
+
+
+def ensure_schema(ledger):
+    with _schema_lock:
+        if ledger.path not in _schema_ready:
+            ledger.conn.executescript(ROLLUP_SCHEMA)
+            _schema_ready.add(ledger.path)
+
+
+def build_rollup(ledger, day):
+    """Kapanmış bir günün özetini satırları ve fişleri akıtarak hesaplar ve kaydeder."""
+    following = next_day(day)
+    report = ZReport(day, following)
+    for _, _, category, product, size, price in ledger.lines_between(day, following):
+        report.add_line(category, product, size, price)
+
+    cells = defaultdict(lambda: [0, 0, 0])  # **saat -> [fiş, kuruş, indirim]**
+    for _, created_at, total, _, discount in ledger.receipts_between(day, following):
+        cell = cells[time.localtime(created_at).tm_hour]
+        cell[0] += 1
+        cell[1] += total
+        cell[2] += discount
+
+    with ledger.conn:
+        ledger.conn.executemany(INSERT_ROLLUP_LINE_SQL, [
+            (day, category, product, size, quantity, total)
+            for (category, product, size), (quantity, total) in report.products.items()
+        ])
+        ledger.conn.executemany(INSERT_ROLLUP_RECEIPT_SQL, [
+            (day, hour, receipts, total, discount) for hour, (receipts, total, discount) in cells.items()
+        ])
+        ledger.conn.executemany(INSERT_ROLLUP_PAYMENT_SQL, [
+            (day, method, receipts, total) for method, receipts, total in ledger.payment_totals(day, following)
+        ])
+        ledger.conn.execute(INSERT_ROLLUP_DAY_SQL, (day, time.time()))
+
+
+def load_rollup(ledger, day):
+    report = ZReport(day, next_day(day))
+    for category, product, size, quantity, total in ledger.conn.execute(ROLLUP_LINES_SQL, (day,)):
+        report.add_line(category, product, size, total, quantity)
+    for hour, receipts, total, discount in ledger.conn.execute(ROLLUP_RECEIPTS_SQL, (day,)):
+        report.add_receipt(hour, total, discount, receipts)
+    for method, receipts, total in ledger.conn.execute(ROLLUP_PAYMENTS_SQL, (day,)):
+        report.add_payment(method, total, receipts)
+    return report
+
+
+def build_report(start, end, ledger=None, use_rollups=True):
+    """[start, end) aralığının Z raporunu oluşturur.
+
+    Tamamı aralığa giren ve bitmiş günler için günlük özet kullanılır (yoksa
+    bir kez hesaplanıp kaydedilir); bugün ve yarım günler satırlardan akıtılır.
+    """
+    ledger = ledger or get_ledger()
+    ensure_schema(ledger)
+    report = ZReport(start, end)
+    today = start_of_day()
+
+    day = start_of_day(start)
+    while day < end:
+        following = next_day(day)
+        if use_rollups and day >= start and following <= min(end, today):
+            if not ledger.conn.execute(ROLLUP_EXISTS_SQL, (day,)).fetchone():
+                build_rollup(ledger, day)
+            report.merge(load_rollup(ledger, day))
+        else:
+            stream_into(report, ledger, max(start, day), min(end, following))
+        day = following
+    return report
+
+
+# **Çıktılar**
+def _period(report):
+    fmt = "%d.%m.%Y %H:%M"
+    return f"{time.strftime(fmt, time.localtime(report.start))} - {time.strftime(fmt, time.localtime(report.end))}"
+
+
+def to_text(report, width=TEXT_WIDTH):
+    """Yazdırılabilir Z raporu metni."""
+    def row(label, value):
+        return f"{label[:width - len(value) - 1]:<{width - len(value)}}{value}"
+
+    lines = ["Z RAPORU".center(width), _period(report).center(width), "-" * width,
+             row("Fiş sayısı", str(report.receipts)),
+             row("Brüt satış", f"{format_tl(report.gross)} TL"),
+             row("İndirim", f"-{format_tl(report.discount)} TL"),
+             row("Net satış", f"{format_tl(report.net)} TL"),
+             "", "ÖDEME TÜRLERİ"]
+    for method, (receipts, total) in sorted(report.payments.items()):
+        lines.append(row(f"  {method} ({receipts})", format_tl(total)))
+
+    lines += ["", "KATEGORİLER"]
+    for category, (quantity, total) in sorted(report.categories().items()):
+        lines.append(row(f"  {category or '-'} ({quantity})", format_tl(total)))
+
+    lines += ["", "ÜRÜNLER"]
+    for (_, product, size), (quantity, total) in sorted(report.products.items(), key=lambda item: -item[1][1]):
+        lines.append(row(f"  {quantity} x {product} {size} oz", format_tl(total)))
+
+    lines += ["", "SAATLİK SATIŞ"]
+    busiest = max((receipts for receipts, _ in report.hours.values()), default=0)
+    bar_width = width - 22
+    for hour in sorted(report.hours):
+        receipts, total = report.hours[hour]
+        bar = "#" * max(1, receipts * bar_width // busiest) if busiest else ""
+        lines.append(row(f"  {hour:02d} {bar}", f"{receipts:4d} {format_tl(total):>9}"))
+
+    lines += ["-" * width, f"Oluşturuldu: {time.strftime('%d.%m.%Y %H:%M')}"]
+    return "\n".join(lines) + "\n"
+
+
+def to_csv(report, out=None):
+    """Raporu `bölüm,anahtar,boyut,adet,tutar` sütunlarıyla CSV olarak yazar; `out` yoksa metin döndürür."""
+    target = out or io.StringIO()
+    writer = csv.writer(target)
+    writer.writerow(["bölüm", "anahtar", "boyut", "adet", "tutar"])
+    writer.writerow(["özet", "fiş", "", report.receipts, format_tl(report.net)])
+    writer.writerow(["özet", "brüt", "", "", format_tl(report.gross)])
+    writer.writerow(["özet", "indirim", "", "", format_tl(report.discount)])
+    for method, (receipts, total) in sorted(report.payments.items()):
+        writer.writerow(["ödeme", method, "", receipts, format_tl(total)])
+    for category, (quantity, total) in sorted(report.categories().items()):
+        writer.writerow(["kategori", category, "", quantity, format_tl(total)])
+    for (category, product, size), (quantity, total) in sorted(report.products.items()):
+        writer.writerow(["ürün", f"{category}/{product}", size, quantity, format_tl(total)])
+    for hour in sorted(report.hours):
+        receipts, total = report.hours[hour]
+        writer.writerow(["saat", f"{hour:02d}", "", receipts, format_tl(total)])
+    return None if out else target.getvalue()
+
+
+def parse_time(text):
+    """"2024-05-31" veya "2024-05-31 08:00" biçimindeki yerel zamanı zaman damgasına çevirir."""
+    for fmt in ("%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            return time.mktime(time.strptime(text, fmt))
+        except ValueError:
+            continue
+    raise argparse.ArgumentTypeError(f"geçersiz tarih: {text!r}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gün sonu / vardiya Z raporu")
+    parser.add_argument("--day", type=parse_time, help="gün (varsayılan: bugün)")
+    parser.add_argument("--from", dest="start", type=parse_time, help="aralık başı, ör. '2024-05-01' veya vardiya saati")
+    parser.add_argument("--to", dest="end", type=parse_time, help="aralık sonu (hariç)")
+    parser.add_argument("--format", choices=("text", "csv"), default="text")
+    parser.add_argument("--output", help="dosyaya yaz (varsayılan: ekrana)")
+    parser.add_argument("--print", dest="send_to_printer", action="store_true", help="metni fiş yazıcısına gönder")
+    args = parser.parse_args()
+
+    if args.start is not None:
+        start = args.start
+        end = args.end if args.end is not None else time.time()
+    else:
+        start = start_of_day(args.day)
+        end = next_day(start)
+
+    report = build_report(start, end)
+    output = to_csv(report) if args.format == "csv" else to_text(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", newline="") as f:
+            f.write(output)
+    else:
+        sys.stdout.write(output)
+
+    if args.send_to_printer:
+        from printing import get_spooler
+        done = threading.Event()
+        spooler = get_spooler()
+        spooler.submit(to_text(report).encode("utf-8"), on_done=lambda job, error: done.set())
+        done.wait()
+        spooler.stop()
+
+
+if __name__ == "__main__":
+    main()
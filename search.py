@@ -0,0 +1,177 @@
+import os
+import csv
+import logging
+import threading
+from bisect import bisect_left
+from itertools import islice
+from collections import Counter, defaultdict, namedtuple
+from catalog import product_name, get_catalog
+
+CODES_FILE = os.path.join("menu", "codes.csv")  # **kod,kategori,ürün[,boyut] (PLU kodları ve barkodlar)**
+MAX_RESULTS = 20
+
+log = logging.getLogger(__name__)
+
+# **Arama sonucu; boyut yalnızca belirli bir boyuta bağlı kodlarda doludur**
+Match = namedtuple("Match", "category product size")
+_State = namedtuple("_State", "entries heads prefixes prefix_sets grams codes sorted_codes")
+
+_FOLD = str.maketrans({"ı": "i", "\u0307": None, "ş": "s", "ç": "c", "ğ": "g", "ö": "o", "ü": "u"})
+
+
+def fold(text):
+    """Aramada kullanılan biçim: İ/I/ı/i hepsi "i" olur, diğer Türkçe harfler ASCII karşılığına iner.
+
+    `str.lower` "İ" harfini "i" ve birleşik noktaya (U+0307) çevirir; nokta atılır.
+    """
+    return text.lower().translate(_FOLD)
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def read_codes(path):
+    """`menu/codes.csv` dosyasını {kod: Match} olarak okur; (kodlar, hatalar) döndürür."""
+    codes, errors = {}, []
+    try:
+        f = open(path, "r", newline="", encoding="utf-8")
+    except FileNotFoundError:
+        return codes, errors
+
+    with f:
+        for line_no, row in enumerate(csv.reader(f), start=1):
+            if not row or row[0].startswith("#"):
+                continue
+            try:
+                code, category, product = (value.strip() for value in row[:3])
+                size = int(row[3]) if len(row) > 3 and row[3].strip() else None
+                if not code.isdigit():
+                    raise ValueError(f"kod sadece rakamlardan oluşmalı: {code!r}")
+            except ValueError as e:
+                errors.append(f"{path}:{line_no}: {e}")
+                continue
+            codes[code] = Match(category, product_name(product), size)
+    return codes, errors
+
+
+class SearchIndex:
+    """Katalogdaki tüm ürünler için önek ve trigram indeksi, artı PLU/barkod tablosu.
+
+    Her kelimenin tüm önekleri önceden indekslenir; bir tuş vuruşu birkaç
+    sözlük araması ve küme kesişimidir. Önekle sonuç çıkmazsa trigramlarla
+    yazım hatalarına dayanıklı arama yapılır. Katalog değiştiğinde indeks bir
+    sonraki aramada yeniden kurulur.
+    """
+
+    def __init__(self, catalog, codes_path=CODES_FILE):
+        self.catalog = catalog
+        self.codes_path = codes_path
+        self._state = None
+        self._lock = threading.Lock()
+        catalog.subscribe(self._on_catalog_changed)
+
+    def _on_catalog_changed(self, category, diff):
+        self._state = None
+
+    def _index(self):
+        state = self._state
+        if state is None:
+            with self._lock:
+                state = self._state
+                if state is None:
+                    state = self._state = self._build()
+        return state
+
+    def _build(self):
+        entries = [Match(category, product, None)
+                   for category in self.catalog.categories()
+                   for product in self.catalog.category(category)]
+        # **Kısa adlar önce: id sırası sıralama sırasıdır, listeler baştan okunup kesilebilir**
+        entries.sort(key=lambda entry: (len(entry.product), fold(entry.product)))
+        names = [fold(entry.product) for entry in entries]
+
+        heads, prefixes, grams = defaultdict(list), defaultdict(list), defaultdict(list)
+        for entry_id, name in enumerate(names):
+            for end in range(1, len(name) + 1):
+                heads[name[:end]].append(entry_id)
+            seen = set()
+            for word in name.split():
+                for end in range(1, len(word) + 1):
+                    if word[:end] not in seen:
+                        seen.add(word[:end])
+                        prefixes[word[:end]].append(entry_id)
+            for gram in trigrams(name):
+                grams[gram].append(entry_id)
+
+        codes, errors = read_codes(self.codes_path)
+        for error in errors:
+            log.error("Ürün kodu atlandı: %s", error)
+        for code, match in list(codes.items()):
+            if match.product not in self.catalog.category(match.category):
+                log.warning("Ürün kodu %s katalogda olmayan ürünü gösteriyor: %s", code, match.product)
+                del codes[code]
+
+        prefix_sets = {prefix: frozenset(ids) for prefix, ids in prefixes.items()}
+        return _State(entries, dict(heads), dict(prefixes), prefix_sets, dict(grams), codes, sorted(codes))
+
+    def lookup_code(self, code):
+        """PLU kodu veya barkodun tam eşleşmesini döndürür; yoksa None."""
+        return self._index().codes.get(code.strip())
+
+    def search(self, query, limit=MAX_RESULTS):
+        """Sorguya uyan ürünleri en iyi eşleşme önce olacak şekilde döndürür.
+
+        Sadece rakamlardan oluşan sorgular PLU/barkod tablosunda, diğerleri
+        ürün adlarında aranır. Adı sorguyla başlayanlar önce, sonra kelimelerinden
+        biri sorgudaki her kelimeyle başlayanlar gelir; ikisi de yoksa trigramlara bakılır.
+        """
+        query = fold(query).strip()
+        if not query:
+            return []
+        state = self._index()
+
+        if query.isdigit():
+            results = []
+            for code in islice(state.sorted_codes, bisect_left(state.sorted_codes, query), None):
+                if not code.startswith(query) or len(results) >= limit:
+                    break
+                results.append(state.codes[code])
+            return results
+
+        # **En kısa listeden başlanır, diğer kelimeler kümelerde aranır; sonuç dolunca durulur**
+        query_words = sorted(set(query.split()), key=lambda word: len(state.prefixes.get(word, ())))
+        candidates = state.prefixes.get(query_words[0], ())
+        for word in query_words[1:]:
+            candidates = filter(state.prefix_sets.get(word, frozenset()).__contains__, candidates)
+
+        ranked = list(islice(state.heads.get(query, ()), limit))
+        seen = set(ranked)
+        for entry_id in candidates:
+            if len(ranked) >= limit:
+                break
+            if entry_id not in seen:
+                ranked.append(entry_id)
+
+        if not ranked and len(query) >= 3:
+            # **Yazım hatası: trigramların en az yarısı tutan adlar**
+            query_grams = trigrams(query)
+            counts = Counter()
+            for gram in query_grams:
+                counts.update(state.grams.get(gram, ()))
+            threshold = max(2, len(query_grams) // 2)
+            ranked = [entry_id for entry_id, count in counts.most_common() if count >= threshold][:limit]
+
+        return [state.entries[entry_id] for entry_id in ranked]
+
+
+_search_index = None
+
+
+def get_search_index():
+    """Uygulama genelinde paylaşılan arama indeksini döndürür."""
+    global _search_index
+    if _search_index is None:
+        _search_index = SearchIndex(get_catalog())
+    return _search_index
@@ -0,0 +1,239 @@
+import os
+import time
+import queue
+import logging
+import importlib
+import threading
+from abc import ABC, abstractmethod
+from itertools import count
+from collections import namedtuple
+from money import format_tl
+
+CASH = "nakit"
+TENDER_TYPES = (CASH, "kart", "yemek kartı")
+SPLIT_METHOD = "bölünmüş"  # **Birden fazla ödeme türüyle kapanan fişin `receipts.payment_method` değeri**
+SIMULATOR_DELAY = 1.5  # **Saniye; simülatörün onay süresi**
+SIMULATOR_DECLINE_KURUS = 51  # **Kuruş kısmı buna eşit tutarları simülatör reddeder (ör. 100.51)**
+AUTHORIZATION_TIMEOUT = 60.0  # **Saniye; cevap vermeyen terminalin onayı bu süreden sonra beklenmez**
+
+log = logging.getLogger(__name__)
+
+# **Fişe yazılan tek ödeme: ödenen kuruş, nakitte verilen fazlanın üstü ve terminal onay kodu**
+Tender = namedtuple("Tender", "method amount change reference")
+# **Terminal cevabı; reddedilen işlemde code None, message sebebi içerir**
+Authorization = namedtuple("Authorization", "approved code message")
+
+
+class TenderError(Exception):
+    """Ödeme kalemi kabul edilemedi (ör. kalan tutardan fazla kart çekimi)."""
+
+
+class Payment:
+    """Bir fişin ödemesi; tutar nakit ve kartlara bölünebilir.
+
+    Yalnızca nakit kalan tutardan fazla olabilir, fazlası para üstüdür.
+    Ödenen toplam fiş tutarına eşit olunca ödeme tamamlanır.
+    """
+
+    def __init__(self, due):
+        self.due = due
+        self.tenders = []
+
+    def paid(self):
+        return sum(tender.amount for tender in self.tenders)
+
+    def remaining(self):
+        return self.due - self.paid()
+
+    def change(self):
+        return sum(tender.change for tender in self.tenders)
+
+    def complete(self):
+        return self.remaining() == 0
+
+    def add_cash(self, given):
+        """Verilen nakdi ekler; kalan tutarı aşan kısım para üstü olur."""
+        remaining = self.remaining()
+        if given <= 0:
+            raise TenderError("Tutar sıfırdan büyük olmalı")
+        if remaining <= 0:
+            raise TenderError("Ödeme zaten tamamlandı")
+        amount = min(given, remaining)
+        return self._add(Tender(CASH, amount, given - amount, None))
+
+    def add_card(self, method, amount, reference):
+        """Terminalden onay alınmış kart ödemesini ekler."""
+        self.check_card(amount)
+        return self._add(Tender(method, amount, 0, reference))
+
+    def check_card(self, amount):
+        """Terminale gitmeden önce tutarı doğrular; kart kalan tutardan fazla çekilemez."""
+        if amount <= 0:
+            raise TenderError("Tutar sıfırdan büyük olmalı")
+        if amount > self.remaining():
+            raise TenderError(f"Kartla en fazla kalan tutar çekilebilir ({format_tl(self.remaining())} TL)")
+
+    def _add(self, tender):
+        self.tenders.append(tender)
+        return tender
+
+    def remove(self, index):
+        """Ödeme kalemini geri alır; onaylı kart kalemi ayrıca terminalden iptal edilmelidir."""
+        return self.tenders.pop(index)
+
+    def method(self):
+        """Fişe yazılacak ödeme türü; tek tür kullanıldıysa o, yoksa "bölünmüş" (sıfır tutarlı fiş nakittir)."""
+        methods = {tender.method for tender in self.tenders}
+        if len(methods) > 1:
+            return SPLIT_METHOD
+        return methods.pop() if methods else CASH
+
+
+# **Kart terminali arka uçları**
+class CardTerminal(ABC):
+    """Kart terminali arka ucu. Çağrılar bloklayabilir; yalnızca `TerminalWorker` iş parçacığından çağrılır."""
+
+    @abstractmethod
+    def authorize(self, amount, reference):
+        """`amount` kuruşluk çekim ister ve `Authorization` döndürür; iletişim hatasında istisna fırlatır."""
+
+    @abstractmethod
+    def void(self, code):
+        """Onaylanmış çekimi iptal eder (ödeme yarıda bırakıldığında)."""
+
+
+class SimulatorTerminal(CardTerminal):
+    """Gerçek cihaz olmadan test için terminal: gecikmeyle onaylar, test tutarlarını reddeder."""
+
+    def __init__(self, delay=SIMULATOR_DELAY, decline_kurus=SIMULATOR_DECLINE_KURUS):
+        self.delay = delay
+        self.decline_kurus = decline_kurus
+        self._codes = count(1)
+
+    def authorize(self, amount, reference):
+        time.sleep(self.delay)
+        if amount % 100 == self.decline_kurus:
+            return Authorization(False, None, "Kart reddedildi (simülatör)")
+        return Authorization(True, f"SIM{next(self._codes):06d}", "Onaylandı")
+
+    def void(self, code):
+        time.sleep(self.delay / 3)
+
+
+def terminal_from_env():
+    """`POS_CARD_TERMINAL` ortam değişkenine göre kart terminali seçer.
+
+    Örnekler: "simulator", "simulator:0.2" (onay süresi), "paket.modul:Sinif"
+    (CardTerminal alt sınıfı, argümansız oluşturulur). Tanımlı değilse simülatör kullanılır.
+    """
+    spec = os.environ.get("POS_CARD_TERMINAL") or "simulator"
+    kind, _, arg = spec.partition(":")
+    if kind == "simulator":
+        return SimulatorTerminal(float(arg)) if arg else SimulatorTerminal()
+    if arg:
+        return getattr(importlib.import_module(kind), arg)()
+    raise ValueError(f"bilinmeyen kart terminali: {spec!r}")
+
+
+class TerminalRequest:
+    def __init__(self, request_id, op, amount, reference, on_done):
+        self.request_id = request_id
+        self.op = op
+        self.amount = amount
+        self.reference = reference
+        self.on_done = on_done
+        self.result = None
+        self.error = None
+        self.done = False  # **Terminal cevap verdi; artık iptal edilemez**
+        self.cancelled = False
+
+
+class TerminalWorker:
+    """Kart terminali çağrılarını arka plandaki bir iş parçacığında sırayla yapar.
+
+    `authorize` ve `void` hemen döner; sonuç `on_done(request, result, error)`
+    ile bildirilir. Geri çağırma işçi iş parçacığında çalışır; arayüz
+    güncellemeleri bir Qt sinyali üzerinden yapılmalıdır. Böylece onay
+    beklenirken olay döngüsü durmaz ve kasiyer sıradaki fişe başlayabilir.
+    Cevabı beklenmeyen çekim `cancel` ile bırakılır; terminal sonradan
+    onaylarsa çekim iptal edilir ve sonucu aynı `on_done` ile bildirilir.
+    """
+
+    def __init__(self, terminal):
+        self.terminal = terminal
+        self._queue = queue.Queue()
+        self._ids = count(1)
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="card-terminal", daemon=True)
+        self._thread.start()
+
+    def authorize(self, amount, reference, on_done=None):
+        return self._submit("authorize", amount, reference, on_done)
+
+    def void(self, code, on_done=None):
+        return self._submit("void", None, code, on_done)
+
+    def _submit(self, op, amount, reference, on_done):
+        request = TerminalRequest(next(self._ids), op, amount, reference, on_done)
+        self._queue.put(request)
+        return request
+
+    def cancel(self, request):
+        """Çekimin cevabını beklemeyi bırakır; cevap zaten geldiyse False döndürür (sonuç bildirilecek)."""
+        with self._lock:
+            if request.done:
+                return False
+            request.cancelled = True
+            return True
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def _run(self):
+        while True:
+            request = self._queue.get()
+            if request is None:
+                return
+            if request.cancelled:
+                continue  # **Sırası gelmeden iptal edildi, terminale gönderilmez**
+            self._process(request)
+
+    def _process(self, request):
+        try:
+            if request.op == "authorize":
+                request.result = self.terminal.authorize(request.amount, request.reference)
+            else:
+                request.result = self.terminal.void(request.reference)
+        except Exception as e:
+            log.warning("Kart terminali işlemi başarısız (%s %s): %s", request.op, request.reference, e)
+            request.error = e
+        with self._lock:
+            request.done = True
+            cancelled = request.cancelled
+        if cancelled:
+            # **Beklenmeyen onay hemen geri alınır; iptal sonucu çekimi isteyene bildirilir**
+            if request.result is not None and request.result.approved:
+                log.warning("İptal edilen çekim sonradan onaylandı, geri alınıyor: %s", request.result.code)
+                self._process(TerminalRequest(next(self._ids), "void", None, request.result.code, request.on_done))
+            return
+        if request.on_done is not None:
+            try:
+                request.on_done(request, request.result, request.error)
+            except Exception:
+                log.exception("Kart terminali sonucu bildirilemedi")
+
+    def stop(self):
+        """Kuyruktaki işlemler bittikten sonra iş parçacığını durdurur."""
+        self._queue.put(None)
+        self._thread.join()
+
+
+_worker = None
+
+
+def get_terminal():
+    """Uygulama genelinde paylaşılan kart terminali kuyruğunu döndürür."""
+    global _worker
+    if _worker is None:
+        _worker = TerminalWorker(terminal_from_env())
+    return _worker
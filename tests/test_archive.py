@@ -0,0 +1,83 @@
+import os
+import random
+import pytest
+import archive
+from archive import Archive
+from catalog import Catalog
+from ledger import Ledger, start_of_day
+from reports import next_day
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DAYS = 4
+
+
+@pytest.fixture
+def sales(tmp_path):
+    """Bugünden önceki günlere rastgele fişler yazılmış defter ve ondan kurulmuş arşiv."""
+    catalog = Catalog(os.path.join(ROOT, "menu"), str(tmp_path / "catalog.cache"))
+    products = [(category, product, size, price)
+                for category in catalog.categories()
+                for product, sizes in catalog.category(category).items()
+                for size, price in sizes][:6]
+    ledger = Ledger(str(tmp_path / "sales.db"), legacy_counter=None)
+    rng = random.Random(7)
+    first = start_of_day(start_of_day() - DAYS * 86400 + 3600)
+    day = first
+    for _ in range(DAYS):
+        for _ in range(40):
+            items = [rng.choice(products) for _ in range(rng.randint(1, 3))]
+            ledger.record_sale([item[1:] for item in items], categories=[item[0] for item in items],
+                               created_at=day + rng.uniform(8 * 3600, 22 * 3600))
+        day = next_day(day)
+    store = Archive(str(tmp_path / "archive"), catalog)
+    assert store.archive_ledger(ledger) == DAYS
+    yield ledger, store, products, first
+    ledger.close()
+
+
+def check_matches_ledger(ledger, store, products, first):
+    end = start_of_day()
+    middle = first + DAYS // 2 * 86400 + 12 * 3600  # **Gün ortasında başlayan aralık**
+    for _, product, size, _ in products:
+        for start in (first, middle):
+            assert store.product_sales(product, size, start, end) == tuple(ledger.product_sales(product, size, start, end))
+
+    expected = {}
+    for _, _, category, product, size, price in ledger.lines_between(first, end):
+        entry = expected.setdefault((category, product, size), [0, 0])
+        entry[0] += 1
+        entry[1] += price
+    assert store.sales_by_product(first, end) == expected
+
+
+def test_memoryview_path_matches_ledger(sales, monkeypatch):
+    monkeypatch.setattr(archive, "load_numpy", lambda: None)
+    check_matches_ledger(*sales)
+
+
+def test_numpy_path_matches_ledger(sales):
+    pytest.importorskip("numpy")
+    check_matches_ledger(*sales)
+
+
+def test_partitions_are_closed_after_each_day(sales, monkeypatch):
+    monkeypatch.setattr(archive, "load_numpy", lambda: None)
+    ledger, store, products, first = sales
+    opened = []
+    original = archive.Partition.column
+
+    def column(partition, name):
+        opened.append(partition)
+        return original(partition, name)
+
+    monkeypatch.setattr(archive.Partition, "column", column)
+    store.sales_by_product(first, start_of_day())
+    assert opened and not any(partition._maps for partition in opened)
+
+
+def test_view_held_past_close_is_reported(sales):
+    _, store, _, first = sales
+    partition, _, _ = next(store.partitions(first, start_of_day()))
+    with pytest.raises(BufferError):
+        with partition:
+            column = partition.column("price")  # noqa: F841
@@ -0,0 +1,164 @@
+import time
+import pytest
+from cart import Cart
+from campaigns import PromotionEngine, compile_rule
+from order_journal import OrderJournal
+
+
+@pytest.fixture
+def cart(tmp_path):
+    storage = OrderJournal(journal_path=str(tmp_path / "orders.journal"),
+                           snapshot_path=str(tmp_path / "orders.snapshot.json"), legacy_path=None)
+    return Cart(storage=storage, flush_delay=3600)
+
+
+def engine_for(cart, *specs, clock=lambda: 0):
+    return PromotionEngine([compile_rule(spec) for spec in specs], clock=clock).attach(cart)
+
+
+def test_bundle_prices_the_most_expensive_pair(cart):
+    engine = engine_for(cart, {"type": "bundle", "name": "Paket", "products": ["Latte", "Americano"], "price": "250"})
+    cart.add("Latte", 12, 15000)
+    assert engine.discount == 0
+    americano = cart.add("Americano", 12, 13000)
+    cart.add("Latte", 16, 17000)
+    assert engine.discount == 17000 + 13000 - 25000
+    assert engine.applied() == [("Paket", 5000)]
+
+    cart.remove(americano)
+    assert engine.discount == 0
+
+
+def test_buy_get_frees_the_cheapest(cart):
+    engine = engine_for(cart, {"type": "buy_get", "name": "3 al 2 öde", "products": ["Filter coffee"],
+                               "buy": 2, "free": 1})
+    for price in (9000, 8000, 7000, 6000):
+        cart.add("Filter coffee", 12, price)
+    assert engine.discount == 6000
+    assert engine.total() == 9000 + 8000 + 7000
+
+
+def test_size_upgrade_only_matches_size(cart):
+    engine = engine_for(cart, {"type": "size_upgrade", "name": "Büyük boy", "products": ["Latte"],
+                               "size": 16, "discount": "10.00"})
+    cart.add("Latte", 12, 15000)
+    cart.add("Latte", 16, 17000)
+    cart.add("Mocha", 16, 17000)
+    assert engine.discount == 1000
+
+
+def test_happy_hour_uses_the_time_the_line_was_added(cart):
+    noon = time.mktime((2024, 1, 1, 12, 30, 0, 0, 0, -1))
+    now = [noon]
+    engine = engine_for(cart, {"type": "happy_hour", "name": "Öğle", "products": ["Latte"], "start": "12:00",
+                               "end": "13:00", "percent": 10}, clock=lambda: now[0])
+    cart.add("Latte", 12, 10001)
+    assert engine.discount == 1000
+
+    # **Pencere kapandıktan sonra eklenen satır indirim almaz, önceki satır indirimini korur**
+    now[0] = noon + 3600
+    cart.add("Latte", 12, 10000)
+    assert engine.discount == 1000
+
+    # **Sıfırlama (fiş geçişi, yeniden bağlanma, tekrar bağlama) eklenme anını değiştirmez**
+    engine.attach(cart)
+    assert engine.discount == 1000
+
+
+def test_happy_hour_survives_ticket_switch(tmp_path):
+    from campaigns import promotions_for
+    from held_tickets import MAIN_TICKET, TicketBook
+
+    rules = tmp_path / "campaigns.json"
+    rules.write_text('[{"type": "happy_hour", "name": "Öğle", "start": "12:00", "end": "13:00", "percent": 10}]',
+                     encoding="utf-8")
+    main = Cart(storage=OrderJournal(journal_path=str(tmp_path / "orders.journal"),
+                                     snapshot_path=str(tmp_path / "orders.snapshot.json"), legacy_path=None),
+                flush_delay=3600)
+    book = TicketBook(main, directory=str(tmp_path / "tickets"))
+    noon = time.mktime((2024, 1, 1, 12, 30, 0, 0, 0, -1))
+    now = [noon]
+    key = book.open("Masa 5")
+    promotions_for(book, rules).clock = lambda: now[0]
+    book.add("Mocha", 16, 12000)
+
+    now[0] = noon + 3600
+    book.switch(MAIN_TICKET)
+    book.switch(key)
+    assert promotions_for(book, rules).discount == 1200
+
+
+def test_discounts_stack_and_never_exceed_total(cart):
+    engine = engine_for(cart,
+                        {"type": "size_upgrade", "name": "A", "products": ["Latte"], "size": 12, "discount": "100"},
+                        {"type": "size_upgrade", "name": "B", "products": ["Latte"], "size": 12, "discount": "100"})
+    cart.add("Latte", 12, 15000)
+    assert engine.discount == 20000  # **Her kural satır fiyatıyla sınırlı, toplam indirim ise sepet tutarıyla**
+    assert engine.total() == 0
+
+
+def test_clear_resets_rules(cart):
+    engine = engine_for(cart, {"type": "buy_get", "name": "2 al 1 öde", "products": ["Latte"], "buy": 1, "free": 1})
+    cart.add("Latte", 12, 100)
+    cart.add("Latte", 12, 100)
+    assert engine.discount == 100
+    cart.clear()
+    assert engine.discount == 0
+    assert engine.applied() == []
+
+
+@pytest.mark.parametrize("spec", [
+    {"type": "bundle", "name": "x", "products": [], "price": "10"},
+    {"type": "bundle", "name": "x", "products": ["Latte"], "price": "1e2"},
+    {"type": "happy_hour", "name": "x", "start": "10:00", "end": "11:00", "percent": 0},
+    {"type": "buy_get", "name": "x", "buy": 0, "free": 1},
+    {"type": "nope", "name": "x"},
+    {"name": "x"},
+])
+def test_invalid_rules_are_rejected(spec):
+    with pytest.raises(ValueError):
+        compile_rule(spec)
+
+
+def test_each_ticket_shares_one_engine_that_goes_away_with_it(tmp_path):
+    import gc
+    import weakref
+    from campaigns import promotions_for
+    from held_tickets import MAIN_TICKET, TicketBook
+
+    rules = tmp_path / "campaigns.json"
+    rules.write_text('[{"type": "buy_get", "name": "2 al 1 öde", "products": ["Latte"], "buy": 1, "free": 1}]',
+                     encoding="utf-8")
+    main = Cart(storage=OrderJournal(journal_path=str(tmp_path / "orders.journal"),
+                                     snapshot_path=str(tmp_path / "orders.snapshot.json"), legacy_path=None),
+                flush_delay=3600)
+    book = TicketBook(main, directory=str(tmp_path / "tickets"))
+    main_engine = promotions_for(book, rules)
+    key = book.open("Masa 3")
+    engine = promotions_for(book, rules)
+    assert engine is not main_engine
+    assert engine is promotions_for(book.current(), rules)
+
+    book.add("Latte", 12, 100)
+    book.add("Latte", 12, 100)
+    book.switch(MAIN_TICKET)
+    assert promotions_for(book, rules) is main_engine and main_engine.discount == 0
+    book.switch(key)
+    assert promotions_for(book, rules).discount == 100
+
+    collected = weakref.ref(engine)
+    del engine
+    book.close(key)
+    gc.collect()
+    assert collected() is None
+
+
+def test_rule_without_overrides_fails_when_built():
+    from campaigns import Rule
+
+    class Incomplete(Rule):
+        def add(self, line_id, line, now):
+            pass
+
+    with pytest.raises(TypeError):
+        Incomplete("eksik")
@@ -0,0 +1,82 @@
+import os
+import catalog
+from catalog import Catalog, MenuDiff, diff_products
+
+
+def write(menu, name, text, mtime_ns):
+    path = menu / f"{name}.txt"
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))  # **Aynı saniyedeki yazımlar da değişiklik olarak görülsün**
+
+
+def load(tmp_path):
+    menu = tmp_path / "menu"
+    menu.mkdir(exist_ok=True)
+    return menu, lambda: Catalog(str(menu), str(tmp_path / "catalog.cache"))
+
+
+def test_refresh_reports_added_removed_and_changed_products(tmp_path):
+    menu, open_catalog = load(tmp_path)
+    write(menu, "sıcak", "latte,12,90\nmocha,12,100\nçay,8,20\n", 1_000_000_000)
+    menu_catalog = open_catalog()
+    seen = []
+    menu_catalog.subscribe(lambda category, diff: seen.append((category, diff)))
+
+    write(menu, "sıcak", "latte,12,95\nçay,8,20\nsahlep,12,110\n", 2_000_000_000)
+    diff = MenuDiff(["Sahlep"], ["Mocha"], ["Latte"])
+    assert menu_catalog.refresh() == {"sıcak": diff}
+    assert seen == [("sıcak", diff)]
+    assert menu_catalog.price("sıcak", "Latte", 12) == 9500
+    assert list(menu_catalog.category("sıcak")) == ["Latte", "Çay", "Sahlep"]
+
+
+def test_unchanged_content_with_new_timestamp_is_not_reparsed(tmp_path, monkeypatch):
+    menu, open_catalog = load(tmp_path)
+    write(menu, "sıcak", "latte,12,90\n", 1_000_000_000)
+    menu_catalog = open_catalog()
+    view = menu_catalog.category("sıcak")
+
+    parsed = []
+    monkeypatch.setattr(catalog, "parse_menu_file", lambda path: parsed.append(path))
+    write(menu, "sıcak", "latte,12,90\n", 2_000_000_000)
+    assert menu_catalog.refresh() == {}
+    assert menu_catalog.refresh() == {}  # **Yeni zaman damgası kaydedildi, dosya tekrar okunmaz**
+    assert parsed == [] and menu_catalog.category("sıcak") is view
+
+
+def test_new_and_deleted_files_are_categories(tmp_path):
+    menu, open_catalog = load(tmp_path)
+    write(menu, "sıcak", "latte,12,90\n", 1_000_000_000)
+    menu_catalog = open_catalog()
+
+    write(menu, "tatlı", "kurabiye,1,40\n", 2_000_000_000)
+    assert menu_catalog.refresh() == {"tatlı": MenuDiff(["Kurabiye"], [], [])}
+    os.remove(menu / "sıcak.txt")
+    assert menu_catalog.refresh() == {"sıcak": MenuDiff([], ["Latte"], [])}
+    assert menu_catalog.categories() == ["tatlı"] and "sıcak" not in menu_catalog
+
+
+def test_cache_is_reused_until_a_file_changes(tmp_path, monkeypatch):
+    menu, open_catalog = load(tmp_path)
+    write(menu, "sıcak", "latte,12,90\n", 1_000_000_000)
+    write(menu, "tatlı", "kurabiye,1,40\nbozuk satır\n", 1_000_000_000)
+    first = open_catalog()
+    assert len(first.errors) == 1
+
+    parsed = []
+    original = catalog.parse_menu_file
+    monkeypatch.setattr(catalog, "parse_menu_file", lambda path: parsed.append(path) or original(path))
+    second = open_catalog()
+    assert parsed == [] and second.errors == first.errors
+    assert second.category("sıcak") == first.category("sıcak")
+
+    write(menu, "sıcak", "latte,12,95\n", 2_000_000_000)
+    third = open_catalog()
+    assert parsed == [str(menu / "sıcak.txt")]
+    assert third.price("sıcak", "Latte", 12) == 9500
+
+
+def test_diff_products_keeps_menu_order():
+    old = {"Latte": [(12, 9000)], "Mocha": [(12, 10000)]}
+    new = {"Çay": [(8, 2000)], "Latte": [(12, 9500)], "Sahlep": [(12, 11000)]}
+    assert diff_products(old, new) == MenuDiff(["Çay", "Sahlep"], ["Mocha"], ["Latte"])
@@ -0,0 +1,65 @@
+from cart import Cart
+from held_tickets import MAIN_TICKET, TicketBook
+from order_journal import OrderJournal
+
+
+def make_book(tmp_path):
+    main = Cart(storage=OrderJournal(journal_path=str(tmp_path / "orders.journal"),
+                                     snapshot_path=str(tmp_path / "orders.snapshot.json"), legacy_path=None),
+                flush_delay=3600)
+    return TicketBook(main, directory=str(tmp_path / "tickets"))
+
+
+def test_tickets_keep_their_own_lines(tmp_path):
+    book = make_book(tmp_path)
+    book.add("Latte", 12, 10000)
+    key = book.open("Masa 4")
+    assert book.active == key
+    book.add("Mocha", 16, 12000)
+    assert book.lines() == [("Mocha", 16, 12000)]
+
+    book.switch(MAIN_TICKET)
+    assert book.lines() == [("Latte", 12, 10000)]
+    assert book.name(key) == "Masa 4"
+    assert [k for k, *_ in book.tickets()] == [MAIN_TICKET, key]
+
+
+def test_switch_notifies_reset(tmp_path):
+    book = make_book(tmp_path)
+    key = book.open("Masa 1")
+    book.add("Mocha", 16, 12000)
+    book.switch(MAIN_TICKET)
+    events = []
+    book.subscribe(lambda event, *args: events.append(event))
+    book.switch(key)
+    assert events == ["reset"]
+
+
+def test_empty_held_ticket_is_closed_on_switch(tmp_path):
+    book = make_book(tmp_path)
+    key = book.open("Boş")
+    book.switch(MAIN_TICKET)
+    assert key not in [k for k, *_ in book.tickets()]
+
+
+def test_held_tickets_survive_restart(tmp_path):
+    book = make_book(tmp_path)
+    key = book.open("Masa 7")
+    book.add("Latte", 12, 10000)
+    book.switch(MAIN_TICKET)
+    book.flush()
+
+    reopened = make_book(tmp_path)
+    assert reopened.name(key) == "Masa 7"
+    reopened.switch(key)
+    assert reopened.lines() == [("Latte", 12, 10000)]
+
+
+def test_close_drops_ticket(tmp_path):
+    book = make_book(tmp_path)
+    key = book.open("Masa 2")
+    book.add("Latte", 12, 10000)
+    book.close(key)
+    assert book.active == MAIN_TICKET
+    assert key not in [k for k, *_ in book.tickets()]
+    assert book.lines() == []
@@ -0,0 +1,101 @@
+import pytest
+from catalog import Catalog
+from hotkeys import SCAN_GAP, Entry, HotkeyTable, KeyEntry, Sku
+
+BARCODE = "8690000000017"
+LATTE = Sku("sıcak", "Latte", 12, 9000)
+COOKIE = Sku("tatlı", "Kurabiye", 1, 4500)
+
+
+@pytest.fixture
+def table(tmp_path):
+    menu = tmp_path / "menu"
+    menu.mkdir()
+    (menu / "sıcak.txt").write_text("latte,12,90\nmocha,12,100\n", encoding="utf-8")
+    (menu / "tatlı.txt").write_text("kurabiye,1,45\n", encoding="utf-8")
+    (menu / "hotkeys.csv").write_text("F1,sıcak,latte,12\nF2,sıcak,mocha,16\n5,sıcak,latte,12\n", encoding="utf-8")
+    (menu / "codes.csv").write_text(f"101,sıcak,latte,12\n102,sıcak,mocha\n{BARCODE},tatlı,kurabiye,1\n",
+                                    encoding="utf-8")
+    catalog = Catalog(str(menu), str(tmp_path / "catalog.cache"))
+    return HotkeyTable(catalog, hotkeys_path=str(menu / "hotkeys.csv"), codes_path=str(menu / "codes.csv"))
+
+
+def typed(entry, text, start, gap):
+    """`text` rakamlarını `start` anından başlayarak `gap` aralıklarla yazar; son rakamın anını döndürür."""
+    now = start
+    for index, char in enumerate(text):
+        now = start + index * gap
+        entry.digit(char, now=now)
+    return now
+
+
+def test_table_skips_unknown_sizes_and_reserved_keys(table):
+    assert table.key("F1") == LATTE
+    assert table.key("F2") is None  # **Katalogda 16 oz mocha yok**
+    assert table.key("5") is None  # **Rakamlar adet için ayrılmış**
+    assert table.code("101") == LATTE and table.code(BARCODE) == COOKIE
+    assert table.code("102") is None  # **Boyutu olmayan kod aramaya kalır**
+    assert len(table) == 1
+
+
+def test_scanner_burst_after_typed_digits_is_barcode_with_quantity(table):
+    entry = KeyEntry(table)
+    now = typed(entry, "3", 10.0, 0.5)
+    now = typed(entry, BARCODE, now + 1.0, SCAN_GAP / 3)
+    assert entry.enter(now=now + SCAN_GAP / 3) == Entry(BARCODE, COOKIE, 3)
+    assert not entry.pending()
+
+
+def test_slowly_typed_code_is_not_split(table):
+    entry = KeyEntry(table)
+    now = typed(entry, "3101", 10.0, 0.2)
+    assert entry.enter(now=now + 0.2) == Entry("3101", None, 1)
+
+
+def test_short_fast_sequence_is_a_typed_plu(table):
+    entry = KeyEntry(table)
+    now = typed(entry, "2", 10.0, 0.5)
+    now = typed(entry, "101", now + 1.0, SCAN_GAP / 3)
+    assert entry.enter(now=now + SCAN_GAP / 3) == Entry("2101", None, 1)
+
+
+def test_scan_without_prefix_is_one_item(table):
+    entry = KeyEntry(table)
+    now = typed(entry, BARCODE, 10.0, SCAN_GAP / 3)
+    assert entry.enter(now=now + SCAN_GAP / 3) == Entry(BARCODE, COOKIE, 1)
+
+
+def test_enter_after_a_pause_reads_the_whole_buffer(table):
+    entry = KeyEntry(table)
+    now = typed(entry, "4", 10.0, 0.5)
+    now = typed(entry, BARCODE, now + 1.0, SCAN_GAP / 3)
+    # **Okuyucu Enter'ı da aynı hızda gönderir; beklemeden sonra gelen Enter elle basılmıştır**
+    assert entry.enter(now=now + 1.0) == Entry("4" + BARCODE, None, 1)
+
+
+def test_explicit_quantity_wins_over_burst(table):
+    entry = KeyEntry(table)
+    typed(entry, "2", 10.0, 0.5)
+    entry.times()
+    now = typed(entry, BARCODE, 12.0, SCAN_GAP / 3)
+    assert entry.text() == f"2 × {BARCODE}"
+    assert entry.enter(now=now) == Entry(BARCODE, COOKIE, 2)
+
+
+def test_hotkey_uses_buffer_as_quantity(table):
+    entry = KeyEntry(table, clock=lambda: 0.0)
+    entry.digit("3")
+    assert entry.hotkey("F9") is None and entry.pending()
+    assert entry.hotkey("F1") == (LATTE, 3)
+    assert entry.hotkey("F1") == (LATTE, 1)
+
+
+def test_backspace_and_empty_enter(table):
+    entry = KeyEntry(table, clock=lambda: 0.0)
+    assert entry.enter() is None
+    entry.digit("1")
+    entry.times()
+    entry.digit("7")
+    entry.backspace()
+    entry.backspace()
+    assert entry.text() == "" and not entry.pending()
@@ -0,0 +1,106 @@
+import pytest
+from cart import Cart
+from campaigns import PromotionEngine
+from catalog import Catalog
+from checkout import PosSession
+from inventory import LOW, OUT, Inventory, read_recipes
+from ledger import Ledger
+from order_journal import OrderJournal
+
+RECIPES = """\
+# ürün,boyut,malzeme,miktar
+latte,,espresso,1
+latte,12,süt,200
+latte,16,süt,300
+mocha,,espresso,2
+mocha,,çikolata,1
+bozuk,12,süt,-5
+"""
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    ledger = Ledger(str(tmp_path / "sales.db"), legacy_counter=None)
+    yield ledger
+    ledger.close()
+
+
+@pytest.fixture
+def recipes(tmp_path):
+    path = tmp_path / "recipes.csv"
+    path.write_text(RECIPES, encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def inventory(ledger, recipes):
+    inventory = Inventory(ledger, recipes_path=recipes)
+    inventory.set_level("espresso", 10, low_threshold=3)
+    inventory.set_level("süt", 1000, low_threshold=400)
+    inventory.set_level("Kurabiye", 2, low_threshold=1)
+    return inventory
+
+
+def test_recipes_merge_sizeless_rows_and_skip_bad_lines(recipes):
+    parsed, errors = read_recipes(recipes)
+    assert parsed[("Latte", None)] == {"espresso": 1}
+    assert parsed[("Latte", 12)] == {"süt": 200}
+    assert parsed[("Mocha", None)] == {"espresso": 2, "çikolata": 1}
+    assert len(errors) == 1 and ("Bozuk", 12) not in parsed
+
+
+def test_consumption_counts_only_tracked_items(inventory):
+    lines = [("Latte", 12, 9000), ("Latte", 16, 10000), ("Mocha", 12, 10000), ("Kurabiye", 1, 4500), ("Çay", 8, 2000)]
+    # **Çikolata ve çay takip edilmiyor; reçetesiz kurabiye kendi kalemini tüketir**
+    assert inventory.consumption(lines) == {"espresso": 4, "süt": 500, "Kurabiye": 1}
+
+
+def test_thresholds_mark_products_low_then_out(inventory):
+    changes = []
+    inventory.subscribe(changes.append)
+
+    inventory.applied({"süt": 600})
+    assert changes == [{"Latte": LOW}]
+    assert inventory.product_state("Latte") == LOW and inventory.product_state("Mocha") is None
+
+    inventory.applied({"espresso": 10})
+    assert changes[-1] == {"Latte": OUT, "Mocha": OUT}
+    inventory.applied({"espresso": 0})
+    assert len(changes) == 2  # **Durumu değişmeyen ürün bildirilmez**
+
+    inventory.restock("espresso", 5)
+    assert changes[-1] == {"Latte": LOW, "Mocha": None}
+    assert inventory.low_products() == {"Latte": LOW}
+
+
+def test_untracked_items_and_restock_of_unknown_item(inventory):
+    with pytest.raises(KeyError):
+        inventory.restock("çikolata", 3)
+    inventory.set_level("Kurabiye", 0)
+    assert inventory.product_state("Kurabiye") == OUT
+    assert inventory.levels()[0] == ("Kurabiye", 0, 1)  # **Eşik verilmezse eskisi korunur**
+    inventory.untrack("Kurabiye")
+    assert inventory.level("Kurabiye") is None and inventory.product_state("Kurabiye") is None
+
+
+def test_checkout_decrements_stock_with_the_receipt(tmp_path, ledger, recipes, inventory, monkeypatch):
+    monkeypatch.delenv("POS_OUTBOX", raising=False)
+    monkeypatch.delenv("POS_PRODUCTION", raising=False)
+    menu = tmp_path / "menu"
+    menu.mkdir()
+    (menu / "sıcak.txt").write_text("latte,12,90\nmocha,12,100\n", encoding="utf-8")
+    catalog = Catalog(str(menu), str(tmp_path / "catalog.cache"))
+    cart = Cart(storage=OrderJournal(journal_path=str(tmp_path / "orders.journal"),
+                                     snapshot_path=str(tmp_path / "orders.snapshot.json"), legacy_path=None),
+                flush_delay=3600)
+    session = PosSession(cart=cart, catalog=catalog, ledger=ledger, promotions=PromotionEngine([]).attach(cart),
+                         inventory=inventory)
+    session.add_item("sıcak", "Latte", 12)
+    session.add_item("sıcak", "Mocha", 12)
+    session.checkout()
+
+    assert inventory.level("espresso") == 7 and inventory.level("süt") == 800
+    # **Defterdeki stok aynı işlemde düşülmüş; yeniden açılan takip aynı seviyeleri okur**
+    reopened = Inventory(ledger, recipes_path=recipes)
+    assert reopened.levels() == inventory.levels()
+    assert reopened.product_state("Latte") is None
@@ -0,0 +1,33 @@
+import pytest
+from money import parse_price, to_kurus, format_tl
+
+
+@pytest.mark.parametrize("text, kurus", [
+    ("172.55", 17255),
+    ("12", 1200),
+    ("3.5", 350),
+    (" 0.05 ", 5),
+    ("0", 0),
+])
+def test_parse_price(text, kurus):
+    assert parse_price(text) == kurus
+
+
+@pytest.mark.parametrize("text", ["1e27", "1e2", "1.005", "-5", "nan", "inf", "1_000", "", "abc", "١٢", "+5", "1,5"])
+def test_parse_price_rejects(text):
+    with pytest.raises(ValueError):
+        parse_price(text)
+
+
+def test_to_kurus_rounds_legacy_floats():
+    assert to_kurus(172.55) == 17255
+    assert to_kurus(0.1 + 0.2) == 30
+    assert to_kurus(1200) == 1200
+    with pytest.raises(ValueError):
+        to_kurus(float("nan"))
+
+
+def test_format_tl():
+    assert format_tl(17255) == "172.55"
+    assert format_tl(5) == "0.05"
+    assert format_tl(-150) == "-1.50"
@@ -0,0 +1,74 @@
+import os
+from cart import Cart
+from order_journal import OrderJournal
+
+
+def make_journal(tmp_path, compact_every=500):
+    return OrderJournal(journal_path=str(tmp_path / "orders.journal"),
+                        snapshot_path=str(tmp_path / "orders.snapshot.json"),
+                        legacy_path=None, compact_every=compact_every)
+
+
+def make_cart(tmp_path):
+    return Cart(storage=make_journal(tmp_path), flush_delay=3600)
+
+
+def test_replays_journal_over_snapshot(tmp_path):
+    cart = make_cart(tmp_path)
+    latte = cart.add("Latte", 12, 10000)
+    cart.add("Mocha", 16, 12000)
+    cart.remove(latte)
+    cart.flush()
+    cart.storage.close()
+
+    reopened = make_cart(tmp_path)
+    assert reopened.lines() == [("Mocha", 16, 12000)]
+    assert reopened.total() == 12000
+
+
+def test_torn_tail_is_cut_and_kept_aside(tmp_path):
+    cart = make_cart(tmp_path)
+    cart.add("Latte", 12, 10000)
+    cart.add("Mocha", 16, 12000)
+    cart.flush()
+    cart.storage.close()
+
+    journal = tmp_path / "orders.journal"
+    good_size = os.path.getsize(journal)
+    with open(journal, "ab") as f:
+        f.write(b'{"seq": 3, "op": "add", "id": 3, "line": ["Lat')  # **Çökme anında yarım kalan kayıt**
+
+    reopened = make_cart(tmp_path)
+    assert reopened.lines() == [("Latte", 12, 10000), ("Mocha", 16, 12000)]
+    assert os.path.getsize(journal) == good_size
+    assert (tmp_path / "orders.journal.corrupt").read_bytes().startswith(b'{"seq": 3')
+
+    # **Kesilen kuyruktan sonra yazılan kayıtlar da okunur**
+    reopened.add("Americano", 12, 9000)
+    reopened.flush()
+    reopened.storage.close()
+    assert len(make_cart(tmp_path)) == 3
+
+
+def test_corrupt_record_stops_replay(tmp_path):
+    cart = make_cart(tmp_path)
+    cart.add("Latte", 12, 10000)
+    cart.flush()
+    cart.storage.close()
+    with open(tmp_path / "orders.journal", "ab") as f:
+        f.write(b"not json\n")
+        f.write(b'{"seq": 9, "op": "clear"}\n')
+
+    assert make_cart(tmp_path).lines() == [("Latte", 12, 10000)]
+
+
+def test_compaction_keeps_contents(tmp_path):
+    cart = Cart(storage=make_journal(tmp_path, compact_every=3), flush_delay=3600)
+    for price in range(1, 8):
+        cart.add("Latte", 12, price)
+        cart.flush()
+    cart.storage.close()
+
+    assert os.path.getsize(tmp_path / "orders.journal") < 200
+    reopened = make_cart(tmp_path)
+    assert [price for _, _, price in reopened.lines()] == list(range(1, 8))
@@ -0,0 +1,152 @@
+import time
+import asyncio
+import threading
+import pytest
+from order_service import OrderService, RemoteCart
+
+
+class ServiceThread:
+    """OrderService'i ayrı bir olay döngüsünde unix soketi üzerinden çalıştırır; durdurulup yeniden açılabilir."""
+
+    def __init__(self, data_dir, path):
+        self.service = OrderService(str(data_dir))
+        self.address = f"unix:{path}"
+        self.path = str(path)
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self.server = None
+        self.writers = set()
+
+    async def _handle(self, reader, writer):
+        self.writers.add(writer)
+        try:
+            await self.service.handle(reader, writer)
+        finally:
+            self.writers.discard(writer)
+
+    def start(self):
+        self.server = self._call(asyncio.start_unix_server(self._handle, self.path))
+
+    def stop(self):
+        async def stop():
+            self.server.close()
+            for writer in list(self.writers):
+                writer.transport.abort()
+            await self.server.wait_closed()
+            while self.writers:
+                await asyncio.sleep(0.01)
+        self._call(stop())
+        self.server = None
+
+    def _call(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(5)
+
+    def lines(self, ticket):
+        return self._call(self._lines(ticket))
+
+    async def _lines(self, ticket):
+        return sorted(self.service.cart(ticket).items())
+
+    def close(self):
+        if self.server is not None:
+            self.stop()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(5)
+        self.loop.close()
+        self.service.flush()
+
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+@pytest.fixture
+def server(tmp_path):
+    server = ServiceThread(tmp_path / "carts", tmp_path / "pos.sock")
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def clients():
+    opened = []
+
+    def connect(address, ticket="k1"):
+        client = RemoteCart(address, ticket, timeout=2.0, retry_delay=0.02)
+        opened.append(client)
+        return client
+
+    yield connect
+    for client in opened:
+        client.close()
+
+
+def test_changes_made_offline_are_replayed_on_connect(server, clients):
+    cart = clients(server.address)
+    latte = cart.add("Latte", 12, 9000)
+    mocha = cart.add("Mocha", 16, 11000)
+    cart.remove(latte)
+    assert cart.synced is False and cart.lines() == [("Mocha", 16, 11000)]
+
+    server.start()
+    assert wait_until(lambda: cart.synced)
+    cart.flush()
+    assert server.lines("k1") == [(mocha, ("Mocha", 16, 11000))]
+
+
+def test_replay_keeps_lines_added_by_other_registers(server, clients):
+    server.start()
+    other = clients(server.address)
+    assert wait_until(lambda: other.synced)
+    other.add("Çay", 8, 2000)
+    other.flush()
+
+    server.stop()
+    cart = clients(server.address)
+    cart.add("Latte", 12, 9000)
+    server.start()
+    assert wait_until(lambda: cart.synced and len(cart) == 2)
+    cart.flush()
+    assert sorted(line for _, line in server.lines("k1")) == [("Latte", 12, 9000), ("Çay", 8, 2000)]
+
+
+def test_reconnect_resyncs_and_sends_pending_changes(server, clients):
+    server.start()
+    cart, other = clients(server.address), clients(server.address)
+    assert wait_until(lambda: cart.synced and other.synced)
+    latte = cart.add("Latte", 12, 9000)
+    assert wait_until(lambda: latte in other)
+
+    events = []
+    cart.subscribe(lambda event, line_id, line: events.append(event))
+    server.stop()
+    cart.remove(latte)
+    cart.add("Mocha", 16, 11000)
+    server.start()
+
+    assert wait_until(lambda: "reset" in events)
+    cart.flush()
+    assert wait_until(lambda: other.lines() == [("Mocha", 16, 11000)])
+    assert [line for _, line in server.lines("k1")] == [("Mocha", 16, 11000)]
+    assert cart.lines() == other.lines()
+
+
+def test_remote_changes_reach_subscribers(server, clients):
+    server.start()
+    cart, other = clients(server.address), clients(server.address)
+    assert wait_until(lambda: cart.synced and other.synced)
+    events = []
+    cart.subscribe(lambda event, line_id, line: events.append((event, line_id, line)))
+
+    line_id = other.add("Latte", 12, 9000)
+    assert wait_until(lambda: events)
+    assert events == [("add", line_id, ("Latte", 12, 9000))]
+    other.clear()  # **Servise görülen satırların tek tek silinmesi olarak işlenir**
+    assert wait_until(lambda: not cart.lines())
+    assert events[1:] == [("remove", line_id, ("Latte", 12, 9000))]
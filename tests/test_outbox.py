@@ -0,0 +1,132 @@
+import gzip
+import os
+import json
+import time
+import pytest
+from outbox import Outbox, PermanentError, Sink
+
+
+class RecordingSink(Sink):
+    def __init__(self, fail=None):
+        self.keys = []
+        self.records = []
+        self.fail = fail
+
+    def send(self, data, key):
+        if self.fail is not None:
+            raise self.fail
+        self.keys.append(key)
+        self.records.extend(json.loads(line) for line in gzip.decompress(data).splitlines())
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            pytest.fail("zaman aşımı")
+        time.sleep(0.01)
+
+
+def make_outbox(tmp_path, sink):
+    return Outbox(sink, directory=str(tmp_path / "outbox"), terminal="k1", batch_size=1000,
+                  flush_interval=3600, retry_delay=3600)
+
+
+def send_receipts(outbox, sink, *receipts):
+    for receipt in receipts:
+        outbox.submit({"receipt": receipt})
+        outbox.flush()
+    wait_for(lambda: outbox.pending()[0] == 0)
+
+
+def test_keys_are_sequential_per_terminal(tmp_path):
+    sink = RecordingSink()
+    outbox = make_outbox(tmp_path, sink)
+    send_receipts(outbox, sink, 1, 2)
+    outbox.stop()
+    assert sink.keys == ["k1-00000001", "k1-00000002"]
+    assert sink.records == [{"receipt": 1, "terminal": "k1"}, {"receipt": 2, "terminal": "k1"}]
+
+
+def test_keys_are_not_reused_after_drain_and_restart(tmp_path):
+    sink = RecordingSink()
+    outbox = make_outbox(tmp_path, sink)
+    send_receipts(outbox, sink, 1)
+    outbox.stop()
+
+    outbox = make_outbox(tmp_path, sink)
+    send_receipts(outbox, sink, 2)
+    outbox.stop()
+    assert sink.keys == ["k1-00000001", "k1-00000002"]
+
+
+def test_unsent_records_survive_restart(tmp_path):
+    outbox = make_outbox(tmp_path, RecordingSink(fail=OSError("ağ yok")))
+    outbox.submit({"receipt": 1})
+    outbox.stop()
+
+    sink = RecordingSink()
+    outbox = make_outbox(tmp_path, sink)
+    assert outbox.pending()[2] == 1
+    outbox.flush()
+    wait_for(lambda: sink.keys)
+    outbox.stop()
+    assert sink.keys == ["k1-00000001"]
+
+
+def test_rejected_chunk_is_moved_aside(tmp_path):
+    sink = RecordingSink(fail=PermanentError("geçersiz"))
+    outbox = make_outbox(tmp_path, sink)
+    outbox.submit({"receipt": 1})
+    outbox.flush()
+    wait_for(lambda: outbox.pending()[0] == 0)
+    outbox.stop()
+    assert (tmp_path / "outbox" / "failed" / "k1-00000001.ndjson.gz").exists()
+
+
+def test_chunk_deleted_while_being_rejected_keeps_worker_alive(tmp_path):
+    class DeletingSink(RecordingSink):
+        def send(self, data, key):
+            if not self.keys:
+                self.keys.append(key)
+                os.remove(tmp_path / "outbox" / f"{key}.ndjson.gz")  # **Disk sınırı aynı anda sildi**
+                raise PermanentError("geçersiz")
+            super().send(data, key)
+
+    sink = DeletingSink()
+    outbox = make_outbox(tmp_path, sink)
+    send_receipts(outbox, sink, 1)
+    send_receipts(outbox, sink, 2)
+    outbox.stop()
+    assert sink.keys == ["k1-00000001", "k1-00000002"]
+
+
+def test_seal_error_keeps_records_and_worker_alive(tmp_path, monkeypatch):
+    sink = RecordingSink()
+    outbox = Outbox(sink, directory=str(tmp_path / "outbox"), terminal="k1", batch_size=1,
+                    flush_interval=3600, retry_delay=3600)
+    write_seq = outbox._write_seq
+    failures = []
+
+    def full_disk(seq):
+        if not failures:
+            failures.append(seq)
+            raise OSError(28, "No space left on device")
+        write_seq(seq)
+
+    monkeypatch.setattr(outbox, "_write_seq", full_disk)
+    outbox.submit({"receipt": 1})
+    wait_for(lambda: failures)
+    outbox.submit({"receipt": 2})
+    wait_for(lambda: len(sink.records) == 2)
+    outbox.stop()
+    assert [record["receipt"] for record in sink.records] == [1, 2]
+    assert sink.keys == ["k1-00000001"]
+
+
+def test_sink_without_send_fails_when_built():
+    class Incomplete(Sink):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
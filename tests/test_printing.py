@@ -0,0 +1,53 @@
+import pytest
+from printing import FileBackend, PrinterBackend, PrintSpooler, render_receipt
+
+
+class FlakyBackend(PrinterBackend):
+    def __init__(self, failures):
+        self.failures = failures
+        self.printed = []
+
+    def send(self, data):
+        if self.failures:
+            self.failures -= 1
+            raise OSError("kağıt yok")
+        self.printed.append(data)
+
+
+def test_backend_without_send_fails_when_built():
+    class Incomplete(PrinterBackend):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_spooler_retries_then_reports():
+    backend = FlakyBackend(failures=2)
+    spooler = PrintSpooler(backend, max_attempts=3, retry_delay=0)
+    results = []
+    job = spooler.submit(b"fis", on_done=lambda job, error: results.append(error))
+    spooler.stop()
+    assert backend.printed == [b"fis"]
+    assert job.attempts == 3 and results == [None]
+
+
+def test_spooler_gives_up_after_max_attempts():
+    spooler = PrintSpooler(FlakyBackend(failures=5), max_attempts=2, retry_delay=0)
+    results = []
+    spooler.submit(b"fis", on_done=lambda job, error: results.append(error))
+    spooler.stop()
+    assert len(results) == 1 and isinstance(results[0], OSError)
+
+
+def test_receipt_folds_lines_and_lists_payments(tmp_path):
+    data = render_receipt([("Latte", 12, 10000), ("Latte", 12, 10000)], 18000, receipt_no=7,
+                          discounts=[("Paket", 2000)], payments=[("nakit", 18000, 2000, None)])
+    text = data.decode("utf-8")
+    assert "Latte (12 oz) x2 - 200.00 TL" in text
+    assert "Paket: -20.00 TL" in text
+    assert "nakit: 200.00 TL" in text and "Para üstü: 20.00 TL" in text
+
+    backend = FileBackend(str(tmp_path))
+    backend.send(data)
+    assert [path.read_bytes() for path in tmp_path.iterdir()] == [data]
@@ -0,0 +1,75 @@
+import production
+from production import ProductionClient, ProductionHub
+
+
+class FakeTransport:
+    def __init__(self, buffered=0):
+        self.buffered = buffered
+        self.aborted = False
+
+    def get_write_buffer_size(self):
+        return self.buffered
+
+    def abort(self):
+        self.aborted = True
+
+
+class FakeWriter:
+    def __init__(self, buffered=0):
+        self.transport = FakeTransport(buffered)
+        self.data = []
+
+    def write(self, data):
+        self.data.append(data)
+
+
+def order(*item_ids):
+    return {"op": "publish", "message": {"event": "order", "items": [
+        {"id": item_id, "station": "bar", "product": "Latte", "size": 12, "at": 0} for item_id in item_ids]}}
+
+
+def void(*item_ids):
+    return {"op": "publish", "message": {"event": "void", "items": list(item_ids)}}
+
+
+def offline_client():
+    return ProductionClient("unix:/nonexistent/production.sock", "k1")
+
+
+def test_void_of_unsent_item_cancels_it_in_the_queue():
+    client, pending = offline_client(), []
+    client._hold(pending, order("a", "b"))
+    client._hold(pending, void("b", "x"))
+    assert pending == [order("a"), void("x")]
+
+    client._hold(pending, void("a"))
+    assert pending == [void("x")]
+
+
+def test_overflow_drops_orders_before_voids(monkeypatch):
+    monkeypatch.setattr(production, "MAX_PENDING", 2)
+    client, pending = offline_client(), []
+    client._hold(pending, void("sent-earlier"))
+    client._hold(pending, order("a"))
+    client._hold(pending, order("b"))
+    assert pending == [void("sent-earlier"), order("b")]
+    assert client.dropped_messages == 1
+
+
+def test_hub_drops_stalled_display(tmp_path):
+    hub = ProductionHub(str(tmp_path / "production.journal"))
+    reading, stalled = FakeWriter(), FakeWriter(buffered=production.SUBSCRIBER_BUFFER + 1)
+    hub.subscribers = {reading: None, stalled: frozenset(["bar"])}
+    hub.publish(order("a")["message"])
+    assert len(reading.data) == 1
+    assert stalled.transport.aborted and stalled not in hub.subscribers
+    assert stalled.data == []
+
+
+def test_hub_replays_open_items_after_restart(tmp_path):
+    path = str(tmp_path / "production.journal")
+    hub = ProductionHub(path)
+    hub.publish(order("a", "b")["message"])
+    hub.publish({"event": "done", "items": ["a"]})
+    hub._journal.close()
+    assert [item["id"] for item in ProductionHub(path).snapshot()["items"]] == ["b"]
@@ -0,0 +1,98 @@
+import random
+import pytest
+import reports
+from ledger import Ledger, start_of_day
+from reports import ROLLUP_EXISTS_SQL, ZReport, build_report, next_day, to_csv, to_text
+
+DAYS = 3
+PRODUCTS = [("sıcak", "Latte", 12, 9000), ("sıcak", "Mocha", 16, 11000), ("tatlı", "Kurabiye", 1, 4500)]
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    """Son üç günün ve bugünün fişleri: indirimli, nakit, kart ve bölünmüş ödemeli."""
+    ledger = Ledger(str(tmp_path / "sales.db"), legacy_counter=None)
+    rng = random.Random(11)
+    day = start_of_day(start_of_day() - DAYS * 86400 + 3600)
+    for _ in range(DAYS + 1):
+        for _ in range(25):
+            items = [rng.choice(PRODUCTS) for _ in range(rng.randint(1, 3))]
+            lines = [item[1:] for item in items]
+            total = sum(price for _, _, price in lines)
+            discount = rng.choice((0, 0, 500))
+            due = total - discount
+            payments = rng.choice(([("nakit", due, 0, None)], [("kart", due, 0, "A1")],
+                                   [("nakit", 1000, 0, None), ("kart", due - 1000, 0, "A2")]))
+            ledger.record_sale(lines, payment_method=payments[-1][0] if len(payments) == 1 else "bölünmüş",
+                               categories=[item[0] for item in items], discount=discount, payments=payments,
+                               created_at=day + rng.uniform(7 * 3600, 23 * 3600))
+        day = next_day(day)
+    yield ledger
+    ledger.close()
+
+
+def summary(report):
+    return (report.receipts, report.net, report.discount, report.gross,
+            dict(report.products), dict(report.hours), dict(report.payments))
+
+
+def first_day():
+    return start_of_day(start_of_day() - DAYS * 86400 + 3600)
+
+
+def test_rollups_match_streaming_over_partial_days(ledger):
+    start, end = first_day() + 10 * 3600, start_of_day() + 86400
+    rolled = build_report(start, end, ledger=ledger)
+    streamed = build_report(start, end, ledger=ledger, use_rollups=False)
+    assert summary(rolled) == summary(streamed)
+    assert rolled.receipts > 0 and rolled.discount > 0
+
+
+def test_payments_count_split_receipts_under_each_method(ledger):
+    report = build_report(first_day(), start_of_day() + 86400, ledger=ledger)
+    assert set(report.payments) == {"nakit", "kart"}
+    assert sum(total for _, total in report.payments.values()) == report.net
+    assert sum(receipts for receipts, _ in report.payments.values()) >= report.receipts
+
+
+def test_closed_days_are_rolled_up_once_and_today_is_streamed(ledger, monkeypatch):
+    start, today = first_day(), start_of_day()
+    build_report(start, today + 86400, ledger=ledger)
+    day = start
+    while day < today:
+        assert ledger.conn.execute(ROLLUP_EXISTS_SQL, (day,)).fetchone()
+        day = next_day(day)
+    assert not ledger.conn.execute(ROLLUP_EXISTS_SQL, (today,)).fetchone()
+
+    built = []
+    monkeypatch.setattr(reports, "build_rollup", lambda ledger, day: built.append(day))
+    before = build_report(start, today + 86400, ledger=ledger)
+    ledger.record_sale([("Latte", 12, 9000)], categories=["sıcak"], created_at=today + 1)
+    after = build_report(start, today + 86400, ledger=ledger)
+    assert built == []
+    assert after.receipts == before.receipts + 1
+    assert after.products[("sıcak", "Latte", 12)][0] == before.products[("sıcak", "Latte", 12)][0] + 1
+
+
+def test_merge_adds_every_section():
+    a, b = ZReport(0, 1), ZReport(1, 2)
+    a.add_line("sıcak", "Latte", 12, 9000)
+    a.add_receipt(9, 9000, 0)
+    a.add_payment("nakit", 9000)
+    b.add_line("sıcak", "Latte", 12, 18000, quantity=2)
+    b.add_receipt(9, 17500, 500)
+    b.add_payment("kart", 17500)
+    a.merge(b)
+    assert summary(a) == (2, 26500, 500, 27000, {("sıcak", "Latte", 12): [3, 27000]},
+                          {9: [2, 26500]}, {"nakit": [1, 9000], "kart": [1, 17500]})
+    assert a.categories() == {"sıcak": [3, 27000]}
+
+
+def test_text_and_csv_outputs(ledger):
+    report = build_report(first_day(), start_of_day(), ledger=ledger)
+    text = to_text(report)
+    assert text.startswith(" " * 16 + "Z RAPORU")
+    assert all(len(line) <= reports.TEXT_WIDTH for line in text.splitlines())
+    rows = to_csv(report).splitlines()
+    assert rows[0] == "bölüm,anahtar,boyut,adet,tutar"
+    assert any(row.startswith("ürün,sıcak/Latte,12,") for row in rows)
@@ -0,0 +1,80 @@
+import pytest
+from catalog import Catalog
+from search import Match, SearchIndex, fold
+
+
+@pytest.fixture
+def menu(tmp_path):
+    menu = tmp_path / "menu"
+    menu.mkdir()
+    (menu / "sıcak.txt").write_text(
+        "latte,12,90\nmocha,12,100\nsıcak çikolata,12,95\nirlanda kahvesi,12,120\n", encoding="utf-8")
+    (menu / "soğuk.txt").write_text("ıced latte,16,110\nlimonata,16,70\n", encoding="utf-8")
+    (menu / "tatlı.txt").write_text("çikolatalı kurabiye,1,45\n", encoding="utf-8")
+    (menu / "codes.csv").write_text(
+        "101,sıcak,latte,12\n102,sıcak,mocha\n8690000000017,tatlı,çikolatalı kurabiye,1\n"
+        "999,sıcak,olmayan ürün\nabc,sıcak,latte\n", encoding="utf-8")
+    return menu
+
+
+@pytest.fixture
+def index(menu, tmp_path):
+    catalog = Catalog(str(menu), str(tmp_path / "catalog.cache"))
+    return SearchIndex(catalog, codes_path=str(menu / "codes.csv"))
+
+
+def names(results):
+    return [match.product for match in results]
+
+
+def test_fold_treats_turkish_letters_as_ascii():
+    assert fold("İSTANBUL") == fold("istanbul") == fold("ıstanbul") == "istanbul"
+    assert fold("ÇİKOLATALI Şeker ğüö") == "cikolatali seker guo"
+
+
+@pytest.mark.parametrize("query", ["çik", "ÇİK", "cik", "CIK", "çİk"])
+def test_search_ignores_turkish_case_and_accents(index, query):
+    # **Adı sorguyla başlayan önce, kelimesi sorguyla başlayan sonra**
+    assert names(index.search(query)) == ["Çikolatalı kurabiye", "Sıcak çikolata"]
+
+
+def test_dotted_and_dotless_i_match_each_other(index):
+    assert names(index.search("İRLANDA")) == names(index.search("ırlanda")) == ["Irlanda kahvesi"]
+    assert names(index.search("ICED")) == names(index.search("ıced")) == ["Iced latte"]
+
+
+def test_name_prefix_ranks_before_word_prefix(index):
+    assert names(index.search("latte")) == ["Latte", "Iced latte"]
+    assert names(index.search("lat")) == ["Latte", "Iced latte"]
+
+
+def test_every_query_word_must_match_a_word_prefix(index):
+    assert names(index.search("kura çik")) == ["Çikolatalı kurabiye"]
+    assert names(index.search("lat ice")) == ["Iced latte"]
+
+
+def test_typo_falls_back_to_trigrams(index):
+    assert names(index.search("mocah")) == ["Mocha"]
+    assert index.search("xyz") == []
+
+
+def test_limit_and_empty_query(index):
+    assert len(index.search("l", limit=1)) == 1
+    assert index.search("   ") == []
+
+
+def test_digits_search_codes(index):
+    assert index.lookup_code(" 101 ") == Match("sıcak", "Latte", 12)
+    assert index.lookup_code("102") == Match("sıcak", "Mocha", None)
+    assert index.search("10") == [Match("sıcak", "Latte", 12), Match("sıcak", "Mocha", None)]
+    # **Katalogda olmayan ürünü gösteren ve rakam olmayan kodlar atlanır**
+    assert index.lookup_code("999") is None and index.search("9") == []
+    assert index.lookup_code("abc") is None
+
+
+def test_catalog_change_rebuilds_index(index, menu):
+    assert index.search("sahlep") == []
+    (menu / "sıcak.txt").write_text("latte,12,90\nsahlep,12,110\n", encoding="utf-8")
+    index.catalog.refresh()
+    assert names(index.search("sahlep")) == ["Sahlep"]
+    assert index.search("mocha") == []
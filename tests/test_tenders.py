@@ -0,0 +1,114 @@
+import threading
+import pytest
+from tenders import (CASH, SPLIT_METHOD, Authorization, CardTerminal, Payment, SimulatorTerminal, TenderError,
+                     TerminalWorker)
+
+
+def test_cash_over_remaining_gives_change():
+    payment = Payment(7250)
+    tender = payment.add_cash(10000)
+    assert tender == (CASH, 7250, 2750, None)
+    assert payment.complete()
+    assert payment.change() == 2750
+    assert payment.method() == CASH
+
+
+def test_split_cash_and_card():
+    payment = Payment(10000)
+    payment.add_cash(4000)
+    assert payment.remaining() == 6000
+    payment.add_card("kart", 6000, "SIM000001")
+    assert payment.complete()
+    assert payment.change() == 0
+    assert payment.method() == SPLIT_METHOD
+
+
+def test_card_cannot_exceed_remaining():
+    payment = Payment(5000)
+    payment.add_cash(2000)
+    with pytest.raises(TenderError):
+        payment.check_card(3001)
+    with pytest.raises(TenderError):
+        payment.add_card("kart", 0, "x")
+    assert payment.tenders == [(CASH, 2000, 0, None)]
+
+
+def test_no_tender_after_complete():
+    payment = Payment(1000)
+    payment.add_cash(1000)
+    with pytest.raises(TenderError):
+        payment.add_cash(500)
+
+
+def test_remove_tender_reopens_payment():
+    payment = Payment(1000)
+    payment.add_card("kart", 400, "A")
+    payment.add_cash(600)
+    removed = payment.remove(0)
+    assert removed.reference == "A"
+    assert payment.remaining() == 400
+    assert payment.method() == CASH
+
+
+def test_zero_total_receipt_is_cash():
+    payment = Payment(0)
+    assert payment.complete()
+    assert payment.method() == CASH
+
+
+class HangingTerminal(CardTerminal):
+    """Serbest bırakılana kadar cevap vermeyen terminal."""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.voided = []
+
+    def authorize(self, amount, reference):
+        self.started.set()
+        self.release.wait(5)
+        return Authorization(True, f"OK-{reference}", "Onaylandı")
+
+    def void(self, code):
+        self.voided.append(code)
+
+
+def test_cancelled_authorization_is_voided_when_terminal_answers_late():
+    terminal = HangingTerminal()
+    worker = TerminalWorker(terminal)
+    results = []
+    request = worker.authorize(1000, "r1", on_done=lambda *args: results.append(args))
+    queued = worker.authorize(2000, "r2", on_done=lambda *args: results.append(args))
+    terminal.started.wait(5)
+    assert worker.cancel(request)
+    assert worker.cancel(queued)
+    terminal.release.set()
+    worker.stop()
+    assert terminal.voided == ["OK-r1"]  # **Sırası gelmeden iptal edilen r2 terminale hiç gitmedi**
+    assert [(done.op, done.reference, error) for done, _, error in results] == [("void", "OK-r1", None)]
+
+
+def test_answered_authorization_cannot_be_cancelled():
+    worker = TerminalWorker(SimulatorTerminal(delay=0))
+    done = threading.Event()
+    request = worker.authorize(1000, "r1", on_done=lambda *args: done.set())
+    done.wait(5)
+    assert not worker.cancel(request)
+    worker.stop()
+    assert request.result.approved
+
+
+def test_simulator_declines_test_amounts():
+    worker = TerminalWorker(SimulatorTerminal(delay=0))
+    request = worker.authorize(10051, "r1")
+    worker.stop()
+    assert not request.result.approved and request.result.code is None
+
+
+def test_terminal_without_void_fails_when_built():
+    class Incomplete(CardTerminal):
+        def authorize(self, amount, reference):
+            return Authorization(True, "x", "")
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,51 @@
+import pytest
+from cart import format_line
+from ticket import OrderLine, Ticket, fold
+
+LATTE = OrderLine.of("Latte", 12, 9000)
+MOCHA = OrderLine.of("Mocha", 16, 11000)
+
+
+def test_lines_are_interned_tuples():
+    line = OrderLine.of("Lat" + "te", 12, 9000)
+    assert line is LATTE and line == ("Latte", 12, 9000)
+    drink, size, price = line
+    assert (drink, size, price) == ("Latte", 12, 9000)
+    assert not hasattr(line, "__dict__")
+    assert OrderLine.of("Latte", 12, 9500) is not LATTE  # **Fiyatı farklı satır ayrı katlanır**
+
+
+def test_folding_keeps_first_seen_order_and_counts():
+    ticket = Ticket([(1, LATTE), (2, MOCHA), (3, LATTE)])
+    assert ticket.folded() == [(LATTE, 2), (MOCHA, 1)]
+    assert ticket.quantity(LATTE) == 2 and ticket.total() == 29000
+    assert fold(ticket.lines()) == ticket.folded()
+
+
+def test_removing_folded_units_updates_quantity_and_total():
+    ticket = Ticket([(1, LATTE), (2, MOCHA), (3, LATTE)])
+    assert ticket.last_id(LATTE) == 3
+    assert ticket.remove(3) is LATTE
+    assert ticket.folded() == [(LATTE, 1), (MOCHA, 1)] and ticket.last_id(LATTE) == 1
+
+    ticket.remove(1)
+    assert ticket.folded() == [(MOCHA, 1)] and ticket.quantity(LATTE) == 0
+    assert ticket.total() == 11000 and len(ticket) == 1 and 1 not in ticket
+    with pytest.raises(KeyError):
+        ticket.remove(1)
+
+    ticket.add(4, LATTE)  # **Yeniden eklenen ürün sona katlanır**
+    assert ticket.folded() == [(MOCHA, 1), (LATTE, 1)]
+
+
+def test_clear_and_accessors():
+    ticket = Ticket([(5, MOCHA), (7, LATTE)])
+    assert ticket.items() == [(5, MOCHA), (7, LATTE)] and list(ticket.ids()) == [5, 7]
+    assert ticket.get(7) is LATTE and ticket.get(8) is None
+    ticket.clear()
+    assert ticket.folded() == [] and ticket.total() == 0 and len(ticket) == 0
+
+
+def test_format_line_shows_folded_total():
+    assert format_line(LATTE) == "Latte (12 oz) - 90.00 TL"
+    assert format_line(LATTE, 3) == "Latte (12 oz) x3 - 270.00 TL"
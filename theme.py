@@ -0,0 +1,76 @@
+# **Uygulamanın tek stil sayfası: widget'lar nesne adı alır, stil QApplication'a bir kez uygulanır.**
+# **Durumlar (boş sepet, seçili ürün) dinamik özelliklerle değişir, sadece ilgili widget yeniden cilalanır.**
+
+STYLESHEET = """
+QLabel#receiptLabel { font-size: 18px; font-weight: bold; color: white; }
+QLabel#sectionLabel { font-size: 18px; font-weight: bold; }
+QLabel#totalLabel { font-size: 22px; font-weight: bold; color: red; }
+PaymentSystem QLabel#totalLabel { font-size: 20px; }
+
+QLineEdit#searchBox { font-size: 18px; padding: 4px; }
+QListWidget#searchResults { font-size: 16px; }
+
+QPushButton#pageButton {
+    font-size: 16px; font-weight: bold; background-color: white; color: black;
+    border: 2px solid black; border-radius: 10px;
+}
+QPushButton#pageButton:hover { background-color: #f0f0f0; }
+
+QPushButton#productButton { font-size: 16px; font-weight: bold; background-color: white; color: black; }
+QPushButton#productButton[selected="true"] { background-color: #ffe08a; }
+QPushButton#productButton[stock="low"] { border: 2px solid orange; }
+QPushButton#productButton:disabled { background-color: #d9d9d9; color: gray; }
+QPushButton#sizeButton { font-size: 14px; font-weight: bold; }
+
+QListView#orderList { font-size: 18px; }
+QListView#orderList[empty="true"] { font-size: 16px; font-style: italic; color: gray; }
+
+QPushButton#deleteButton { font-size: 16px; }
+CategoryPage QPushButton#deleteButton { background-color: white; color: red; }
+QPushButton#clearButton { font-size: 16px; background-color: red; color: white; }
+QPushButton#confirmButton, QPushButton#completeButton { font-size: 16px; background-color: green; color: white; }
+PaymentSystem QPushButton#completeButton { font-size: 25px; }
+QPushButton#printButton { font-size: 18px; }
+QLabel#remainingLabel { font-size: 18px; font-weight: bold; }
+QLineEdit#amountBox { font-size: 18px; padding: 4px; }
+QPushButton#tenderButton { font-size: 18px; padding: 6px; }
+QListWidget#tenderList { font-size: 16px; }
+QLabel#terminalStatus { font-size: 14px; font-style: italic; }
+
+QPushButton#ticketButton { font-size: 14px; padding: 4px 8px; }
+QPushButton#ticketButton[active="true"] { background-color: #ffe08a; font-weight: bold; }
+QPushButton#holdButton { font-size: 14px; font-weight: bold; }
+
+QLabel#keyBuffer { font-size: 18px; font-weight: bold; padding: 0 8px; }
+QLabel#keyBuffer[error="true"] { color: red; }
+QPushButton#keyEntryButton { font-size: 14px; padding: 4px 8px; }
+QPushButton#keyEntryButton:checked { background-color: #ffe08a; font-weight: bold; }
+
+QLabel#stationTitle { font-size: 20px; font-weight: bold; }
+QListWidget#stationQueue { font-size: 18px; }
+QListWidget#stationQueue::item { border-bottom: 1px solid #cccccc; padding: 6px; }
+
+QLabel#perfOverlay {
+    font-family: monospace; font-size: 13px; color: #00ff66;
+    background-color: rgba(0, 0, 0, 200); padding: 6px; border-radius: 4px;
+}
+"""
+
+
+def apply(app):
+    """Stil sayfasını uygulamanın tamamına bir kez uygular."""
+    app.setStyleSheet(STYLESHEET)
+
+
+def set_state(widget, name, value):
+    """Dinamik bir durum özelliğini değiştirir; değer aynıysa hiçbir şey yapmaz.
+
+    Stil sayfası yeniden ayrıştırılmaz, sadece bu widget yeniden cilalanır.
+    """
+    if widget.property(name) == value:
+        return
+    widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    widget.update()
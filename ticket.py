@@ -0,0 +1,106 @@
+import sys
+from collections import namedtuple
+
+
+class OrderLine(namedtuple("OrderLine", "product size price")):
+    """Sepetteki tek bir ürün: (ürün, boyut, fiyat kuruş).
+
+    Demet olduğu için `drink, size, price = line` ve JSON'a liste olarak
+    yazılma eskisi gibi çalışır; `__slots__` boş olduğundan örnek başına
+    sözlük tutulmaz. `of` satırı tek bir kopyada toplar (intern): sepetteki
+    üç latte aynı nesneyi paylaşır, eşitlik kontrolü kimlikle biter.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def of(cls, product, size, price):
+        line = _interned.get((product, size, price))
+        if line is None:
+            line = cls(sys.intern(product), size, price)
+            _interned[line] = line
+        return line
+
+
+_interned = {}  # **Farklı (ürün, boyut, fiyat) sayısı menü kadardır; sınırsız büyümez**
+
+
+class Ticket:
+    """Satır id'sine göre sıralı sipariş satırları ve aynı satırların katlanmış hali.
+
+    Ekleme ve id ile silme O(1) çalışır. Aynı (ürün, boyut, fiyat) satırları
+    `folded` ile tek satır × adet olarak okunur; katlama her değişiklikte
+    güncel tutulur, her okumada yeniden hesaplanmaz.
+    """
+
+    __slots__ = ("_lines", "_groups", "_total")
+
+    def __init__(self, items=()):
+        self._lines = {}  # **satır id -> OrderLine**
+        self._groups = {}  # **OrderLine -> {satır id: None}, ilk eklenme sırasıyla**
+        self._total = 0
+        for line_id, line in items:
+            self.add(line_id, line)
+
+    def add(self, line_id, line):
+        self._lines[line_id] = line
+        group = self._groups.get(line)
+        if group is None:
+            group = self._groups[line] = {}
+        group[line_id] = None
+        self._total += line[2]
+
+    def remove(self, line_id):
+        """Satırı çıkarır ve döndürür; yoksa KeyError."""
+        line = self._lines.pop(line_id)
+        group = self._groups[line]
+        del group[line_id]
+        if not group:
+            del self._groups[line]
+        self._total -= line[2]
+        return line
+
+    def clear(self):
+        self._lines.clear()
+        self._groups.clear()
+        self._total = 0
+
+    def get(self, line_id, default=None):
+        return self._lines.get(line_id, default)
+
+    def lines(self):
+        return list(self._lines.values())
+
+    def items(self):
+        return list(self._lines.items())
+
+    def ids(self):
+        return self._lines.keys()
+
+    def folded(self):
+        """[(satır, adet)]; her satır ilk eklendiği sırada."""
+        return [(line, len(group)) for line, group in self._groups.items()]
+
+    def quantity(self, line):
+        return len(self._groups.get(line, ()))
+
+    def last_id(self, line):
+        """Aynı satırlardan en son ekleneninin id'si (katlanmış satırdan bir adet silmek için)."""
+        return next(reversed(self._groups[line]))
+
+    def total(self):
+        return self._total
+
+    def __len__(self):
+        return len(self._lines)
+
+    def __contains__(self, line_id):
+        return line_id in self._lines
+
+
+def fold(lines):
+    """Satır listesini [(satır, adet)] olarak katlar; sıra ilk görülmeye göredir."""
+    counts = {}
+    for line in lines:
+        counts[line] = counts.get(line, 0) + 1
+    return list(counts.items())